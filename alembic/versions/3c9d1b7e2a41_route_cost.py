@@ -0,0 +1,67 @@
+"""route cost
+
+Revision ID: 3c9d1b7e2a41
+Revises: fa27e94e5e95
+Create Date: 2026-10-19 14:02:37.418605
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9d1b7e2a41'
+down_revision: Union[str, Sequence[str], None] = 'fa27e94e5e95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ROUTE_COST_SELECT = """
+SELECT delivery_price.location_id,
+       delivery_price.terminal_id,
+       shipping_price.destination_id,
+       delivery_price.vehicle_type_id,
+       delivery_price.price AS delivery_price,
+       shipping_price.price AS shipping_price,
+       delivery_price.price + shipping_price.price AS total_price,
+       row_number() OVER (
+           PARTITION BY delivery_price.location_id, shipping_price.destination_id, delivery_price.vehicle_type_id
+           ORDER BY delivery_price.price + shipping_price.price, delivery_price.terminal_id
+       ) = 1 AS is_cheapest
+FROM delivery_price
+JOIN shipping_price ON shipping_price.terminal_id = delivery_price.terminal_id
+                   AND shipping_price.vehicle_type_id = delivery_price.vehicle_type_id
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(f'CREATE MATERIALIZED VIEW route_cost AS {ROUTE_COST_SELECT} WITH DATA')
+    else:
+        # SQLite has no materialized views, the application refreshes this table itself
+        op.create_table('route_cost',
+        sa.Column('location_id', sa.Integer(), nullable=False),
+        sa.Column('terminal_id', sa.Integer(), nullable=False),
+        sa.Column('destination_id', sa.Integer(), nullable=False),
+        sa.Column('vehicle_type_id', sa.Integer(), nullable=False),
+        sa.Column('delivery_price', sa.Integer(), nullable=False),
+        sa.Column('shipping_price', sa.Integer(), nullable=False),
+        sa.Column('total_price', sa.Integer(), nullable=False),
+        sa.Column('is_cheapest', sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint('location_id', 'terminal_id', 'destination_id', 'vehicle_type_id')
+        )
+        op.execute(f'INSERT INTO route_cost {ROUTE_COST_SELECT}')
+    # REFRESH ... CONCURRENTLY requires a unique index; its prefix also serves the calculator lookup
+    op.create_index('uq_route_cost_route', 'route_cost',
+                    ['location_id', 'destination_id', 'vehicle_type_id', 'terminal_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_route_cost_route', table_name='route_cost')
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('DROP MATERIALIZED VIEW route_cost')
+    else:
+        op.drop_table('route_cost')
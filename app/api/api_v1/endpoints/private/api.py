@@ -0,0 +1,9 @@
+from fastapi import APIRouter
+
+from app.api.api_v1.endpoints.private.hot_quotes import hot_quotes_api_router
+from app.api.api_v1.endpoints.private.quote_jobs import quote_jobs_api_router
+
+private_v1_router = APIRouter(prefix='/private')
+
+private_v1_router.include_router(quote_jobs_api_router)
+private_v1_router.include_router(hot_quotes_api_router)
@@ -0,0 +1,28 @@
+import json
+from dataclasses import asdict
+
+from fastapi import APIRouter, Query
+
+from app.config import settings
+from app.schemas.hot_quotes import HotQuoteRead, HotQuotesRead, PrewarmRead
+from app.services.calculator.prewarm import quote_prewarmer
+
+hot_quotes_api_router = APIRouter(prefix="/hot-quotes")
+
+@hot_quotes_api_router.get("", response_model=HotQuotesRead, tags=["hot quotes"], name='get_hot_quotes',
+                           summary='Most requested calculator inputs of this worker',
+                           description="The inputs prewarmed after a tariff or exchange rate change, most requested "
+                                       "first. Counts are per worker and halve after every prewarm")
+async def get_hot_quotes(limit: int = Query(settings.QUOTE_PREWARM_TOP_N, gt=0,
+                                            le=settings.QUOTE_POPULARITY_CAPACITY)):
+    popularity = quote_prewarmer.popularity
+    last = quote_prewarmer.last_result
+    return HotQuotesRead(
+        tracked=len(popularity),
+        requests=popularity.total,
+        cached_quotes=len(quote_prewarmer.cache),
+        last_prewarm=PrewarmRead(**asdict(last.generation), requested=last.requested, warmed=last.warmed,
+                                 seconds=last.seconds) if last else None,
+        items=[HotQuoteRead(input=json.loads(hot.key), count=hot.count, error=hot.error)
+               for hot in popularity.top(limit)],
+    )
@@ -0,0 +1,61 @@
+import shutil
+from pathlib import Path as FilePath
+
+from fastapi import APIRouter, Depends, File, Path, Query, UploadFile
+from rfc9457 import BadRequestProblem, NotFoundProblem
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database.crud.quote_job import QuoteJobService
+from app.database.db.session import get_async_db
+from app.database.schemas.quote_job import QuoteJobCreate, QuoteJobRead, QuoteJobResultPage, QuoteJobResultRead
+from app.services.calculator.bulk import LOT_SUFFIXES, OPTIONAL_COLUMNS, REQUIRED_COLUMNS
+from app.services.quote_jobs.runner import quote_job_path, quote_job_runner
+
+quote_jobs_api_router = APIRouter(prefix="/quote-jobs")
+
+@quote_jobs_api_router.post("", response_model=QuoteJobRead, status_code=202, tags=["quote jobs"],
+                            name='create_quote_job', summary='Submit a batch of lots',
+                            description=f"CSV or Parquet with columns {', '.join(REQUIRED_COLUMNS)} and optionally "
+                                        f"{', '.join(OPTIONAL_COLUMNS)}; other columns are passed through")
+async def create_quote_job(file: UploadFile = File(...), db: AsyncSession = Depends(get_async_db)):
+    suffix = FilePath(file.filename or '').suffix.lower()
+    if suffix not in LOT_SUFFIXES:
+        raise BadRequestProblem(detail=f"Unsupported file type '{suffix}', expected one of {', '.join(LOT_SUFFIXES)}")
+
+    job_service = QuoteJobService(db)
+    job = await job_service.create(QuoteJobCreate(filename=file.filename), flush=True)
+
+    def save_upload():
+        with quote_job_path(job).open('wb') as destination:
+            shutil.copyfileobj(file.file, destination)
+
+    await run_in_threadpool(save_upload)
+    await db.commit()
+    await quote_job_runner.submit(job)
+    return job
+
+@quote_jobs_api_router.get("/{job_id}", response_model=QuoteJobRead, tags=["quote jobs"], name='get_quote_job',
+                           summary='Job status and progress')
+async def get_quote_job(job_id: int = Path(..., description='Job id'), db: AsyncSession = Depends(get_async_db)):
+    return await QuoteJobService(db).get_with_not_found_exception(job_id, 'quote job')
+
+@quote_jobs_api_router.get("/{job_id}/results", response_model=QuoteJobResultPage, tags=["quote jobs"],
+                           name='get_quote_job_results', summary='Quoted rows, cursor paginated',
+                           description="Pass `next_cursor` of a page as `cursor` to get the next one. "
+                                       "Results of a running job grow at the end, so paging can follow it")
+async def get_quote_job_results(
+        job_id: int = Path(..., description='Job id'),
+        cursor: int | None = Query(None, description='next_cursor of the previous page'),
+        limit: int = Query(settings.QUOTE_JOB_RESULTS_PAGE_LIMIT, gt=0, le=settings.QUOTE_JOB_RESULTS_PAGE_LIMIT),
+        db: AsyncSession = Depends(get_async_db)
+):
+    job_service = QuoteJobService(db)
+    if not await job_service.get(job_id):
+        raise NotFoundProblem(detail="Object 'quote job' not found")
+    results = await job_service.get_results_page(job_id, cursor, limit)
+    return QuoteJobResultPage(
+        items=[QuoteJobResultRead.model_validate(result) for result in results],
+        next_cursor=results[-1].id if results else cursor,
+    )
@@ -1,7 +1,9 @@
 from fastapi import APIRouter
 
 from app.api.api_v1.endpoints.public.calculator import calculator_api_router
+from app.api.api_v1.endpoints.public.price_list import price_list_api_router
 
 public_v1_router = APIRouter(prefix='/public')
 
-public_v1_router.include_router(calculator_api_router)
\ No newline at end of file
+public_v1_router.include_router(calculator_api_router)
+public_v1_router.include_router(price_list_api_router)
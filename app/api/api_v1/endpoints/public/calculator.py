@@ -1,40 +1,107 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
 import grpc
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Path, Request, Response, WebSocket, WebSocketDisconnect, status
 from fastapi.params import Param
-from rfc9457 import NotFoundProblem
+from pydantic import ValidationError
+from rfc9457 import NotFoundProblem, ServerProblem
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
+from app.core.http_cache import cache_headers
 from app.core.logger import logger
+from app.core.metrics import LIVE_QUOTE_PRICES, LIVE_QUOTE_SESSIONS
+from app.core.single_flight import SingleFlight
 from app.database.db.session import get_async_db
 from app.enums.auction import AuctionEnum
 from app.enums.vehicle_type import VehicleTypeEnum
-from app.rpc_client.auction_api import ApiRpcClient
-from app.schemas.calculator import CalculatorDataIn
-from app.services.calculator.calculator_service import CalculatorService
-from app.services.calculator.exceptions import DestinationNotFoundError, LocationNotFoundError
+from app.rpc_client.auction_api import get_auction_api
+from app.rpc_client.gen.python.auction.v1 import lot_pb2
+from app.schemas.calculator import CalculatorDataIn, LivePriceIn, LiveQuoteSessionIn
+from app.services.calculator.cache_key import calculator_input_key
+from app.services.calculator.exceptions import DestinationNotFoundError, LocationNotFoundError, FeeNotFoundError
+from app.services.calculator.live import LatestPrice, LiveQuoteSession, flatten_quote, live_snapshot, quote_delta
+from app.services.calculator.popularity import quote_popularity
+from app.services.calculator.quotes import resolve_quote
 from app.services.calculator.types import Calculator
 
 calculator_api_router = APIRouter(prefix="/calculator")
 
+# live quote close code for an unknown location or destination, 4000 + the HTTP status
+LIVE_QUOTE_NOT_FOUND = 4404
+
+lot_flight: SingleFlight[lot_pb2.GetLotByVinOrLotResponse] = SingleFlight('lot')
+
+
+class TariffsUnavailableProblem(ServerProblem):
+    status = 503
+    title = 'Tariffs are unavailable'
+
+
+def tariffs_unavailable(e: Exception) -> TariffsUnavailableProblem:
+    """The database failed or missed QUOTE_DB_DEADLINE and no stale quote was young enough."""
+    logger.error('Could not quote, the tariffs are unavailable', exc_info=e)
+    return TariffsUnavailableProblem('Try again later', headers={'Retry-After': str(settings.QUOTE_RETRY_AFTER)})
+
+
+async def lot_calculator_input(auction: AuctionEnum, lot_id: str, price: int) -> CalculatorDataIn:
+    """
+    The calculator input for a lot as the Auction API has it now. The quote is keyed by this input, so its
+    ETag changes when the lot's location or vehicle type does; concurrent requests for a lot share the call.
+    """
+    lot_id = lot_id.strip()
+
+    async def get_lot() -> lot_pb2.GetLotByVinOrLotResponse:
+        rpc_client = await get_auction_api()
+        return await rpc_client.get_lot_by_vin_or_lot_id(lot_id, auction, timeout=settings.AUCTION_API_LOT_TIMEOUT)
+
+    lot = (await lot_flight.do((auction, lot_id), get_lot)).lot[0]
+    return CalculatorDataIn(
+        price=price,
+        auction=auction,
+        fee_type=None,
+        location=lot.location,
+        vehicle_type=VehicleTypeEnum.CAR if lot.vehicle_type == 'Automobile' else VehicleTypeEnum.MOTO
+    )
+
+
+async def serve_quote(request: Request, response: Response, db: AsyncSession | None, input_key: str,
+                      get_input: Callable[[], Awaitable[CalculatorDataIn]]) -> Calculator | Response:
+    """`resolve_quote` as HTTP: 304 when the client's ETag matches, stale quotes marked and not cacheable."""
+    result = await resolve_quote(db, input_key, get_input, request.headers.get('if-none-match'))
+    if result.stale_age is not None:
+        response.headers.update({'Warning': '110 - "Response is Stale"', 'Age': str(int(result.stale_age)),
+                                 'Cache-Control': 'no-store'})
+        return result.quote
+    headers = cache_headers(result.etag, settings.CALCULATOR_CACHE_MAX_AGE)
+    if result.quote is None:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return result.quote
+
+
 @calculator_api_router.get("", response_model=Calculator, tags=["calculator"], name='get_calculator',
                            description="Get calculator by data from lot", summary='Get calculator by data (PREFERRED)')
-async def get_calculator(data: CalculatorDataIn = Param(...), db: AsyncSession = Depends(get_async_db)):
+async def get_calculator(request: Request, response: Response, data: CalculatorDataIn = Param(...),
+                         db: AsyncSession = Depends(get_async_db)):
+    input_key = calculator_input_key(data)
+    quote_popularity.add(input_key)
+
+    async def get_input() -> CalculatorDataIn:
+        return data
+
     try:
-        calculator_service = CalculatorService(
-            db=db,
-            price=data.price,
-            auction=data.auction,
-            fee_type=data.fee_type,
-            location=data.location,
-            vehicle_type=data.vehicle_type,
-            destination=data.destination
-        )
-
-        return await calculator_service.calculate()
+        return await serve_quote(request, response, db, input_key, get_input)
+    except (SQLAlchemyError, OSError) as e:  # TimeoutError is an OSError
+        raise tariffs_unavailable(e)
     except DestinationNotFoundError as e:
         raise NotFoundProblem(detail=e.message)
     except LocationNotFoundError as e:
         raise NotFoundProblem(detail=e.message)
+    except FeeNotFoundError as e:
+        raise NotFoundProblem(detail=e.message)
 
 @calculator_api_router.get(
     "/{auction}/{lot_id}",
@@ -44,30 +111,28 @@ async def get_calculator(data: CalculatorDataIn = Param(...), db: AsyncSession =
     description="Get calculator by auction and lot id"
 )
 async def get_calculator_by_lot(
+        request: Request,
+        response: Response,
         auction: AuctionEnum = Path(..., description='Auction'),
         lot_id: str = Path(..., description='Lot id'),
         price: int = Param(..., gt=0, description="Price for vehicle"),
         db: AsyncSession = Depends(get_async_db)
 ):
     try:
-        async with ApiRpcClient() as rpc_client:
-            lot = await rpc_client.get_lot_by_vin_or_lot_id(lot_id, auction)
-
-
-        calculator_service = CalculatorService(
-            db=db,
-            price=price,
-            auction=auction,
-            fee_type=None,
-            location=lot.lot[0].location,
-            vehicle_type=VehicleTypeEnum.CAR if lot.lot[0].vehicle_type == 'Automobile' else VehicleTypeEnum.MOTO
-        )
-        return await calculator_service.calculate()
+        data = await lot_calculator_input(auction, lot_id, price)
+        input_key = calculator_input_key(data)
+        # counted under the calculator key, so the prewarmer quotes hot lots like any other input
+        quote_popularity.add(input_key)
+
+        async def get_input() -> CalculatorDataIn:
+            return data
+
+        return await serve_quote(request, response, db, input_key, get_input)
     except grpc.aio.AioRpcError as e:
         if e.code() == grpc.StatusCode.NOT_FOUND:
             logger.warning(f'Could not find lot {lot_id}', extra={'lot_id': lot_id, 'auction': auction})
             raise NotFoundProblem('Lot not found')
-        elif e.code() == grpc.StatusCode.UNAVAILABLE:
+        elif e.code() in (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED):
             logger.error('Auction API service is unavailable', exc_info=e)
             raise NotFoundProblem('Auction API service is unavailable')
         elif e.code() == grpc.StatusCode.INTERNAL:
@@ -76,11 +141,84 @@ async def get_calculator_by_lot(
         else:
             logger.error(f'Unknown error on auction {auction}', exc_info=e)
             raise NotFoundProblem('Unknown error in Auction API service')
+    except (SQLAlchemyError, OSError) as e:
+        raise tariffs_unavailable(e)
     except DestinationNotFoundError as e:
         raise NotFoundProblem(detail=e.message)
     except LocationNotFoundError as e:
         raise NotFoundProblem(detail=e.message)
+    except FeeNotFoundError as e:
+        raise NotFoundProblem(detail=e.message)
+
 
+@calculator_api_router.websocket("/live", name='live_calculator')
+async def live_calculator(websocket: WebSocket, params: LiveQuoteSessionIn = Param(...)):
+    """
+    Quotes for a bid slider. The client connects with the session's query parameters and sends {"price": 5000}
+    messages. The first answer is the whole quote, {"price": 5000, "quote": {...}}, later ones only the values
+    that changed, {"price": 5100, "changed": {"calculator_in_dollars.calculator.totals.0.price": 6395, ...}}.
+    At most one quote per LIVE_QUOTE_INTERVAL is sent, for the last price received; a whole quote is sent
+    again after a tariff change.
+    """
+    await websocket.accept()
+    try:
+        session = LiveQuoteSession(await live_snapshot.get(), params)
+    except (DestinationNotFoundError, LocationNotFoundError) as e:
+        await websocket.close(code=LIVE_QUOTE_NOT_FOUND, reason=e.message)
+        return
+    except (SQLAlchemyError, OSError) as e:
+        logger.error('Tariffs for live quotes are unavailable', exc_info=e)
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason='Tariffs are unavailable')
+        return
+
+    prices = LatestPrice()
+    # the reader answers invalid messages while the quote loop sends, one frame may be written at a time
+    send_lock = asyncio.Lock()
 
+    async def send(message: dict[str, Any]) -> None:
+        async with send_lock:
+            await websocket.send_json(message)
 
+    async def receive() -> None:
+        try:
+            async for message in websocket.iter_text():
+                try:
+                    prices.put(LivePriceIn.model_validate_json(message).price)
+                except ValidationError:
+                    LIVE_QUOTE_PRICES.labels('invalid').inc()
+                    await send({'error': 'Expected {"price": <positive integer>}'})
+        finally:
+            prices.put(None)
 
+    LIVE_QUOTE_SESSIONS.inc()
+    reader = asyncio.create_task(receive())
+    sent: dict[str, Any] = {}
+    try:
+        while (price := await prices.get()) is not None:
+            snapshot = await live_snapshot.get()
+            if (snapshot.matrices.version, snapshot.rate_id) != (session.snapshot.matrices.version,
+                                                                 session.snapshot.rate_id):
+                session, sent = LiveQuoteSession(snapshot, params), {}
+            try:
+                quote = session.quote(price).model_dump(mode='json')
+            except FeeNotFoundError as e:
+                LIVE_QUOTE_PRICES.labels('failed').inc()
+                await send({'price': price, 'error': e.message})
+                continue
+            LIVE_QUOTE_PRICES.labels('quoted').inc()
+            values = flatten_quote(quote)
+            if sent:
+                await send({'price': price, 'changed': quote_delta(sent, values)})
+            else:
+                await send({'price': price, 'quote': quote})
+            sent = values
+            # prices received meanwhile replace each other, the next quote is for the last one
+            await asyncio.sleep(settings.LIVE_QUOTE_INTERVAL)
+    except (DestinationNotFoundError, LocationNotFoundError) as e:
+        # the route is gone from the new tariffs
+        await websocket.close(code=LIVE_QUOTE_NOT_FOUND, reason=e.message)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        reader.cancel()
+        LIVE_QUOTE_SESSIONS.dec()
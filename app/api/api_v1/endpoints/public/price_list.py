@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Path, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.http_cache import accepts_encoding
+from app.enums.price_list import PriceListDatasetEnum, PriceListFormatEnum
+from app.services.tariff.price_list import PRICE_LIST_MEDIA_TYPES, stream_price_list
+
+price_list_api_router = APIRouter(prefix="/price-list")
+
+@price_list_api_router.get("/{dataset}", tags=["price list"], name='export_price_list',
+                           description="Full price list streamed as CSV or NDJSON, gzip-compressed when accepted. "
+                                       "`routes`: cheapest terminal per location, destination and vehicle type; "
+                                       "`fees`: auction fee schedule",
+                           summary='Export price list')
+async def export_price_list(
+        request: Request,
+        dataset: PriceListDatasetEnum = Path(..., description='Dataset'),
+        output_format: PriceListFormatEnum = Query(PriceListFormatEnum.CSV, alias='format', description='Format'),
+):
+    gzip = accepts_encoding(request.headers.get('accept-encoding'), 'gzip')
+    headers = {
+        'Content-Disposition': f'attachment; filename="{dataset.value}.{output_format.value}"',
+        'Vary': 'Accept-Encoding',
+    }
+    if gzip:
+        headers['Content-Encoding'] = 'gzip'
+
+    return StreamingResponse(stream_price_list(dataset, output_format, gzip),
+                             media_type=PRICE_LIST_MEDIA_TYPES[output_format], headers=headers)
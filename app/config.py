@@ -7,6 +7,15 @@ class Environment(str, Enum):
     DEVELOPMENT = "development"
     PRODUCTION = "production"
 
+class QuoteJobQueueBackend(str, Enum):
+    MEMORY = "memory"
+    REDIS = "redis"
+
+class TariffChangeBusBackend(str, Enum):
+    MEMORY = "memory"
+    REDIS = "redis"
+    POSTGRES = "postgres"
+
 class Settings(BaseSettings):
     # Database
     DB_HOST: str = "localhost"
@@ -15,6 +24,18 @@ class Settings(BaseSettings):
     DB_USER: str = "postgres"
     DB_PASS: str = "testpass"
 
+    # Database connection pool, sized per worker process
+    WEB_CONCURRENCY: int = 1  # worker processes, uvicorn --workers defaults to the same variable
+    DB_MAX_CONNECTIONS: int = 20  # connections all workers together may hold
+    DB_POOL_SIZE: int | None = None  # kept open per worker, default half of the worker's share
+    DB_MAX_OVERFLOW: int | None = None  # opened under bursts per worker, default the rest of its share
+    DB_POOL_TIMEOUT: float = 10.0  # seconds to wait for a connection before failing the request
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_ACQUIRE_WARNING_SECONDS: float = 0.1  # slower checkouts are logged with the pool status
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statements per connection, 0 behind pgbouncer
+    DB_STATEMENT_TIMEOUT_MS: int = 30_000  # Postgres statement_timeout, 0 disables
+
     # Redis
     REDIS_URL: str = "redis://localhost:6379"
 
@@ -26,6 +47,78 @@ class Settings(BaseSettings):
 
     # RPC
     RPC_API_URL: str = "localhost:50051"
+    AUCTION_API_LOT_TIMEOUT: float = 2.0  # seconds a lot lookup of the calculator may take, then 503
+
+    # gRPC API served next to HTTP
+    GRPC_ENABLED: bool = False  # opt in, only internal callers use it and the port must be free
+    GRPC_HOST: str = "0.0.0.0"
+    GRPC_PORT: int = 50052  # shared by the workers of an instance
+    GRPC_BATCH_CONCURRENCY: int = 8  # quotes of one QuoteBatch stream computed or awaiting the caller at once
+    GRPC_SHUTDOWN_GRACE: float = 5.0  # seconds calls in progress get to finish on shutdown
+
+    # HTTP caching of calculator responses
+    CALCULATOR_CACHE_MAX_AGE: int = 60
+
+    # Startup warm-up and readiness
+    WARMUP_ENABLED: bool = True  # /ready and gRPC health report not ready until warm-up has finished
+    WARMUP_RETRY_SECONDS: float = 5.0  # pause before retrying when the database is not reachable yet
+    WARMUP_MAX_ATTEMPTS: int = 60  # database (or bundle) attempts before warm-up fails, 0 retries forever
+    WARMUP_RPC_TIMEOUT: float = 5.0  # the Auction API channel may still connect later, it does not block readiness
+    WARMUP_QUOTES_FILE: str = ""  # CSV of calculator inputs quoted at startup, relative to the project root
+    WARMUP_QUOTES_LIMIT: int = 1000
+    QUOTE_CACHE_SIZE: int = 10_000  # computed quotes kept per worker, keyed by ETag; 0 disables
+
+    # Tariff snapshot shared by the worker processes of a host, mapped read-only by each
+    TARIFF_SNAPSHOT_FILE: str = "var/tariff_snapshot.bin"  # relative to the project root, empty disables
+
+    # Bundle mode: quotes from an exported tariff bundle, without a database
+    CALCULATOR_BUNDLE: str = ""  # bundle file relative to the project root, reloaded when replaced; empty disables
+
+    # Serving stale quotes while the database is slow or down
+    QUOTE_DB_DEADLINE: float = 2.0  # seconds a quote may take before a stale answer is served, 0 waits indefinitely
+    QUOTE_STALE_MAX_AGE: float = 3600.0  # oldest cached quote or tariff snapshot served instead, 0 disables
+    QUOTE_RETRY_AFTER: int = 5  # Retry-After of the 503 answered when there is nothing young enough to serve
+
+    # Prewarming the most requested quotes after a tariff or exchange rate change
+    QUOTE_POPULARITY_CAPACITY: int = 2000  # distinct calculator inputs tracked per worker, 0 disables tracking
+    QUOTE_PREWARM_TOP_N: int = 500  # 0 disables prewarming
+    QUOTE_PREWARM_INTERVAL: float = 10.0  # seconds between tariff version checks
+    QUOTE_PREWARM_CHUNK_SIZE: int = 50  # quotes computed on the event loop between yields to requests
+
+    # Live quotes over WebSocket
+    LIVE_QUOTE_INTERVAL: float = 0.05  # seconds between the quotes of a session, prices sent meanwhile coalesce
+    LIVE_QUOTE_RECHECK_SECONDS: float = 10.0  # tariff version checked at least this often while sessions are open
+
+    # Tariff change notifications between instances
+    TARIFF_CHANGE_BUS: TariffChangeBusBackend = TariffChangeBusBackend.MEMORY  # memory reaches this process only
+    TARIFF_CHANGE_CHANNEL: str = "tariff_changes"  # Redis channel or Postgres NOTIFY channel
+    TARIFF_CHANGE_RETRY_SECONDS: float = 5.0  # pause before subscribing again after the connection dropped
+
+    # Batch quote jobs
+    QUOTE_JOB_QUEUE: QuoteJobQueueBackend = QuoteJobQueueBackend.MEMORY
+    QUOTE_JOB_WORKERS: int = 1  # jobs processed at the same time by this instance
+    QUOTE_JOB_PROCESSES: int = 2  # processes computing quotes, 0 computes in a thread
+    QUOTE_JOB_CHUNK_SIZE: int = 1000
+    QUOTE_JOB_DIR: str = "var/quote_jobs"  # uploads, relative to the project root; shared volume with redis queue
+    QUOTE_JOB_RESULTS_PAGE_LIMIT: int = 1000
+    QUOTE_JOB_LEASE_SECONDS: float = 300.0  # running jobs silent this long are requeued (redis queue: crashed instance)
+
+    # Quote execution policy
+    QUOTE_INLINE_MAX_SIZE: int = 20_000  # work units computed on the event loop, larger work is offloaded
+    QUOTE_THREAD_WORKERS: int = 4  # NumPy-bound work
+    QUOTE_EXECUTOR_MAX_PENDING: int = 16  # offloaded calls running or queued, further callers wait
+    EVENT_LOOP_LAG_INTERVAL: float = 0.5  # seconds between event loop lag samples, 0 disables
+
+    # Request stage timing
+    STAGE_TIMING_ENABLED: bool = True  # per-stage histograms on /metrics
+    SERVER_TIMING_HEADER: bool = True  # per-stage breakdown in a Server-Timing response header
+
+    # SQL profiling
+    SQL_PROFILER_ENABLED: bool = True
+    SQL_SLOW_QUERY_SECONDS: float = 0.1  # statements at least this slow are logged with their parameters
+    SQL_EXPLAIN_SLOW_QUERIES: bool = False  # log the plan of slow SELECTs, runs the EXPLAIN on the same connection
+    SQL_QUERY_BUDGET: int = 20  # statements per request before a warning
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5  # executions of one statement shape per request reported as N+1
 
     @property
     def enable_docs(self) -> bool:
@@ -1,4 +1,5 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from typing import Optional, Callable
 
 import redis
@@ -7,17 +8,46 @@ from fastapi_cache import FastAPICache
 from fastapi_cache.backends.redis import RedisBackend
 from fastapi_problem.handler import new_exception_handler, add_exception_handler
 
-from api.api_v1.api import api_v1_router
+from api.api_v1.api import api_v1_router, bundle_v1_router
 from app.config import settings
+from app.core.event_loop import LoopLagMonitor
 from app.core.logger import logger
+from app.core.metrics import metrics_router
+from app.core.readiness import readiness, readiness_router
+from app.core.timing import ServerTimingMiddleware
+from app.database.db.profiler import QueryProfilerMiddleware
+from app.database.db.session import get_async_db
+from app.services.calculator.bundle import calculator_bundle
+from app.services.calculator.executor import quote_executor
+from app.services.calculator.prewarm import quote_prewarmer
+from app.services.calculator.tariff_changes import tariff_change_listener
+from app.rpc_client.auction_api import close_auction_api
+from app.rpc_server.server import calculator_grpc_server
+from app.services.quote_jobs.runner import quote_job_runner
+from app.services.tariff.changes import close_tariff_change_bus
+from app.services.warmup import warm_up
 
 
 def setup_middleware_and_handlers(app: FastAPI):
     eh = new_exception_handler()
     add_exception_handler(app, eh)
+    if settings.STAGE_TIMING_ENABLED and settings.SERVER_TIMING_HEADER:
+        app.add_middleware(ServerTimingMiddleware)
+    if settings.SQL_PROFILER_ENABLED:
+        app.add_middleware(QueryProfilerMiddleware)
+
+async def no_database() -> None:
+    """The session dependency in bundle mode, no engine is created."""
+    return None
 
 def setup_routers(app: FastAPI):
-    app.include_router(api_v1_router)
+    if calculator_bundle is not None:
+        app.include_router(bundle_v1_router)
+        app.dependency_overrides[get_async_db] = no_database
+    else:
+        app.include_router(api_v1_router)
+    app.include_router(metrics_router)
+    app.include_router(readiness_router)
 
 def create_app(
         custom_redis_client: Optional[redis.Redis] = None,
@@ -30,8 +60,37 @@ def create_app(
         else:
             redis_client = custom_redis_client
         FastAPICache.init(RedisBackend(redis_client), prefix="fastapi-cache")
+        loop_lag_monitor = LoopLagMonitor(settings.EVENT_LOOP_LAG_INTERVAL)
+        if settings.EVENT_LOOP_LAG_INTERVAL > 0:
+            loop_lag_monitor.start()
+        bundle_mode = calculator_bundle is not None
+        if not bundle_mode:
+            await quote_job_runner.start()
+        # serves /ready (503) while warming up, load balancers hold traffic back until it succeeds
+        warmup_task = asyncio.create_task(warm_up()) if settings.WARMUP_ENABLED else None
+        if warmup_task is None:
+            readiness.ready = True
+        if not bundle_mode:
+            # both follow the tariff version in the database, a bundle is reloaded when its file is replaced
+            quote_prewarmer.start()
+            tariff_change_listener.start()
+        if settings.GRPC_ENABLED:
+            await calculator_grpc_server.start()
         logger.info(f"{settings.APP_NAME} started!")
         yield
+        readiness.ready = False
+        await calculator_grpc_server.stop()
+        if warmup_task is not None:
+            warmup_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await warmup_task
+        await tariff_change_listener.stop()
+        await quote_prewarmer.stop()
+        await close_tariff_change_bus()
+        await quote_job_runner.stop()
+        await close_auction_api()
+        await loop_lag_monitor.stop()
+        quote_executor.shutdown()
 
 
     docs_url = "/docs" if settings.enable_docs else None
@@ -0,0 +1,45 @@
+import asyncio
+import time
+
+from app.core.logger import logger
+from app.core.metrics import EVENT_LOOP_LAG, EVENT_LOOP_LAG_MAX
+
+
+class LoopLagMonitor:
+    """
+    Sleeps for a fixed interval and records how late it woke up. Anything running on the loop without
+    awaiting (CPU-bound quoting, blocking IO) shows up as lag for every request on this worker.
+    """
+
+    def __init__(self, interval: float, window: int = 20, warn_after: float = 0.25):
+        self.interval = interval
+        self.window = window
+        self.warn_after = warn_after
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name='event-loop-lag-monitor')
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        window_max = 0.0
+        samples = 0
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(time.perf_counter() - started - self.interval, 0.0)
+            EVENT_LOOP_LAG.observe(lag)
+            if lag >= self.warn_after:
+                logger.warning(f'Event loop blocked for {lag:.3f}s', extra={'event_loop_lag': lag})
+
+            window_max = max(window_max, lag)
+            samples += 1
+            if samples == self.window:
+                EVENT_LOOP_LAG_MAX.set(window_max)
+                window_max, samples = 0.0, 0
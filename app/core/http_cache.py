@@ -0,0 +1,38 @@
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match uses weak comparison (RFC 9110 13.1.2), so W/ prefixes are ignored."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    candidates = (candidate.strip() for candidate in if_none_match.split(','))
+    return any(candidate.removeprefix('W/') == etag.removeprefix('W/') for candidate in candidates)
+
+
+def accepts_encoding(accept_encoding: str | None, coding: str) -> bool:
+    """
+    Whether an Accept-Encoding header allows `coding` (RFC 9110 12.5.3): named or covered by `*`
+    with a q-value above 0, so `gzip;q=0` refuses gzip. The most specific entry wins.
+    """
+    if not accept_encoding:
+        return False
+    qualities = {}
+    for entry in accept_encoding.split(','):
+        name, *parameters = (part.strip() for part in entry.split(';'))
+        quality = 1.0
+        for parameter in parameters:
+            key, _, value = parameter.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            qualities[name.lower()] = quality
+    return qualities.get(coding, qualities.get('*', 0.0)) > 0
+
+
+def cache_headers(etag: str, max_age: int) -> dict[str, str]:
+    return {
+        'ETag': etag,
+        'Cache-Control': f'public, max-age={max_age}',
+    }
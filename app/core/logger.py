@@ -57,7 +57,7 @@ class ConsoleLogger:
                 doc["extra"] = extra
 
         # Выводим в консоль в формате JSON для Loki
-        print(json.dumps(doc, ensure_ascii=False))
+        print(json.dumps(doc, ensure_ascii=False, default=str))
 
 
 def setup_logging(
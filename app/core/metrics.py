@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+# seconds a wake-up scheduled on the event loop fired late, i.e. how long other work blocked the loop
+EVENT_LOOP_LAG = Histogram(
+    'event_loop_lag_seconds', 'Delay of scheduled event loop wake-ups',
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+EVENT_LOOP_LAG_MAX = Gauge('event_loop_lag_max_seconds', 'Largest event loop delay in the last monitor window')
+
+QUOTE_EXECUTOR_TASKS = Counter('quote_executor_tasks_total', 'Quote computations by execution mode', ['mode'])
+QUOTE_EXECUTOR_SECONDS = Histogram('quote_executor_duration_seconds', 'Quote computation time including queueing',
+                                   ['mode'])
+QUOTE_EXECUTOR_PENDING = Gauge('quote_executor_pending', 'Offloaded quote computations running or waiting', ['mode'])
+
+# request stages (location search, fee lookup, gRPC lot fetch, ...), see app.core.timing
+STAGE_SECONDS = Histogram(
+    'request_stage_duration_seconds', 'Time spent in a stage of request handling', ['stage'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+# async engine connection pool, see app.database.db.pool
+DB_POOL_SIZE = Gauge('db_pool_size', 'Connections the pool keeps open')
+DB_POOL_CHECKED_OUT = Gauge('db_pool_checked_out', 'Connections currently checked out of the pool')
+DB_POOL_OVERFLOW = Gauge('db_pool_overflow', 'Connections open beyond the pool size')
+DB_POOL_ACQUIRE_SECONDS = Histogram(
+    'db_pool_acquire_seconds', 'Time to check a connection out of the pool, connecting and pinging included',
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+DB_POOL_TIMEOUTS = Counter('db_pool_timeouts_total', 'Checkouts that gave up waiting for a connection')
+
+WARMUP_SECONDS = Gauge('warmup_duration_seconds', 'Time spent in each startup warm-up step', ['step'])
+QUOTE_CACHE_REQUESTS = Counter('quote_cache_requests_total', 'In-process quote cache lookups', ['result'])
+QUOTE_STALE_RESPONSES = Counter('quote_stale_responses_total',
+                                'Quotes served stale because the database failed or missed the deadline', ['source'])
+# coalescing ratio: follower / (leader + follower)
+SINGLE_FLIGHT_CALLS = Counter('single_flight_calls_total', "Calls by role, followers awaited a leader's result",
+                              ['group', 'role'])
+QUOTE_PREWARM_SECONDS = Histogram('quote_prewarm_duration_seconds', 'Prewarming the hot quotes after a tariff change',
+                                  buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0))
+QUOTE_PREWARMED = Counter('quote_prewarm_quotes_total', 'Quotes computed ahead of requests')
+TARIFF_CHANGE_MESSAGES = Counter('tariff_change_messages_total',
+                                 'Tariff change notifications received, ignored when the version was already seen',
+                                 ['result'])
+LIVE_QUOTE_SESSIONS = Gauge('live_quote_sessions', 'Open live quote WebSocket sessions')
+LIVE_QUOTE_PRICES = Counter('live_quote_prices_total',
+                            'Prices received over live quote sessions, coalesced ones replaced by a later price',
+                            ['result'])
+
+metrics_router = APIRouter()
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
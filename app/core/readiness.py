@@ -0,0 +1,30 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+
+class Readiness:
+    """Whether this worker has finished warming up; `/ready` and the gRPC health service report it."""
+
+    def __init__(self):
+        self.ready = False
+        self.steps: dict[str, float] = {}  # warm-up step -> seconds
+        self.error: str | None = None  # last failure while warming up
+        self.failed = False  # a required step ran out of attempts, this worker will not become ready
+
+    def reset(self) -> None:
+        self.ready = False
+        self.steps = {}
+        self.error = None
+        self.failed = False
+
+
+readiness = Readiness()
+
+readiness_router = APIRouter()
+
+@readiness_router.get("/ready", include_in_schema=False)
+async def ready():
+    if not readiness.ready:
+        return JSONResponse({'status': 'failed' if readiness.failed else 'warming_up', 'steps': readiness.steps,
+                             'error': readiness.error}, status_code=503)
+    return {'status': 'ready', 'steps': readiness.steps}
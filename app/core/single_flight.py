@@ -0,0 +1,33 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+from app.core.metrics import SINGLE_FLIGHT_CALLS
+
+T = TypeVar('T')
+
+
+class SingleFlight(Generic[T]):
+    """
+    Concurrent calls with the same key share one execution: the first caller starts `fn` as a task, later
+    callers await that task until it finishes. Results and exceptions go to every caller. The task is
+    shielded, a caller that is cancelled does not cancel it for the others.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: dict[Hashable, asyncio.Task[T]] = {}
+        self._leaders = SINGLE_FLIGHT_CALLS.labels(name, 'leader')
+        self._followers = SINGLE_FLIGHT_CALLS.labels(name, 'follower')
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        flight = self._flights.get(key)
+        if flight is None:
+            self._leaders.inc()
+            flight = self._flights[key] = asyncio.ensure_future(fn())
+            flight.add_done_callback(lambda _: self._flights.pop(key, None))
+        else:
+            self._followers.inc()
+        return await asyncio.shield(flight)
+
+    def __len__(self) -> int:
+        return len(self._flights)
@@ -0,0 +1,102 @@
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Awaitable, Callable, ParamSpec, TypeVar
+
+from prometheus_client import Histogram
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.core.metrics import STAGE_SECONDS
+
+P = ParamSpec('P')
+R = TypeVar('R')
+
+# (stage, seconds) recorded during the current request, None outside ServerTimingMiddleware
+_request_stages: ContextVar[list[tuple[str, float]] | None] = ContextVar('request_stages', default=None)
+_histograms: dict[str, Histogram] = {}
+
+
+def record_stage(name: str, seconds: float) -> None:
+    histogram = _histograms.get(name)
+    if histogram is None:
+        histogram = _histograms[name] = STAGE_SECONDS.labels(name)
+    histogram.observe(seconds)
+    stages = _request_stages.get()
+    if stages is not None:
+        stages.append((name, seconds))
+
+
+class stage:
+    """Times a block: `with stage('routes'): ...`. Does nothing when stage timing is disabled."""
+    __slots__ = ('name', 'started')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self) -> None:
+        if settings.STAGE_TIMING_ENABLED:
+            self.started = time.perf_counter()
+
+    def __exit__(self, *_) -> None:
+        if self.started:
+            record_stage(self.name, time.perf_counter() - self.started)
+
+
+def timed(name: str) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+    """Times every call of a coroutine function as stage `name`; left unwrapped when stage timing is disabled."""
+    def decorator(fn: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        if not settings.STAGE_TIMING_ENABLED:
+            return fn
+
+        @wraps(fn)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            started = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                record_stage(name, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def server_timing(stages: list[tuple[str, float]], total: float) -> str:
+    # repeated stages (a query per search pattern, ...) are summed, first occurrence keeps its position
+    durations: dict[str, float] = {}
+    for name, seconds in stages:
+        durations[name] = durations.get(name, 0.0) + seconds
+    durations['app'] = total
+    return ', '.join(f'{name};dur={seconds * 1000:.2f}' for name, seconds in durations.items())
+
+
+class ServerTimingMiddleware:
+    """
+    Collects the stages recorded while handling a request and reports them in a `Server-Timing` header,
+    `app` is the time until the response started. Response serialization is not a stage of its own,
+    it is the part of `app` not covered by the others.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        stages: list[tuple[str, float]] = []
+        token = _request_stages.set(stages)
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                headers = MutableHeaders(scope=message)
+                headers.append('Server-Timing', server_timing(stages, time.perf_counter() - started))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stages.reset(token)
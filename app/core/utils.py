@@ -1,4 +1,3 @@
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
-print(BASE_DIR)
\ No newline at end of file
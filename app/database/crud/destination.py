@@ -1,4 +1,5 @@
 from sqlalchemy import select
+from sqlalchemy.orm import lazyload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logger import logger
@@ -19,19 +20,20 @@ class DestinationService(BaseService[Destination, DestinationCreate, Destination
             .where(
                 Destination.name.ilike(name),
             )
+            .options(lazyload('*'))
         )
         return result.scalar_one_or_none()
 
     async def get_default(self) -> Destination:
         result = await self.session.execute(
-            select(Destination).where(Destination.is_default.is_(True))
+            select(Destination).where(Destination.is_default.is_(True)).options(lazyload('*'))
         )
         response = result.scalar_one_or_none()
 
         if response:
             return response
         result = await self.session.execute(
-            select(Destination).where(Destination.name == self.DEFAULT_DESTINATION_NAME)
+            select(Destination).where(Destination.name == self.DEFAULT_DESTINATION_NAME).options(lazyload('*'))
         )
         response = result.scalars().first()
         if not response:
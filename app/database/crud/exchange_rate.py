@@ -7,7 +7,6 @@ from app.database.models.destination import Destination
 from app.database.models.exchange_rate import ExchangeRate
 from app.database.schemas.destination import DestinationCreate, DestinationUpdate
 from app.database.schemas.exchange_rate import ExchangeRateCreate, ExchangeRateUpdate
-from currency_converter import CurrencyConverter
 
 class ExchangeRateService(BaseService[ExchangeRate, ExchangeRateCreate, ExchangeRateUpdate]):
     def __init__(self, session: AsyncSession):
@@ -17,6 +16,8 @@ class ExchangeRateService(BaseService[ExchangeRate, ExchangeRateCreate, Exchange
         result = await self.session.execute(select(ExchangeRate).order_by(ExchangeRate.created_at.desc()).limit(1))
         response = result.scalar_one_or_none()
         if not response:
+            # only bootstraps the first rate, not worth importing in every worker
+            from currency_converter import CurrencyConverter
             currency = CurrencyConverter()
             rate = currency.convert(1, 'USD', 'EUR')
             return await self.create(ExchangeRateCreate(rate=rate))
@@ -1,6 +1,7 @@
 from typing import Sequence
 
 from sqlalchemy import select, and_
+from sqlalchemy.orm import lazyload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.crud.base import BaseService
@@ -27,8 +28,8 @@ class FeeService(BaseService[Fee, FeeCreate, FeeUpdate]):
             )
             .order_by(Fee.car_price_min)
             .limit(1)
+            .options(lazyload('*'))
         )
-        print(result)
         return result.scalar_one_or_none()
 
 
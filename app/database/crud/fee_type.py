@@ -1,4 +1,5 @@
 from sqlalchemy import select
+from sqlalchemy.orm import lazyload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.crud.base import BaseService
@@ -20,6 +21,7 @@ class FeeTypeService(BaseService[FeeType, FeeTypeCreate, FeeTypeUpdate]):
                 FeeType.auction == auction,
                 FeeType.fee_type == fee_type
             )
+            .options(lazyload('*'))
         )
         return result.scalar_one_or_none()
 
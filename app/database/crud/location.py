@@ -1,8 +1,10 @@
 import re
 
 from sqlalchemy import select, or_, and_
+from sqlalchemy.orm import lazyload
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.timing import timed
 from app.database.crud.base import BaseService, CreateSchemaType, ModelType
 from app.database.models import Location, VehicleType, ShippingPrice, DeliveryPrice
 
@@ -13,6 +15,7 @@ class LocationService(BaseService[Location, LocationCreate, LocationUpdate]):
     def __init__(self, session: AsyncSession):
         super().__init__(Location, session)
 
+    @timed('location')
     async def get_location(self, location_name: str,
                                   vehicle_type: VehicleType,
                                   city: str | None = None,
@@ -40,7 +43,9 @@ class LocationService(BaseService[Location, LocationCreate, LocationUpdate]):
                     )
                 )
                 .distinct()
+                .order_by(Location.id)
                 .limit(1)
+                .options(lazyload('*'))
             )
 
             location = result.scalar_one_or_none()
@@ -62,7 +67,9 @@ class LocationService(BaseService[Location, LocationCreate, LocationUpdate]):
                     )
                 )
                 .distinct()
+                .order_by(Location.id)
                 .limit(1)
+                .options(lazyload('*'))
             )
             return result.scalar_one_or_none()
 
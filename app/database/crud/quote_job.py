@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import Any, Sequence
+
+from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.crud.base import BaseService
+from app.database.models import QuoteJob, QuoteJobResult
+from app.database.schemas.quote_job import QuoteJobCreate, QuoteJobUpdate
+from app.enums.quote_job import QuoteJobStatusEnum
+
+
+class QuoteJobService(BaseService[QuoteJob, QuoteJobCreate, QuoteJobUpdate]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(QuoteJob, session)
+
+    async def get_unfinished(self) -> Sequence[QuoteJob]:
+        result = await self.session.execute(
+            select(QuoteJob)
+            .where(QuoteJob.status.in_([QuoteJobStatusEnum.QUEUED, QuoteJobStatusEnum.RUNNING]))
+            .order_by(QuoteJob.id)
+        )
+        return result.scalars().all()
+
+    async def requeue_abandoned(self, heartbeat_before: datetime) -> list[int]:
+        """
+        Running jobs without a heartbeat since `heartbeat_before` go back to queued, returns their ids.
+        The status check makes the update a claim: instances sweeping at the same time requeue a job once.
+        """
+        result = await self.session.execute(
+            update(QuoteJob)
+            .where(QuoteJob.status == QuoteJobStatusEnum.RUNNING,
+                   or_(QuoteJob.heartbeat_at.is_(None), QuoteJob.heartbeat_at < heartbeat_before))
+            .values(status=QuoteJobStatusEnum.QUEUED, heartbeat_at=None)
+            .returning(QuoteJob.id)
+        )
+        return list(result.scalars())
+
+    async def add_results(self, job_id: int, results: list[dict[str, Any]]) -> None:
+        if results:
+            await self.session.execute(insert(QuoteJobResult), [{'job_id': job_id, **result} for result in results])
+
+    async def clear_results(self, job_id: int) -> None:
+        await self.session.execute(delete(QuoteJobResult).where(QuoteJobResult.job_id == job_id))
+
+    async def get_results_page(self, job_id: int, cursor: int | None, limit: int) -> Sequence[QuoteJobResult]:
+        """Keyset page: results after `cursor` (a result id), so deep pages cost the same as the first."""
+        query = select(QuoteJobResult).where(QuoteJobResult.job_id == job_id)
+        if cursor is not None:
+            query = query.where(QuoteJobResult.id > cursor)
+        result = await self.session.execute(query.order_by(QuoteJobResult.id).limit(limit))
+        return result.scalars().all()
@@ -0,0 +1,27 @@
+from typing import Sequence
+
+from sqlalchemy import select, Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.crud.base import BaseService
+from app.database.models import RouteCost, Terminal, Location, Destination, VehicleType
+from app.database.schemas.route_cost import RouteCostCreate, RouteCostUpdate
+
+
+class RouteCostService(BaseService[RouteCost, RouteCostCreate, RouteCostUpdate]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(RouteCost, session)
+
+    async def get_routes(self, location: Location, destination: Destination,
+                         vehicle_type: VehicleType) -> Sequence[Row[tuple[str, int, int, int, bool]]]:
+        """Every terminal connecting location and destination, cheapest first."""
+        result = await self.session.execute(
+            select(Terminal.name, RouteCost.delivery_price, RouteCost.shipping_price, RouteCost.total_price,
+                   RouteCost.is_cheapest)
+            .join(Terminal, Terminal.id == RouteCost.terminal_id)
+            .where(RouteCost.location_id == location.id,
+                   RouteCost.destination_id == destination.id,
+                   RouteCost.vehicle_type_id == vehicle_type.id)
+            .order_by(RouteCost.total_price, RouteCost.terminal_id)
+        )
+        return result.all()
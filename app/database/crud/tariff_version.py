@@ -0,0 +1,19 @@
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.crud.base import BaseService
+from app.database.models.tariff_version import TariffVersion
+from app.database.schemas.tariff_version import TariffVersionCreate, TariffVersionUpdate
+
+
+class TariffVersionService(BaseService[TariffVersion, TariffVersionCreate, TariffVersionUpdate]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(TariffVersion, session)
+
+    async def get_current(self) -> TariffVersion | None:
+        result = await self.session.execute(select(TariffVersion).order_by(TariffVersion.id.desc()).limit(1))
+        return result.scalar_one_or_none()
+
+    async def get_current_version(self) -> int:
+        result = await self.session.execute(select(func.coalesce(func.max(TariffVersion.id), 0)))
+        return result.scalar_one()
@@ -1,4 +1,5 @@
 from sqlalchemy import select
+from sqlalchemy.orm import lazyload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.crud.base import BaseService
@@ -14,7 +15,8 @@ class VehicleTypeService(BaseService[VehicleType, VehicleTypeCreate, VehicleType
         super().__init__(VehicleType, session)
 
     async def get_by_auction_and_type(self, auction: AuctionEnum, vehicle_type: VehicleTypeEnum) -> VehicleType | None:
-        result = await self.session.execute(select(VehicleType).where(VehicleType.auction == auction, VehicleType.vehicle_type == vehicle_type))
+        result = await self.session.execute(select(VehicleType).where(VehicleType.auction == auction, VehicleType.vehicle_type == vehicle_type)
+                                           .options(lazyload('*')))
         return result.scalar_one_or_none()
 
 
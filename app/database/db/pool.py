@@ -0,0 +1,50 @@
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+from app.config import settings
+from app.core.logger import logger
+from app.core.metrics import (DB_POOL_ACQUIRE_SECONDS, DB_POOL_CHECKED_OUT, DB_POOL_OVERFLOW, DB_POOL_SIZE,
+                              DB_POOL_TIMEOUTS)
+
+
+def pool_limits(max_connections: int = settings.DB_MAX_CONNECTIONS,
+                workers: int = settings.WEB_CONCURRENCY) -> tuple[int, int]:
+    """
+    Pool size and overflow of one worker: explicit DB_POOL_SIZE/DB_MAX_OVERFLOW, otherwise its share of
+    `max_connections`, half kept open and half opened under bursts. A DB_POOL_SIZE above the share gets no
+    overflow; a negative overflow would lift SQLAlchemy's connection limit altogether.
+    """
+    share = max(2, max_connections // max(1, workers))
+    pool_size = settings.DB_POOL_SIZE if settings.DB_POOL_SIZE is not None else (share + 1) // 2
+    max_overflow = settings.DB_MAX_OVERFLOW if settings.DB_MAX_OVERFLOW is not None else max(0, share - pool_size)
+    return pool_size, max_overflow
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that times every checkout and logs the slow ones with the pool status."""
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            DB_POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            DB_POOL_ACQUIRE_SECONDS.observe(elapsed)
+            if elapsed >= settings.DB_POOL_ACQUIRE_WARNING_SECONDS:
+                logger.warning(f'Waited {elapsed * 1000:.0f}ms for a database connection',
+                               extra={'duration': round(elapsed, 4), 'pool_size': self.size(),
+                                      'checked_out': self.checkedout(), 'overflow': max(self.overflow(), 0)})
+
+
+def export_pool_metrics(engine: AsyncEngine) -> None:
+    """Reports the pool of `engine` on /metrics; read at scrape time, so a pool recreated by dispose() is followed."""
+    DB_POOL_SIZE.set_function(lambda: engine.pool.size())
+    DB_POOL_CHECKED_OUT.set_function(lambda: engine.pool.checkedout())
+    # QueuePool counts overflow from -pool_size up
+    DB_POOL_OVERFLOW.set_function(lambda: max(engine.pool.overflow(), 0))
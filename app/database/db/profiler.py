@@ -0,0 +1,127 @@
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+from sqlalchemy import Engine, event
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+from app.core.logger import logger
+
+# bound parameter lists of different lengths (IN (?, ?, ?)) count as the same statement shape
+_IN_LIST = re.compile(r'\bIN\s*\(\s*(?:\?|%s|\$\d+|:\w+)(?:\s*,\s*(?:\?|%s|\$\d+|:\w+))*\s*\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def statement_shape(statement: str) -> str:
+    return _IN_LIST.sub('IN (...)', _WHITESPACE.sub(' ', statement).strip())
+
+
+@dataclass
+class QueryStats:
+    """Statements executed while profiling; rows are counted where the driver reports them."""
+    statements: int = 0
+    rows: int = 0
+    seconds: float = 0.0
+    shapes: Counter[str] = field(default_factory=Counter)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes executed at least `threshold` times: one query per parent row, an N+1."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar('query_stats', default=None)
+
+
+@contextmanager
+def profile_queries() -> Iterator[QueryStats]:
+    """Counts the statements executed in this context (task and the tasks it starts) on profiled engines."""
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def explain(connection: Connection, statement: str, parameters: Any) -> list[str]:
+    prefix = 'EXPLAIN QUERY PLAN ' if connection.dialect.name == 'sqlite' else 'EXPLAIN '
+    connection.info['explaining'] = True
+    try:
+        rows = connection.exec_driver_sql(prefix + statement, parameters).all()
+    finally:
+        connection.info['explaining'] = False
+    return [' '.join(str(value) for value in row) for row in rows]
+
+
+def attach_query_profiler(engine: Engine | AsyncEngine,
+                          slow_seconds: float = settings.SQL_SLOW_QUERY_SECONDS,
+                          explain_slow: bool = settings.SQL_EXPLAIN_SLOW_QUERIES) -> None:
+    """
+    Feeds every statement on `engine` into the QueryStats of the current `profile_queries` context and
+    logs statements slower than `slow_seconds` with their parameters, and their plan with `explain_slow`.
+    """
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+
+    @event.listens_for(sync_engine, 'before_cursor_execute')
+    def before_cursor_execute(connection: Connection, cursor, statement: str, parameters: Any,
+                              context: ExecutionContext, executemany: bool) -> None:
+        context._query_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, 'after_cursor_execute')
+    def after_cursor_execute(connection: Connection, cursor, statement: str, parameters: Any,
+                             context: ExecutionContext, executemany: bool) -> None:
+        if connection.info.get('explaining'):
+            return
+        elapsed = time.perf_counter() - context._query_started
+
+        stats = _query_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.rows += max(cursor.rowcount, 0)
+            stats.seconds += elapsed
+            stats.shapes[statement_shape(statement)] += 1
+
+        if elapsed >= slow_seconds:
+            extra = {'statement': statement, 'parameters': str(parameters), 'duration': round(elapsed, 4)}
+            if explain_slow and not executemany and statement.lstrip()[:6].upper() == 'SELECT':
+                try:
+                    extra['plan'] = explain(connection, statement, parameters)
+                except Exception as e:
+                    extra['plan_error'] = str(e)
+            logger.warning(f'Slow query, {elapsed * 1000:.1f}ms', extra=extra)
+
+
+class QueryProfilerMiddleware:
+    """Profiles the statements of each request, logs N+1 patterns and requests over the query budget."""
+
+    def __init__(self, app: ASGIApp,
+                 budget: int = settings.SQL_QUERY_BUDGET,
+                 n_plus_one_threshold: int = settings.SQL_N_PLUS_ONE_THRESHOLD):
+        self.app = app
+        self.budget = budget
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        with profile_queries() as stats:
+            await self.app(scope, receive, send)
+
+        extra = {'path': scope['path'], 'statements': stats.statements, 'rows': stats.rows,
+                 'sql_seconds': round(stats.seconds, 4)}
+        for shape, count in stats.repeated(self.n_plus_one_threshold):
+            logger.warning(f'Possible N+1: statement executed {count} times in one request',
+                           extra={**extra, 'statement': shape})
+        if stats.statements > self.budget:
+            logger.warning(f'Request ran {stats.statements} statements, budget is {self.budget}', extra=extra)
+        else:
+            logger.debug(f'Request ran {stats.statements} statements', extra=extra)
@@ -1,9 +1,12 @@
+from functools import cache
 from typing import Any, AsyncGenerator
 
 from sqlalchemy import Engine, create_engine
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession, async_sessionmaker
 from app.config import settings
 from app.core.utils import BASE_DIR
+from app.database.db.pool import InstrumentedPool, export_pool_metrics, pool_limits
+from app.database.db.profiler import attach_query_profiler
 
 if settings.DEBUG:
     SQLALCHEMY_ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{BASE_DIR}/db.sqlite"
@@ -14,11 +17,64 @@ if settings.DEBUG:
 else:
     SQLALCHEMY_DATABASE_URL = f'postgresql://{settings.DB_USER}:{settings.DB_PASS}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}'
 
-engine: Engine = create_engine(SQLALCHEMY_DATABASE_URL)
 
-engine_async: AsyncEngine = create_async_engine(SQLALCHEMY_ASYNC_DATABASE_URL, echo=False)
-AsyncSessionLocal = async_sessionmaker(
-    bind=engine_async,
+def async_engine_options() -> dict[str, Any]:
+    pool_size, max_overflow = pool_limits()
+    options = {
+        'poolclass': InstrumentedPool,
+        'pool_size': pool_size,
+        'max_overflow': max_overflow,
+        'pool_timeout': settings.DB_POOL_TIMEOUT,
+        'pool_recycle': settings.DB_POOL_RECYCLE,
+        'pool_pre_ping': settings.DB_POOL_PRE_PING,
+    }
+    if not settings.DEBUG:
+        server_settings = {'application_name': settings.APP_NAME}
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            server_settings['statement_timeout'] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        options['connect_args'] = {
+            # asyncpg's own cache and the one of the SQLAlchemy dialect on top of it
+            'statement_cache_size': settings.DB_STATEMENT_CACHE_SIZE,
+            'prepared_statement_cache_size': settings.DB_STATEMENT_CACHE_SIZE,
+            'server_settings': server_settings,
+        }
+    return options
+
+
+# engines are created on first use: importing the application should not load database drivers
+@cache
+def get_engine() -> Engine:
+    return create_engine(SQLALCHEMY_DATABASE_URL)
+
+
+@cache
+def get_async_engine() -> AsyncEngine:
+    engine_async = create_async_engine(SQLALCHEMY_ASYNC_DATABASE_URL, echo=False, **async_engine_options())
+    export_pool_metrics(engine_async)
+    if settings.SQL_PROFILER_ENABLED:
+        attach_query_profiler(engine_async)
+    return engine_async
+
+
+def __getattr__(name: str) -> Any:
+    # `from app.database.db.session import engine_async` keeps working, it builds the engine at that point
+    if name == 'engine':
+        return get_engine()
+    if name == 'engine_async':
+        return get_async_engine()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+class LazyAsyncSessionmaker(async_sessionmaker[AsyncSession]):
+    """Binds to the application engine when the first session is made."""
+
+    def __call__(self, **local_kw: Any) -> AsyncSession:
+        if self.kw.get('bind') is None:
+            self.configure(bind=get_async_engine())
+        return super().__call__(**local_kw)
+
+
+AsyncSessionLocal = LazyAsyncSessionmaker(
     expire_on_commit=False,
     class_=AsyncSession,
 )
@@ -11,3 +11,6 @@ from .shipping_price import ShippingPrice
 from .terminal import Terminal
 from .vehicle_type import VehicleType
 from .exchange_rate import ExchangeRate
+from .route_cost import RouteCost
+from .tariff_version import TariffVersion
+from .quote_job import QuoteJob, QuoteJobResult
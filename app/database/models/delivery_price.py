@@ -31,6 +31,10 @@ class DeliveryPrice(Base):
 
     price: Mapped[int] = mapped_column(nullable=False)
 
+    __table_args__ = (
+        UniqueConstraint('location_id', 'terminal_id', 'vehicle_type_id', name='uq_delivery_price_route'),
+    )
+
     location: Mapped["Location"] = relationship(back_populates="delivery_prices",
         lazy="selectin")
     terminal: Mapped["Terminal"] = relationship(
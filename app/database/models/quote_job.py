@@ -0,0 +1,48 @@
+from datetime import datetime, UTC
+from typing import Any
+
+from sqlalchemy import DateTime, Enum as SQLAlchemyEnum, ForeignKey, Index, JSON
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.models import Base
+from app.enums.quote_job import QuoteJobStatusEnum
+
+
+class QuoteJob(Base):
+    __tablename__ = "quote_job"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    status: Mapped[QuoteJobStatusEnum] = mapped_column(SQLAlchemyEnum(QuoteJobStatusEnum), nullable=False,
+                                                       default=QuoteJobStatusEnum.QUEUED)
+    filename: Mapped[str] = mapped_column(nullable=False)
+
+    total_rows: Mapped[int | None] = mapped_column(nullable=True, default=None)
+    processed_rows: Mapped[int] = mapped_column(nullable=False, default=0)
+    failed_rows: Mapped[int] = mapped_column(nullable=False, default=0)
+    tariff_version: Mapped[int | None] = mapped_column(nullable=True, default=None)
+    error: Mapped[str | None] = mapped_column(nullable=True, default=None)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False,
+                                                 default=lambda: datetime.now(UTC))
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, default=None)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, default=None)
+    # renewed with every committed chunk, a running job whose heartbeat stops has lost its worker
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, default=None)
+
+
+class QuoteJobResult(Base):
+    __tablename__ = "quote_job_result"
+
+    # also the pagination cursor: results are inserted in input order
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    job_id: Mapped[int] = mapped_column(ForeignKey("quote_job.id", ondelete="CASCADE"), nullable=False)
+    row_number: Mapped[int] = mapped_column(nullable=False)
+
+    lot: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+    quote: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True, default=None)
+    error_type: Mapped[str | None] = mapped_column(nullable=True, default=None)
+    error: Mapped[str | None] = mapped_column(nullable=True, default=None)
+
+    __table_args__ = (
+        Index('idx_quote_job_result_job_cursor', 'job_id', 'id'),
+    )
@@ -0,0 +1,69 @@
+from itertools import chain
+
+from sqlalchemy import Connection, Index, event, text
+from sqlalchemy.orm import Mapped, mapped_column, Session
+from app.database.models import Base
+
+# delivery to a terminal + ocean freight from the same terminal, for every route the price tables allow
+ROUTE_COST_SELECT = """
+SELECT delivery_price.location_id,
+       delivery_price.terminal_id,
+       shipping_price.destination_id,
+       delivery_price.vehicle_type_id,
+       delivery_price.price AS delivery_price,
+       shipping_price.price AS shipping_price,
+       delivery_price.price + shipping_price.price AS total_price,
+       row_number() OVER (
+           PARTITION BY delivery_price.location_id, shipping_price.destination_id, delivery_price.vehicle_type_id
+           ORDER BY delivery_price.price + shipping_price.price, delivery_price.terminal_id
+       ) = 1 AS is_cheapest
+FROM delivery_price
+JOIN shipping_price ON shipping_price.terminal_id = delivery_price.terminal_id
+                   AND shipping_price.vehicle_type_id = delivery_price.vehicle_type_id
+"""
+ROUTE_COST_SOURCE_TABLES = {'delivery_price', 'shipping_price'}
+
+
+class RouteCost(Base):
+    """
+    Precomputed transport leg. A materialized view on Postgres and a plain table on SQLite,
+    both created by migrations and kept current by `refresh_route_costs`.
+    """
+    __tablename__ = "route_cost"
+
+    location_id: Mapped[int] = mapped_column(primary_key=True)
+    terminal_id: Mapped[int] = mapped_column(primary_key=True)
+    destination_id: Mapped[int] = mapped_column(primary_key=True)
+    vehicle_type_id: Mapped[int] = mapped_column(primary_key=True)
+
+    delivery_price: Mapped[int] = mapped_column(nullable=False)
+    shipping_price: Mapped[int] = mapped_column(nullable=False)
+    total_price: Mapped[int] = mapped_column(nullable=False)
+    is_cheapest: Mapped[bool] = mapped_column(nullable=False)
+
+    __table_args__ = (
+        Index('uq_route_cost_route', 'location_id', 'destination_id', 'vehicle_type_id', 'terminal_id', unique=True),
+        {'info': {'is_view': True}},
+    )
+
+
+def refresh_route_costs(connection: Connection) -> None:
+    if connection.dialect.name == 'postgresql':
+        # needs the unique index; readers keep seeing the previous contents until the refresh commits
+        connection.execute(text('REFRESH MATERIALIZED VIEW CONCURRENTLY route_cost'))
+        return
+    connection.execute(text('DELETE FROM route_cost'))
+    connection.execute(text(f'INSERT INTO route_cost {ROUTE_COST_SELECT}'))
+
+
+@event.listens_for(Session, 'after_flush')
+def mark_route_costs_stale(session: Session, flush_context) -> None:
+    if any(getattr(obj, '__tablename__', None) in ROUTE_COST_SOURCE_TABLES
+           for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info['route_costs_stale'] = True
+
+
+@event.listens_for(Session, 'after_flush_postexec')
+def refresh_stale_route_costs(session: Session, flush_context) -> None:
+    if session.info.pop('route_costs_stale', False):
+        refresh_route_costs(session.connection())
@@ -32,6 +32,10 @@ class ShippingPrice(Base):
 
     price: Mapped[int] = mapped_column(nullable=False)
 
+    __table_args__ = (
+        UniqueConstraint('terminal_id', 'destination_id', 'vehicle_type_id', name='uq_shipping_price_route'),
+    )
+
 
     destination: Mapped["Destination"] = relationship(
         back_populates="shipping_prices",
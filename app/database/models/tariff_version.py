@@ -0,0 +1,38 @@
+from datetime import datetime, UTC
+from itertools import chain
+from typing import Any
+
+from sqlalchemy import DateTime, JSON, event
+from sqlalchemy.orm import Mapped, mapped_column, Session
+from app.database.models import Base, AdditionalFee, AdditionalSpecialFee, DeliveryPrice, Destination, Fee, \
+    FeeType, Location, ShippingPrice, Terminal, VehicleType, ExchangeRate
+
+
+class TariffVersion(Base):
+    __tablename__ = "tariff_version"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    source: Mapped[str] = mapped_column(nullable=False)
+    summary: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True, default=None)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False,
+                                                 default=lambda: datetime.now(UTC))
+
+
+# every model a quote is computed from; a write to any of them makes cached quotes stale
+VERSIONED_MODELS = (AdditionalFee, AdditionalSpecialFee, DeliveryPrice, Destination, Fee, FeeType, Location,
+                    ShippingPrice, Terminal, VehicleType, ExchangeRate)
+ORM_WRITE_SOURCE = 'orm_write'
+EXCHANGE_RATE_SOURCE = 'exchange_rate'
+
+
+@event.listens_for(Session, 'before_flush')
+def bump_tariff_version(session: Session, flush_context, instances) -> None:
+    changed_tables = {
+        obj.__tablename__
+        for obj in chain(session.new, session.dirty, session.deleted)
+        if isinstance(obj, VERSIONED_MODELS) and (obj not in session.dirty or session.is_modified(obj))
+    }
+    if not changed_tables:
+        return
+    source = EXCHANGE_RATE_SOURCE if changed_tables == {ExchangeRate.__tablename__} else ORM_WRITE_SOURCE
+    session.add(TariffVersion(source=source, summary={'tables': sorted(changed_tables)}))
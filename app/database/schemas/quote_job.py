@@ -0,0 +1,45 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+from app.enums.quote_job import QuoteJobStatusEnum
+
+class QuoteJobCreate(BaseModel):
+    filename: str
+
+class QuoteJobUpdate(BaseModel):
+    status: QuoteJobStatusEnum | None = None
+    total_rows: int | None = None
+    processed_rows: int | None = None
+    failed_rows: int | None = None
+    tariff_version: int | None = None
+    error: str | None = None
+
+class QuoteJobRead(QuoteJobCreate):
+    id: int
+    status: QuoteJobStatusEnum
+    total_rows: int | None
+    processed_rows: int
+    failed_rows: int
+    tariff_version: int | None
+    error: str | None
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class QuoteJobResultRead(BaseModel):
+    id: int
+    row_number: int
+    lot: dict[str, Any]
+    quote: dict[str, Any] | None
+    error_type: str | None
+    error: str | None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class QuoteJobResultPage(BaseModel):
+    items: list[QuoteJobResultRead]
+    next_cursor: int | None
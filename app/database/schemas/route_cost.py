@@ -0,0 +1,18 @@
+from pydantic import BaseModel, ConfigDict
+
+class RouteCostCreate(BaseModel):
+    location_id: int
+    terminal_id: int
+    destination_id: int
+    vehicle_type_id: int
+    delivery_price: int
+    shipping_price: int
+    total_price: int
+    is_cheapest: bool
+
+class RouteCostUpdate(BaseModel):
+    delivery_price: int | None = None
+    shipping_price: int | None = None
+
+class RouteCostRead(RouteCostCreate):
+    model_config = ConfigDict(from_attributes=True)
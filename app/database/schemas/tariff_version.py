@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+
+class TariffVersionCreate(BaseModel):
+    source: str
+    summary: dict[str, Any] | None = None
+
+class TariffVersionUpdate(BaseModel):
+    summary: dict[str, Any] | None = None
+
+class TariffVersionRead(TariffVersionCreate):
+    id: int
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
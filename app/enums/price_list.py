@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class PriceListFormatEnum(str, Enum):
+    CSV = 'csv'
+    NDJSON = 'ndjson'
+
+class PriceListDatasetEnum(str, Enum):
+    ROUTES = 'routes'
+    FEES = 'fees'
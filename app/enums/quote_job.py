@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class QuoteJobStatusEnum(str, Enum):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
@@ -23,9 +23,10 @@ class ApiRpcClient(BaseRpcClient[lot_pb2_grpc.LotServiceStub]):
     def _create_stub(self, channel: grpc.aio.Channel) -> T:
         return lot_pb2_grpc.LotServiceStub(channel)
 
-    async def get_lot_by_vin_or_lot_id(self, vin_or_lot_id: str, site: str = None) -> lot_pb2.GetLotByVinOrLotResponse:
+    async def get_lot_by_vin_or_lot_id(self, vin_or_lot_id: str, site: str = None,
+                                       timeout: float | None = None) -> lot_pb2.GetLotByVinOrLotResponse:
         data = lot_pb2.GetLotByVinOrLotRequest(vin_or_lot_id=vin_or_lot_id, site=site)
-        return await self._execute_request(self.stub.GetLotByVinOrLot, data)
+        return await self._execute_request(self.stub.GetLotByVinOrLot, data, timeout=timeout)
 
     async def get_current_bid(self, lot_id: int, site: str) -> lot_pb2.GetCurrentBidResponse:
         data = lot_pb2.GetCurrentBidRequest(lot_id=lot_id, site=site)
@@ -34,3 +35,22 @@ class ApiRpcClient(BaseRpcClient[lot_pb2_grpc.LotServiceStub]):
     async def get_sale_history(self, lot_id: int, site: str) -> lot_pb2.GetSaleHistoryResponse:
         data = lot_pb2.GetSaleHistoryRequest(lot_id=lot_id, site=site)
         return await self._execute_request(self.stub.GetSaleHistory, data)
+
+
+# one channel per worker instead of one per request, grpc reconnects a broken channel by itself
+_auction_api: ApiRpcClient | None = None
+
+
+async def get_auction_api() -> ApiRpcClient:
+    global _auction_api
+    if _auction_api is None:
+        _auction_api = ApiRpcClient()
+    await _auction_api.connect()
+    return _auction_api
+
+
+async def close_auction_api() -> None:
+    global _auction_api
+    if _auction_api is not None:
+        await _auction_api.disconnect()
+        _auction_api = None
@@ -3,6 +3,8 @@ from abc import abstractmethod, ABC
 from typing import TypeVar, Generic, Optional, Callable, Any, Dict
 import grpc
 
+from app.core.timing import timed
+
 
 T = TypeVar('T')
 class BaseRpcClient(Generic[T], ABC):
@@ -68,6 +70,7 @@ class BaseRpcClient(Generic[T], ABC):
                 "RPC клиент не подключен. Используйте async with или вызовите connect()"
             )
 
+    @timed('rpc')
     async def _execute_request(
             self,
             method: Callable,
@@ -83,13 +86,11 @@ class BaseRpcClient(Generic[T], ABC):
 
         request_timeout = timeout or self.timeout
 
-
-        response = await asyncio.wait_for(
-            method(
-                request,
-                metadata=rpc_metadata,
-                compression=self.compression
-            ),
+        # a gRPC deadline, not asyncio.wait_for: the server gives up too and the caller gets DEADLINE_EXCEEDED
+        response = await method(
+            request,
+            metadata=rpc_metadata,
+            compression=self.compression,
             timeout=request_timeout
         )
 
@@ -1,16 +1,36 @@
+import asyncio
+from typing import Iterable
 
+import grpc
 from grpc_health.v1 import health_pb2_grpc, health_pb2
 
+from app.core.readiness import readiness
+
 
 class HealthCheckServicer(health_pb2_grpc.HealthServicer):
-    """Health check сервис для мониторинга"""
+    """Health check сервис для мониторинга, NOT_SERVING пока воркер не прогрет"""
+
+    def __init__(self, services: Iterable[str] = ('',), poll_interval: float = 1.0):
+        self.services = set(services)  # '' is the server as a whole
+        self.poll_interval = poll_interval
+
+    def _status(self, service: str) -> health_pb2.HealthCheckResponse.ServingStatus:
+        if service not in self.services:
+            return health_pb2.HealthCheckResponse.SERVICE_UNKNOWN
+        if readiness.ready:
+            return health_pb2.HealthCheckResponse.SERVING
+        return health_pb2.HealthCheckResponse.NOT_SERVING
 
-    def Check(self, request, context):
-        return health_pb2.HealthCheckResponse(
-            status=health_pb2.HealthCheckResponse.SERVING
-        )
+    async def Check(self, request, context: grpc.aio.ServicerContext):
+        if request.service not in self.services:
+            await context.abort(grpc.StatusCode.NOT_FOUND, f'Unknown service {request.service!r}')
+        return health_pb2.HealthCheckResponse(status=self._status(request.service))
 
-    def Watch(self, request, context):
-        return health_pb2.HealthCheckResponse(
-            status=health_pb2.HealthCheckResponse.SERVING
-        )
\ No newline at end of file
+    async def Watch(self, request, context: grpc.aio.ServicerContext):
+        # the current status, then every change until the watcher goes away
+        status = None
+        while True:
+            if (current := self._status(request.service)) != status:
+                status = current
+                yield health_pb2.HealthCheckResponse(status=status)
+            await asyncio.sleep(self.poll_interval)
@@ -0,0 +1,172 @@
+import asyncio
+import os
+import sys
+from typing import AsyncIterator
+
+import grpc
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.core.logger import logger
+from app.enums.auction import AuctionEnum
+from app.enums.fee_type import FeeTypeEnum
+from app.enums.vehicle_type import VehicleTypeEnum
+from app.schemas.calculator import CalculatorDataIn
+from app.services.calculator.cache_key import calculator_input_key
+from app.services.calculator.exceptions import DestinationNotFoundError, LocationNotFoundError, FeeNotFoundError
+from app.services.calculator.popularity import quote_popularity
+from app.services.calculator.quotes import resolve_quote
+from app.services.calculator.types import Calculator, CalculatorOut
+
+# Ensure the generated calculator package is importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'gen', 'python'))
+
+from app.rpc_server.gen.python.calculator.v1 import calculator_pb2_grpc, calculator_pb2
+
+SERVICE_NAME = calculator_pb2.DESCRIPTOR.services_by_name['CalculatorService'].full_name
+
+# protobuf enum values by the name of the enum member they stand for, 0 is "not set"; an unset fee type is
+# None like an HTTP request without one, the calculator picks the default
+AUCTIONS = {calculator_pb2.Auction.Value(f'AUCTION_{auction.name}'): auction for auction in AuctionEnum}
+VEHICLE_TYPES = {calculator_pb2.VehicleType.Value(f'VEHICLE_TYPE_{vehicle_type.name}'): vehicle_type
+                 for vehicle_type in VehicleTypeEnum}
+FEE_TYPES = {calculator_pb2.FEE_TYPE_UNSPECIFIED: None} | {
+    calculator_pb2.FeeType.Value(f'FEE_TYPE_{fee_type.name}'): fee_type for fee_type in FeeTypeEnum}
+
+
+class QuoteError(Exception):
+    def __init__(self, code: grpc.StatusCode, message: str):
+        self.code = code
+        self.message = message
+        super().__init__(message)
+
+
+def decode_request(request: calculator_pb2.QuoteRequest) -> CalculatorDataIn:
+    if request.auction not in AUCTIONS:
+        raise QuoteError(grpc.StatusCode.INVALID_ARGUMENT, 'Unknown auction')
+    if request.vehicle_type not in VEHICLE_TYPES:
+        raise QuoteError(grpc.StatusCode.INVALID_ARGUMENT, 'Unknown vehicle type')
+    if request.fee_type not in FEE_TYPES:
+        raise QuoteError(grpc.StatusCode.INVALID_ARGUMENT, 'Unknown fee type')
+    try:
+        return CalculatorDataIn(
+            price=request.price,
+            auction=AUCTIONS[request.auction],
+            fee_type=FEE_TYPES[request.fee_type],
+            vehicle_type=VEHICLE_TYPES[request.vehicle_type],
+            location=request.location,
+            destination=request.destination if request.HasField('destination') else None
+        )
+    except ValueError as e:
+        raise QuoteError(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+
+def _encode_amounts(out: CalculatorOut) -> calculator_pb2.Amounts:
+    calculator, eu_calculator = out.calculator, out.eu_calculator
+    return calculator_pb2.Amounts(
+        transportation_price=[city.price for city in calculator.transportation_price],
+        ocean_ship=[city.price for city in calculator.ocean_ship],
+        totals=[city.price for city in calculator.totals],
+        eu_totals=[city.price for city in eu_calculator.totals],
+        eu_vats=[city.price for city in eu_calculator.vats.eu_vats],
+        vats=[city.price for city in eu_calculator.vats.vats],
+        fees=[fee.price for fee in calculator.additional.fees],
+        broker_fee=calculator.broker_fee,
+        auction_fee=calculator.auction_fee,
+        internet_fee=calculator.internet_fee,
+        live_fee=calculator.live_fee,
+        additional_fees=calculator.additional.summ
+    )
+
+
+def encode_quote(quote: Calculator) -> calculator_pb2.Quote:
+    """Terminal and fee names once, every list of amounts in their order."""
+    dollars = quote.calculator_in_dollars.calculator
+    return calculator_pb2.Quote(
+        terminals=[city.name for city in dollars.totals],
+        fees=[fee.name for fee in dollars.additional.fees],
+        dollars=_encode_amounts(quote.calculator_in_dollars),
+        currency=_encode_amounts(quote.calculator_in_currency)
+    )
+
+
+class CalculatorServicer(calculator_pb2_grpc.CalculatorServiceServicer):
+    """
+    The calculator for internal callers: the quotes of GET /v1/public/calculator, with its cache, ETags and stale
+    answers, as protobuf. Without a session factory (bundle mode) quotes come from the bundle.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession] | None,
+                 batch_concurrency: int = settings.GRPC_BATCH_CONCURRENCY):
+        self.session_factory = session_factory
+        self.batch_concurrency = batch_concurrency
+
+    async def _answer(self, request: calculator_pb2.QuoteRequest) -> calculator_pb2.QuoteResponse:
+        data = decode_request(request)
+        input_key = calculator_input_key(data)
+        quote_popularity.add(input_key)
+
+        async def get_input() -> CalculatorDataIn:
+            return data
+
+        try:
+            if self.session_factory is None:
+                result = await resolve_quote(None, input_key, get_input)
+            else:
+                async with self.session_factory() as session:
+                    result = await resolve_quote(session, input_key, get_input)
+        except (DestinationNotFoundError, LocationNotFoundError, FeeNotFoundError) as e:
+            raise QuoteError(grpc.StatusCode.NOT_FOUND, e.message)
+        except (SQLAlchemyError, OSError) as e:
+            logger.error('Could not quote over gRPC', exc_info=e, extra={'input_key': input_key})
+            raise QuoteError(grpc.StatusCode.UNAVAILABLE, 'Tariffs are unavailable')
+        return calculator_pb2.QuoteResponse(id=request.id, quote=encode_quote(result.quote), etag=result.etag or '',
+                                            stale_age=round(result.stale_age or 0))
+
+    async def _answer_or_error(self, request: calculator_pb2.QuoteRequest) -> calculator_pb2.QuoteResponse:
+        try:
+            return await self._answer(request)
+        except QuoteError as e:
+            return calculator_pb2.QuoteResponse(id=request.id, error=calculator_pb2.Error(code=e.code.value[0],
+                                                                                           message=e.message))
+        except Exception as e:
+            # raised out of the batch's task group it would cancel every other quote of the stream
+            logger.error('Could not quote a batch item over gRPC', exc_info=e, extra={'request_id': request.id})
+            return calculator_pb2.QuoteResponse(id=request.id, error=calculator_pb2.Error(
+                code=grpc.StatusCode.INTERNAL.value[0], message='Internal error'))
+
+    async def Quote(self, request: calculator_pb2.QuoteRequest,
+                    context: grpc.aio.ServicerContext) -> calculator_pb2.QuoteResponse:
+        try:
+            return await self._answer(request)
+        except QuoteError as e:
+            await context.abort(e.code, e.message)
+
+    async def QuoteBatch(self, request_iterator: AsyncIterator[calculator_pb2.QuoteRequest],
+                         context: grpc.aio.ServicerContext) -> AsyncIterator[calculator_pb2.QuoteResponse]:
+        # up to `batch_concurrency` quotes computed or waiting for the caller to read them, answered as each is
+        # ready; a failed quote is an error response, the stream goes on
+        slots = asyncio.Semaphore(self.batch_concurrency)
+        responses: asyncio.Queue[calculator_pb2.QuoteResponse | None] = asyncio.Queue()
+
+        async def answer(request: calculator_pb2.QuoteRequest) -> None:
+            responses.put_nowait(await self._answer_or_error(request))
+
+        async def read() -> None:
+            try:
+                async with asyncio.TaskGroup() as group:
+                    async for request in request_iterator:
+                        await slots.acquire()
+                        group.create_task(answer(request))
+            finally:
+                responses.put_nowait(None)
+
+        reader = asyncio.create_task(read(), name='grpc-quote-batch')
+        try:
+            while (response := await responses.get()) is not None:
+                yield response
+                slots.release()
+            await reader
+        finally:
+            reader.cancel()
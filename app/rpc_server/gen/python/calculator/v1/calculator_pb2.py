@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: calculator/v1/calculator.proto
+# Protobuf Python Version: 6.31.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    6,
+    31,
+    1,
+    '',
+    'calculator/v1/calculator.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1e\x63\x61lculator/v1/calculator.proto\x12\rcalculator.v1\"\xea\x01\n\x0cQuoteRequest\x12\n\n\x02id\x18\x01 \x01(\x04\x12\r\n\x05price\x18\x02 \x01(\x05\x12\'\n\x07\x61uction\x18\x03 \x01(\x0e\x32\x16.calculator.v1.Auction\x12\x30\n\x0cvehicle_type\x18\x04 \x01(\x0e\x32\x1a.calculator.v1.VehicleType\x12\x10\n\x08location\x18\x05 \x01(\t\x12\x18\n\x0b\x64\x65stination\x18\x06 \x01(\tH\x00\x88\x01\x01\x12(\n\x08\x66\x65\x65_type\x18\x07 \x01(\x0e\x32\x16.calculator.v1.FeeTypeB\x0e\n\x0c_destination\"\xf5\x01\n\x07\x41mounts\x12\x1c\n\x14transportation_price\x18\x01 \x03(\x05\x12\x12\n\nocean_ship\x18\x02 \x03(\x05\x12\x0e\n\x06totals\x18\x03 \x03(\x05\x12\x11\n\teu_totals\x18\x04 \x03(\x05\x12\x0f\n\x07\x65u_vats\x18\x05 \x03(\x05\x12\x0c\n\x04vats\x18\x06 \x03(\x05\x12\x0c\n\x04\x66\x65\x65s\x18\x07 \x03(\x05\x12\x12\n\nbroker_fee\x18\x08 \x01(\x05\x12\x13\n\x0b\x61uction_fee\x18\t \x01(\x05\x12\x14\n\x0cinternet_fee\x18\n \x01(\x05\x12\x10\n\x08live_fee\x18\x0b \x01(\x05\x12\x17\n\x0f\x61\x64\x64itional_fees\x18\x0c \x01(\x05\"{\n\x05Quote\x12\x11\n\tterminals\x18\x01 \x03(\t\x12\x0c\n\x04\x66\x65\x65s\x18\x02 \x03(\t\x12\'\n\x07\x64ollars\x18\x03 \x01(\x0b\x32\x16.calculator.v1.Amounts\x12(\n\x08\x63urrency\x18\x04 \x01(\x0b\x32\x16.calculator.v1.Amounts\"&\n\x05\x45rror\x12\x0c\n\x04\x63ode\x18\x01 \x01(\x05\x12\x0f\n\x07message\x18\x02 \x01(\t\"\x94\x01\n\rQuoteResponse\x12\n\n\x02id\x18\x01 \x01(\x04\x12%\n\x05quote\x18\x02 \x01(\x0b\x32\x14.calculator.v1.QuoteH\x00\x12%\n\x05\x65rror\x18\x03 \x01(\x0b\x32\x14.calculator.v1.ErrorH\x00\x12\x0c\n\x04\x65tag\x18\x04 \x01(\t\x12\x11\n\tstale_age\x18\x05 \x01(\rB\x08\n\x06result*H\n\x07\x41uction\x12\x17\n\x13\x41UCTION_UNSPECIFIED\x10\x00\x12\x12\n\x0e\x41UCTION_COPART\x10\x01\x12\x10\n\x0c\x41UCTION_IAAI\x10\x02*X\n\x0bVehicleType\x12\x1c\n\x18VEHICLE_TYPE_UNSPECIFIED\x10\x00\x12\x14\n\x10VEHICLE_TYPE_CAR\x10\x01\x12\x15\n\x11VEHICLE_TYPE_MOTO\x10\x02*\x99\x01\n\x07\x46\x65\x65Type\x12\x18\n\x14\x46\x45\x45_TYPE_UNSPECIFIED\x10\x00\x12\x1c\n\x18\x46\x45\x45_TYPE_CLEAN_TITLE_FEE\x10\x01\x12 \n\x1c\x46\x45\x45_TYPE_NON_CLEAN_TITLE_FEE\x10\x02\x12\x1d\n\x19\x46\x45\x45_TYPE_CRASHED_TOYS_FEE\x10\x03\x12\x15\n\x11\x46\x45\x45_TYPE_LESS_FEE\x10\x04\x32\xa4\x01\n\x11\x43\x61lculatorService\x12\x42\n\x05Quote\x12\x1b.calculator.v1.QuoteRequest\x1a\x1c.calculator.v1.QuoteResponse\x12K\n\nQuoteBatch\x12\x1b.calculator.v1.QuoteRequest\x1a\x1c.calculator.v1.QuoteResponse(\x01\x30\x01\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'calculator.v1.calculator_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_AUCTION']._serialized_start=850
+  _globals['_AUCTION']._serialized_end=922
+  _globals['_VEHICLETYPE']._serialized_start=924
+  _globals['_VEHICLETYPE']._serialized_end=1012
+  _globals['_FEETYPE']._serialized_start=1015
+  _globals['_FEETYPE']._serialized_end=1168
+  _globals['_QUOTEREQUEST']._serialized_start=50
+  _globals['_QUOTEREQUEST']._serialized_end=284
+  _globals['_AMOUNTS']._serialized_start=287
+  _globals['_AMOUNTS']._serialized_end=532
+  _globals['_QUOTE']._serialized_start=534
+  _globals['_QUOTE']._serialized_end=657
+  _globals['_ERROR']._serialized_start=659
+  _globals['_ERROR']._serialized_end=697
+  _globals['_QUOTERESPONSE']._serialized_start=700
+  _globals['_QUOTERESPONSE']._serialized_end=848
+  _globals['_CALCULATORSERVICE']._serialized_start=1171
+  _globals['_CALCULATORSERVICE']._serialized_end=1335
+# @@protoc_insertion_point(module_scope)
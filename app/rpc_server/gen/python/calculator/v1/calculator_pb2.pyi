@@ -0,0 +1,119 @@
+from google.protobuf.internal import containers as _containers
+from google.protobuf.internal import enum_type_wrapper as _enum_type_wrapper
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from collections.abc import Iterable as _Iterable, Mapping as _Mapping
+from typing import ClassVar as _ClassVar, Optional as _Optional, Union as _Union
+
+DESCRIPTOR: _descriptor.FileDescriptor
+
+class Auction(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+    __slots__ = ()
+    AUCTION_UNSPECIFIED: _ClassVar[Auction]
+    AUCTION_COPART: _ClassVar[Auction]
+    AUCTION_IAAI: _ClassVar[Auction]
+
+class VehicleType(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+    __slots__ = ()
+    VEHICLE_TYPE_UNSPECIFIED: _ClassVar[VehicleType]
+    VEHICLE_TYPE_CAR: _ClassVar[VehicleType]
+    VEHICLE_TYPE_MOTO: _ClassVar[VehicleType]
+
+class FeeType(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+    __slots__ = ()
+    FEE_TYPE_UNSPECIFIED: _ClassVar[FeeType]
+    FEE_TYPE_CLEAN_TITLE_FEE: _ClassVar[FeeType]
+    FEE_TYPE_NON_CLEAN_TITLE_FEE: _ClassVar[FeeType]
+    FEE_TYPE_CRASHED_TOYS_FEE: _ClassVar[FeeType]
+    FEE_TYPE_LESS_FEE: _ClassVar[FeeType]
+AUCTION_UNSPECIFIED: Auction
+AUCTION_COPART: Auction
+AUCTION_IAAI: Auction
+VEHICLE_TYPE_UNSPECIFIED: VehicleType
+VEHICLE_TYPE_CAR: VehicleType
+VEHICLE_TYPE_MOTO: VehicleType
+FEE_TYPE_UNSPECIFIED: FeeType
+FEE_TYPE_CLEAN_TITLE_FEE: FeeType
+FEE_TYPE_NON_CLEAN_TITLE_FEE: FeeType
+FEE_TYPE_CRASHED_TOYS_FEE: FeeType
+FEE_TYPE_LESS_FEE: FeeType
+
+class QuoteRequest(_message.Message):
+    __slots__ = ("id", "price", "auction", "vehicle_type", "location", "destination", "fee_type")
+    ID_FIELD_NUMBER: _ClassVar[int]
+    PRICE_FIELD_NUMBER: _ClassVar[int]
+    AUCTION_FIELD_NUMBER: _ClassVar[int]
+    VEHICLE_TYPE_FIELD_NUMBER: _ClassVar[int]
+    LOCATION_FIELD_NUMBER: _ClassVar[int]
+    DESTINATION_FIELD_NUMBER: _ClassVar[int]
+    FEE_TYPE_FIELD_NUMBER: _ClassVar[int]
+    id: int
+    price: int
+    auction: Auction
+    vehicle_type: VehicleType
+    location: str
+    destination: str
+    fee_type: FeeType
+    def __init__(self, id: _Optional[int] = ..., price: _Optional[int] = ..., auction: _Optional[_Union[Auction, str]] = ..., vehicle_type: _Optional[_Union[VehicleType, str]] = ..., location: _Optional[str] = ..., destination: _Optional[str] = ..., fee_type: _Optional[_Union[FeeType, str]] = ...) -> None: ...
+
+class Amounts(_message.Message):
+    __slots__ = ("transportation_price", "ocean_ship", "totals", "eu_totals", "eu_vats", "vats", "fees", "broker_fee", "auction_fee", "internet_fee", "live_fee", "additional_fees")
+    TRANSPORTATION_PRICE_FIELD_NUMBER: _ClassVar[int]
+    OCEAN_SHIP_FIELD_NUMBER: _ClassVar[int]
+    TOTALS_FIELD_NUMBER: _ClassVar[int]
+    EU_TOTALS_FIELD_NUMBER: _ClassVar[int]
+    EU_VATS_FIELD_NUMBER: _ClassVar[int]
+    VATS_FIELD_NUMBER: _ClassVar[int]
+    FEES_FIELD_NUMBER: _ClassVar[int]
+    BROKER_FEE_FIELD_NUMBER: _ClassVar[int]
+    AUCTION_FEE_FIELD_NUMBER: _ClassVar[int]
+    INTERNET_FEE_FIELD_NUMBER: _ClassVar[int]
+    LIVE_FEE_FIELD_NUMBER: _ClassVar[int]
+    ADDITIONAL_FEES_FIELD_NUMBER: _ClassVar[int]
+    transportation_price: _containers.RepeatedScalarFieldContainer[int]
+    ocean_ship: _containers.RepeatedScalarFieldContainer[int]
+    totals: _containers.RepeatedScalarFieldContainer[int]
+    eu_totals: _containers.RepeatedScalarFieldContainer[int]
+    eu_vats: _containers.RepeatedScalarFieldContainer[int]
+    vats: _containers.RepeatedScalarFieldContainer[int]
+    fees: _containers.RepeatedScalarFieldContainer[int]
+    broker_fee: int
+    auction_fee: int
+    internet_fee: int
+    live_fee: int
+    additional_fees: int
+    def __init__(self, transportation_price: _Optional[_Iterable[int]] = ..., ocean_ship: _Optional[_Iterable[int]] = ..., totals: _Optional[_Iterable[int]] = ..., eu_totals: _Optional[_Iterable[int]] = ..., eu_vats: _Optional[_Iterable[int]] = ..., vats: _Optional[_Iterable[int]] = ..., fees: _Optional[_Iterable[int]] = ..., broker_fee: _Optional[int] = ..., auction_fee: _Optional[int] = ..., internet_fee: _Optional[int] = ..., live_fee: _Optional[int] = ..., additional_fees: _Optional[int] = ...) -> None: ...
+
+class Quote(_message.Message):
+    __slots__ = ("terminals", "fees", "dollars", "currency")
+    TERMINALS_FIELD_NUMBER: _ClassVar[int]
+    FEES_FIELD_NUMBER: _ClassVar[int]
+    DOLLARS_FIELD_NUMBER: _ClassVar[int]
+    CURRENCY_FIELD_NUMBER: _ClassVar[int]
+    terminals: _containers.RepeatedScalarFieldContainer[str]
+    fees: _containers.RepeatedScalarFieldContainer[str]
+    dollars: Amounts
+    currency: Amounts
+    def __init__(self, terminals: _Optional[_Iterable[str]] = ..., fees: _Optional[_Iterable[str]] = ..., dollars: _Optional[_Union[Amounts, _Mapping]] = ..., currency: _Optional[_Union[Amounts, _Mapping]] = ...) -> None: ...
+
+class Error(_message.Message):
+    __slots__ = ("code", "message")
+    CODE_FIELD_NUMBER: _ClassVar[int]
+    MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    code: int
+    message: str
+    def __init__(self, code: _Optional[int] = ..., message: _Optional[str] = ...) -> None: ...
+
+class QuoteResponse(_message.Message):
+    __slots__ = ("id", "quote", "error", "etag", "stale_age")
+    ID_FIELD_NUMBER: _ClassVar[int]
+    QUOTE_FIELD_NUMBER: _ClassVar[int]
+    ERROR_FIELD_NUMBER: _ClassVar[int]
+    ETAG_FIELD_NUMBER: _ClassVar[int]
+    STALE_AGE_FIELD_NUMBER: _ClassVar[int]
+    id: int
+    quote: Quote
+    error: Error
+    etag: str
+    stale_age: int
+    def __init__(self, id: _Optional[int] = ..., quote: _Optional[_Union[Quote, _Mapping]] = ..., error: _Optional[_Union[Error, _Mapping]] = ..., etag: _Optional[str] = ..., stale_age: _Optional[int] = ...) -> None: ...
@@ -0,0 +1,144 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+import warnings
+
+from calculator.v1 import calculator_pb2 as calculator_dot_v1_dot_calculator__pb2
+
+GRPC_GENERATED_VERSION = '1.74.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + f' but the generated code in calculator/v1/calculator_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class CalculatorServiceStub(object):
+    """Quotes for internal callers, the same quotes as GET /v1/public/calculator.
+    """
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.Quote = channel.unary_unary(
+                '/calculator.v1.CalculatorService/Quote',
+                request_serializer=calculator_dot_v1_dot_calculator__pb2.QuoteRequest.SerializeToString,
+                response_deserializer=calculator_dot_v1_dot_calculator__pb2.QuoteResponse.FromString,
+                _registered_method=True)
+        self.QuoteBatch = channel.stream_stream(
+                '/calculator.v1.CalculatorService/QuoteBatch',
+                request_serializer=calculator_dot_v1_dot_calculator__pb2.QuoteRequest.SerializeToString,
+                response_deserializer=calculator_dot_v1_dot_calculator__pb2.QuoteResponse.FromString,
+                _registered_method=True)
+
+
+class CalculatorServiceServicer(object):
+    """Quotes for internal callers, the same quotes as GET /v1/public/calculator.
+    """
+
+    def Quote(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def QuoteBatch(self, request_iterator, context):
+        """Answers come back as soon as each quote is ready, not in request order; match them by id.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_CalculatorServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'Quote': grpc.unary_unary_rpc_method_handler(
+                    servicer.Quote,
+                    request_deserializer=calculator_dot_v1_dot_calculator__pb2.QuoteRequest.FromString,
+                    response_serializer=calculator_dot_v1_dot_calculator__pb2.QuoteResponse.SerializeToString,
+            ),
+            'QuoteBatch': grpc.stream_stream_rpc_method_handler(
+                    servicer.QuoteBatch,
+                    request_deserializer=calculator_dot_v1_dot_calculator__pb2.QuoteRequest.FromString,
+                    response_serializer=calculator_dot_v1_dot_calculator__pb2.QuoteResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'calculator.v1.CalculatorService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('calculator.v1.CalculatorService', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class CalculatorService(object):
+    """Quotes for internal callers, the same quotes as GET /v1/public/calculator.
+    """
+
+    @staticmethod
+    def Quote(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/calculator.v1.CalculatorService/Quote',
+            calculator_dot_v1_dot_calculator__pb2.QuoteRequest.SerializeToString,
+            calculator_dot_v1_dot_calculator__pb2.QuoteResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def QuoteBatch(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/calculator.v1.CalculatorService/QuoteBatch',
+            calculator_dot_v1_dot_calculator__pb2.QuoteRequest.SerializeToString,
+            calculator_dot_v1_dot_calculator__pb2.QuoteResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,47 @@
+import grpc
+from grpc_health.v1 import health_pb2_grpc
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.core.logger import logger
+from app.database.db.session import AsyncSessionLocal
+from app.rpc_client.health import HealthCheckServicer
+from app.rpc_server.calculator import CalculatorServicer, SERVICE_NAME, calculator_pb2_grpc
+from app.services.calculator.bundle import calculator_bundle
+
+
+class CalculatorGrpcServer:
+    """
+    The gRPC API next to FastAPI, started by every worker. Workers listen on the same port (SO_REUSEPORT),
+    the kernel spreads connections between them like it spreads HTTP ones.
+    """
+
+    def __init__(self, address: str = f'{settings.GRPC_HOST}:{settings.GRPC_PORT}',
+                 session_factory: async_sessionmaker[AsyncSession] | None = AsyncSessionLocal,
+                 grace: float = settings.GRPC_SHUTDOWN_GRACE):
+        self.address = address
+        self.session_factory = session_factory
+        self.grace = grace
+        self.port: int | None = None
+        self._server: grpc.aio.Server | None = None
+
+    async def start(self) -> None:
+        if self._server is not None:
+            return
+        server = grpc.aio.server(options=[('grpc.so_reuseport', 1)])
+        calculator_pb2_grpc.add_CalculatorServiceServicer_to_server(CalculatorServicer(self.session_factory), server)
+        health_pb2_grpc.add_HealthServicer_to_server(HealthCheckServicer(services=('', SERVICE_NAME)), server)
+        self.port = server.add_insecure_port(self.address)
+        await server.start()
+        self._server = server
+        logger.info(f'gRPC server listening on port {self.port}')
+
+    async def stop(self) -> None:
+        # calls in progress get `grace` seconds to finish, new ones are refused
+        if self._server is not None:
+            await self._server.stop(self.grace)
+            self._server = None
+
+
+calculator_grpc_server = CalculatorGrpcServer(session_factory=None if calculator_bundle is not None
+                                              else AsyncSessionLocal)
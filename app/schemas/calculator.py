@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.enums.auction import AuctionEnum
 from app.enums.fee_type import FeeTypeEnum
@@ -6,6 +6,8 @@ from app.enums.vehicle_type import VehicleTypeEnum
 
 
 class CalculatorDataIn(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
     price: int = Field(..., gt=0, description="Price for vehicle")
     auction: AuctionEnum = Field(..., description="Auction")
     fee_type: FeeTypeEnum | None = Field(description="Fee type", default=FeeTypeEnum.NON_CLEAN_TITLE_FEE)
@@ -13,3 +15,16 @@ class CalculatorDataIn(BaseModel):
     destination: str | None = Field(None, description="Destination (Port in Europe)")
     location: str = Field(..., description="Location")
 
+
+class LiveQuoteSessionIn(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    auction: AuctionEnum = Field(..., description="Auction")
+    fee_type: FeeTypeEnum | None = Field(description="Fee type", default=FeeTypeEnum.NON_CLEAN_TITLE_FEE)
+    vehicle_type: VehicleTypeEnum = Field(..., description="Vehicle type")
+    destination: str | None = Field(None, description="Destination (Port in Europe)")
+    location: str = Field(..., description="Location")
+
+
+class LivePriceIn(BaseModel):
+    price: int = Field(..., gt=0, description="Price for vehicle")
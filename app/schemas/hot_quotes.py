@@ -0,0 +1,23 @@
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class HotQuoteRead(BaseModel):
+    input: dict[str, Any]  # normalized calculator input
+    count: int  # requests seen, may overestimate by `error`
+    error: int
+
+class PrewarmRead(BaseModel):
+    tariff_version: int
+    rate_id: int
+    requested: int
+    warmed: int
+    seconds: float
+
+class HotQuotesRead(BaseModel):
+    tracked: int
+    requests: int
+    cached_quotes: int
+    last_prewarm: PrewarmRead | None
+    items: list[HotQuoteRead]
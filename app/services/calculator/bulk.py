@@ -0,0 +1,93 @@
+import csv
+from pathlib import Path
+from typing import Any, Iterator
+
+from pydantic import ValidationError
+
+from app.schemas.calculator import CalculatorDataIn
+from app.services.calculator.exceptions import DestinationNotFoundError, FeeNotFoundError, LocationNotFoundError
+from app.services.calculator.snapshot import TariffSnapshot
+
+REQUIRED_COLUMNS = ('auction', 'location', 'vehicle_type', 'price')
+OPTIONAL_COLUMNS = ('fee_type', 'destination')
+# flat output: cheapest route only, the full calculator response is kept for NDJSON output
+QUOTE_COLUMNS = ('terminal', 'transportation_price', 'ocean_ship', 'additional_fees', 'total', 'total_eu',
+                 'total_in_currency', 'total_eu_in_currency', 'error_type', 'error')
+QUOTE_ERRORS = (LocationNotFoundError, DestinationNotFoundError, FeeNotFoundError)
+LOT_SUFFIXES = ('.csv', '.parquet')
+
+# per worker process: inherited on fork, or installed once by `init_worker` on spawn
+_snapshot: TariffSnapshot | None = None
+
+
+def init_worker(snapshot: TariffSnapshot) -> None:
+    global _snapshot
+    _snapshot = snapshot
+
+
+def read_lots(path: Path, chunk_size: int) -> Iterator[list[dict[str, Any]]]:
+    if path.suffix == '.parquet':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError('Reading Parquet needs pyarrow: pip install pyarrow')
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pylist()
+        return
+
+    # pandas costs a tenth of a second to import, only job workers and the CLI read uploads
+    import pandas as pd
+    for frame in pd.read_csv(path, chunksize=chunk_size, dtype=str, keep_default_na=False):
+        yield frame.to_dict('records')
+
+
+def count_lots(path: Path) -> int:
+    if path.suffix == '.parquet':
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(path).metadata.num_rows
+    with path.open(newline='', encoding='utf-8') as file:
+        return max(sum(1 for _ in csv.reader(file)) - 1, 0)
+
+
+def missing_columns(row: dict[str, Any]) -> list[str]:
+    return [column for column in REQUIRED_COLUMNS if column not in row]
+
+
+def quote_row(row: dict[str, Any], full: bool = False, snapshot: TariffSnapshot | None = None) -> dict[str, Any]:
+    """Quotes from `snapshot`, by default the one installed in this worker process."""
+    result = dict(row)
+    try:
+        data = CalculatorDataIn(**{
+            column: row.get(column) if row.get(column) not in ('', None) else None
+            for column in REQUIRED_COLUMNS + OPTIONAL_COLUMNS
+        })
+        quote = (snapshot or _snapshot).quote(data)
+    except QUOTE_ERRORS as e:
+        return {**result, 'error_type': type(e).__name__, 'error': e.message}
+    except ValidationError as e:
+        return {**result, 'error_type': 'InvalidInput',
+                'error': '; '.join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())}
+
+    if full:
+        return {**result, 'quote': quote.model_dump(mode='json'), 'error_type': None, 'error': None}
+    dollars, currency = quote.calculator_in_dollars, quote.calculator_in_currency
+    if not dollars.calculator.totals:
+        return {**result, 'error_type': 'NoRoute', 'error': 'No terminal connects location and destination'}
+    return {
+        **result,
+        'terminal': dollars.calculator.transportation_price[0].name,
+        'transportation_price': dollars.calculator.transportation_price[0].price,
+        'ocean_ship': dollars.calculator.ocean_ship[0].price,
+        'additional_fees': dollars.calculator.additional.summ,
+        'total': dollars.calculator.totals[0].price,
+        'total_eu': dollars.eu_calculator.totals[0].price,
+        'total_in_currency': currency.calculator.totals[0].price,
+        'total_eu_in_currency': currency.eu_calculator.totals[0].price,
+        'error_type': None,
+        'error': None,
+    }
+
+
+def quote_chunk(rows: list[dict[str, Any]], full: bool = False,
+                snapshot: TariffSnapshot | None = None) -> list[dict[str, Any]]:
+    return [quote_row(row, full, snapshot) for row in rows]
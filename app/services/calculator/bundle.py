@@ -0,0 +1,30 @@
+from pathlib import Path
+
+from app.config import settings
+from app.core.utils import BASE_DIR
+from app.services.calculator.cache_key import quote_etag
+from app.services.calculator.snapshot import TariffSnapshot, TariffSnapshotFile
+
+
+class TariffBundle:
+    """
+    Tariffs exported by scripts/export_tariff_bundle.py, the only source of quotes in bundle mode: no database
+    engine is created and the file is mapped again once it is replaced, a new export is served from the next
+    request on.
+    """
+
+    def __init__(self, path: Path):
+        self.file = TariffSnapshotFile(path)
+
+    def snapshot(self) -> TariffSnapshot:
+        snapshot = self.file.read()
+        if snapshot is None:
+            raise FileNotFoundError(f'No usable tariff bundle at {self.file.path}')
+        return snapshot
+
+    @staticmethod
+    def etag(snapshot: TariffSnapshot, input_key: str) -> str:
+        return quote_etag(input_key, snapshot.matrices.version, snapshot.rate_id)
+
+
+calculator_bundle = TariffBundle(BASE_DIR / settings.CALCULATOR_BUNDLE) if settings.CALCULATOR_BUNDLE else None
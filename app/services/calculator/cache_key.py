@@ -0,0 +1,38 @@
+import hashlib
+import json
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.crud.exchange_rate import ExchangeRateService
+from app.database.crud.tariff_version import TariffVersionService
+from app.enums.fee_type import FeeTypeEnum
+from app.schemas.calculator import CalculatorDataIn
+
+
+def normalize_calculator_input(data: CalculatorDataIn) -> dict[str, Any]:
+    """Inputs that always produce the same quote map to the same dict (location/destination lookups ignore case)."""
+    return {
+        'price': data.price,
+        'auction': data.auction.value,
+        'fee_type': (data.fee_type or FeeTypeEnum.NON_CLEAN_TITLE_FEE).value,
+        'vehicle_type': data.vehicle_type.value,
+        'location': data.location.strip().lower(),
+        'destination': data.destination.strip().lower() if data.destination is not None else None,
+    }
+
+
+def calculator_input_key(data: CalculatorDataIn) -> str:
+    return json.dumps(normalize_calculator_input(data), sort_keys=True, separators=(',', ':'))
+
+
+def quote_etag(input_key: str, tariff_version: int, rate_id: int) -> str:
+    digest = hashlib.sha256(f'{input_key}|{tariff_version}|{rate_id}'.encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+async def get_quote_etag(db: AsyncSession, input_key: str) -> str:
+    # the rate first: bootstrapping a missing rate bumps the tariff version
+    rate = await ExchangeRateService(db).get_last_rate()
+    tariff_version = await TariffVersionService(db).get_current_version()
+    return quote_etag(input_key, tariff_version, rate.id)
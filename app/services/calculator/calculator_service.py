@@ -1,28 +1,32 @@
 import asyncio
 from datetime import datetime, UTC
-from typing import Sequence
+from typing import Sequence, TYPE_CHECKING
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logger import logger
+from app.core.timing import stage, timed
 from app.database.crud.additional_fee import AdditionalFeeService
 from app.database.crud.additional_special_fee import AdditionalSpecialFeeService
-from app.database.crud.delivery_price import DeliveryPriceService
 from app.database.crud.destination import DestinationService
 from app.database.crud.exchange_rate import ExchangeRateService
 from app.database.crud.fee import FeeService
 from app.database.crud.fee_type import FeeTypeService
 from app.database.crud.location import LocationService
-from app.database.crud.shipping_price import ShippingPriceService
+from app.database.crud.route_cost import RouteCostService
 from app.database.crud.vehicle_type import VehicleTypeService
 from app.database.db.session import AsyncSessionLocal
 from app.enums.auction import AuctionEnum
 from app.enums.fee_type import FeeTypeEnum
 from app.enums.vehicle_type import VehicleTypeEnum
 from app.schemas.calculator import CalculatorDataIn
-from app.services.calculator.exceptions import LocationNotFoundError, DestinationNotFoundError
-from app.services.calculator.types import City, DefaultCalculator, AdditionalFeesOut, EUCalculator, VATs, CalculatorOut, \
-    Calculator, SpecialFee
+from app.services.calculator.exceptions import LocationNotFoundError, DestinationNotFoundError, FeeNotFoundError
+from app.services.calculator.pricing import auction_fee_amount, build_additional_fees, build_calculator_out, \
+    convert_calculator_out
+from app.services.calculator.types import AdditionalFeesOut, CalculatorOut, Calculator
+
+if TYPE_CHECKING:
+    from app.services.calculator.snapshot import TariffSnapshot
 
 
 class CalculatorService:
@@ -32,13 +36,14 @@ class CalculatorService:
 
 
     def __init__(self,
-                 db: AsyncSession,
+                 db: AsyncSession | None,
                  price: int,
                  auction: AuctionEnum,
                  location: str,
                  vehicle_type: VehicleTypeEnum,
                  fee_type: FeeTypeEnum | None = None,
-                 destination: str | None = None):
+                 destination: str | None = None,
+                 snapshot: 'TariffSnapshot | None' = None):
         self.data = CalculatorDataIn(price=price,
                                      auction=auction,
                                      fee_type=fee_type,
@@ -46,7 +51,10 @@ class CalculatorService:
                                      vehicle_type=vehicle_type,
                                      destination=destination)
         self.db = db
+        # quotes from the snapshot instead of the database, `db` may be None then
+        self.snapshot = snapshot
 
+    @timed('fees')
     async def additional_fees_calculator(self) -> AdditionalFeesOut:
         additional_special_fee_service = AdditionalSpecialFeeService(self.db)
         fee_type_service = FeeTypeService(self.db)
@@ -54,126 +62,65 @@ class CalculatorService:
         additional_fee_service = AdditionalFeeService(self.db)
 
         fees = await additional_special_fee_service.get_additional_special_fee(self.data.auction)
-        print(fees)
-
-        all_fees_summ = sum([fee.amount for fee in fees])
-        special_fees_obj = [SpecialFee(name=fee.name, price=fee.amount) for fee in fees]
-        print(all_fees_summ, 'all fees summ')
 
         if self.data.fee_type:
             fee_type = await fee_type_service.get_by_fee_auction(self.data.auction, self.data.fee_type)
         else:
             fee_type = await fee_type_service.get_by_fee_auction(self.data.auction, FeeTypeEnum.NON_CLEAN_TITLE_FEE)
-            all_fee_types = await fee_type_service.get_all()
-            print(all_fee_types)
 
         internet_fee = 0
         live_fee = 0
 
-        auction_fee_obj = await fee_service.get_fee_in_car_price(fee_type, self.data.price)
-
-        if auction_fee_obj.car_price_fee < 1:
-            auction_fee = self.data.price * auction_fee_obj.car_price_fee
-        else:
-            auction_fee = auction_fee_obj.car_price_fee
+        auction_fee_obj = await fee_service.get_fee_in_car_price(fee_type, self.data.price) if fee_type else None
+        if not auction_fee_obj:
+            raise FeeNotFoundError(f'No auction fee for {self.data.auction.value} at price {self.data.price}')
+        auction_fee = auction_fee_amount(self.data.price, auction_fee_obj.car_price_fee)
 
         if self.data.auction == AuctionEnum.IAAI:
-            internet_fee = await additional_fee_service.get_price_in_int_proxy(self.data.price)
-            internet_fee = internet_fee.int_fee
+            internet_fee_obj = await additional_fee_service.get_price_in_int_proxy(self.data.price)
+            if not internet_fee_obj:
+                raise FeeNotFoundError(f'No internet fee at price {self.data.price}')
+            internet_fee = internet_fee_obj.int_fee
         elif self.data.auction == AuctionEnum.COPART:
-            live_fee = await additional_fee_service.get_price_in_live(self.data.price)
-            live_fee = live_fee.live_bid_fee
-
-        addit_fees = all_fees_summ + int(auction_fee) + internet_fee + live_fee
-        special_fees_obj.extend([SpecialFee(name='Auction Fee', price=auction_fee),
-                                 SpecialFee(name='Internet Fee', price=internet_fee),
-                                 SpecialFee(name='Live Fee', price=live_fee)])
-
-        return AdditionalFeesOut(summ=addit_fees, fees=special_fees_obj, auction_fee=auction_fee,
-                                 internet_fee=internet_fee, live_fee=live_fee)
-
-    @staticmethod
-    def sync_terminals( delivery_cities: list[City], shipping_terminals: list[City]):
-        delivery_names = {city.name for city in delivery_cities}
-        shipping_names = {terminal.name for terminal in shipping_terminals}
-
-        common_names = delivery_names & shipping_names
+            live_fee_obj = await additional_fee_service.get_price_in_live(self.data.price)
+            if not live_fee_obj:
+                raise FeeNotFoundError(f'No live bid fee at price {self.data.price}')
+            live_fee = live_fee_obj.live_bid_fee
 
-        filtered_delivery = [city for city in delivery_cities if city.name in common_names]
-        filtered_shipping = [terminal for terminal in shipping_terminals if terminal.name in common_names]
-
-        return filtered_delivery, filtered_shipping
+        return build_additional_fees([(fee.name, fee.amount) for fee in fees], auction_fee, internet_fee, live_fee)
 
+    @timed('currency')
     async def calculate_in_euro(self, calculator: CalculatorOut)-> CalculatorOut:
         exchange_rate_service = ExchangeRateService(self.db)
         rate_obj = await exchange_rate_service.get_last_rate()
-        rate = rate_obj.rate
-
-        def usd_to_euro(usd: int) -> int:
-            return round(usd * rate)
-
-        def city_to_euro(cities: list[City]) -> list[City]:
-            return [City(name=city.name, price=usd_to_euro(city.price))
-             for city in cities]
-
-        def additional_fee_to_euro(additional_fees: AdditionalFeesOut) -> AdditionalFeesOut:
-            special_fees = [
-                SpecialFee(name=special_fee.name, price=usd_to_euro(special_fee.price))
-                for special_fee in additional_fees.fees
-            ]
-            return AdditionalFeesOut(summ=additional_fees.summ, fees=special_fees,
-                                     auction_fee=additional_fees.auction_fee, internet_fee=additional_fees.internet_fee,
-                                     live_fee=additional_fees.live_fee)
-
-
-        default_calculator = DefaultCalculator(
-            broker_fee=usd_to_euro(calculator.calculator.broker_fee),
-            transportation_price=city_to_euro(calculator.calculator.transportation_price),
-            ocean_ship=city_to_euro(calculator.calculator.ocean_ship),
-            additional=additional_fee_to_euro(calculator.calculator.additional),
-            totals=city_to_euro(calculator.calculator.totals),
-            auction_fee=usd_to_euro(calculator.calculator.auction_fee),
-            live_fee=usd_to_euro(calculator.calculator.live_fee),
-            internet_fee=usd_to_euro(calculator.calculator.internet_fee)
-        )
-        eu_calculator = EUCalculator(
-            broker_fee=usd_to_euro(calculator.eu_calculator.broker_fee),
-            transportation_price=city_to_euro(calculator.eu_calculator.transportation_price),
-            ocean_ship=city_to_euro(calculator.eu_calculator.ocean_ship),
-            additional=additional_fee_to_euro(calculator.eu_calculator.additional),
-            totals=city_to_euro(calculator.eu_calculator.totals),
-            vats=VATs(vats=city_to_euro(calculator.eu_calculator.vats.vats),
-                      eu_vats=city_to_euro(calculator.eu_calculator.vats.eu_vats)),
-
-        )
-
-        return CalculatorOut(
-            calculator=default_calculator,
-            eu_calculator=eu_calculator
-        )
+        return convert_calculator_out(calculator, rate_obj.rate)
 
 
+    @timed('quote')
     async def calculate(self) -> Calculator:
+        if self.snapshot is not None:
+            return self.snapshot.quote(self.data)
+
         vehicle_type_service = VehicleTypeService(self.db)
         location_service = LocationService(self.db)
         destination_service = DestinationService(self.db)
-        shipping_price_service = ShippingPriceService(self.db)
-        delivery_price_service = DeliveryPriceService(self.db)
-        exchange_rate_service = ExchangeRateService(self.db)
+        route_cost_service = RouteCostService(self.db)
 
-        vehicle_type_obj = await vehicle_type_service.get_by_auction_and_type(
-            auction=self.data.auction,
-            vehicle_type=self.data.vehicle_type
-        )
+        with stage('vehicle_type'):
+            vehicle_type_obj = await vehicle_type_service.get_by_auction_and_type(
+                auction=self.data.auction,
+                vehicle_type=self.data.vehicle_type
+            )
 
-        if self.data.destination is None:
-            destination = await destination_service.get_default()
-        else:
-            destination = await destination_service.get_by_name(name=self.data.destination)
-            if not destination:
-                logger.warning(f"Destination {self.data.destination} not found",
-                               extra={'destination': self.data.destination})
-                raise DestinationNotFoundError(f'Destination {self.data.destination} not found')
+        with stage('destination'):
+            if self.data.destination is None:
+                destination = await destination_service.get_default()
+            else:
+                destination = await destination_service.get_by_name(name=self.data.destination)
+                if not destination:
+                    logger.warning(f"Destination {self.data.destination} not found",
+                                   extra={'destination': self.data.destination})
+                    raise DestinationNotFoundError(f'Destination {self.data.destination} not found')
 
 
         additional_fees = await self.additional_fees_calculator()
@@ -183,99 +130,21 @@ class CalculatorService:
             logger.warning(f'Location {self.data.location} not found', extra={'location': self.data.location})
             raise LocationNotFoundError(f'Location {self.data.location} not found')
 
-        delivery_prices = await delivery_price_service.get_by_terminal_location_vehicle_type(
-            location=delivery_location_obj,
-            vehicle_type=vehicle_type_obj
-        )
-        shipping_prices = await shipping_price_service.get_by_destination_and_vehicle_type(destination,
-                                                                                           vehicle_type_obj)
-
-        delivery_cities = [City(name=delivery_price.terminal.name, price=delivery_price.price) for delivery_price in
-                           delivery_prices]
-        shipping_terminals = [City(name=shipping_price.terminal.name, price=shipping_price.price) for shipping_price in
-                              shipping_prices]
-
-        delivery_cities, shipping_terminals = self.sync_terminals(delivery_cities, shipping_terminals)
-
-        rate = await exchange_rate_service.get_last_rate()
-        rate = rate.rate
-
-        # custom_agency = round(350 / rate, 1)
-
-        # Обычный калькулятор (в долларах)
-        total_default: list[City] = []
-        for delivery, shipping in zip(delivery_cities, shipping_terminals):
-            total_price = (
-                    delivery.price +
-                    shipping.price +
-                    additional_fees.summ +
-                    self.BROKER_FEE +
-                    self.data.price
-            )
-            total_default.append(City(name=delivery.name, price=round(total_price)))
-
-        calculator = DefaultCalculator(
-            broker_fee=self.BROKER_FEE,
-            transportation_price=delivery_cities,
-            ocean_ship=shipping_terminals,
-            additional=additional_fees,
-            auction_fee=additional_fees.auction_fee,
-            live_fee=additional_fees.live_fee,
-            internet_fee=additional_fees.internet_fee,
-            totals=total_default
-        )
-
-        # ЕС калькулятор (в долларах)
-        eu_vats_list: list[City] = []
-        vats_list: list[City] = []
-        total_eu: list[City] = []
-
-        for delivery, shipping in zip(delivery_cities, shipping_terminals):
-            base_sum = (
-                    self.BROKER_FEE +
-                    shipping.price +
-                    delivery.price +
-                    additional_fees.summ +
-                    self.data.price
+        # terminals served by both legs, cheapest route first
+        with stage('routes'):
+            routes = await route_cost_service.get_routes(
+                location=delivery_location_obj,
+                destination=destination,
+                vehicle_type=vehicle_type_obj
             )
 
-            eu_vat = round(base_sum * 0.1)
-            eu_vats_list.append(City(name=delivery.name, price=eu_vat))
-
-            vat = round((eu_vat + base_sum) * 0.21)
-            vats_list.append(City(name=delivery.name, price=vat))
-
-            total_price_eu = round(
-                delivery.price +
-                self.BROKER_FEE +
-                additional_fees.summ +
-                self.data.price +
-                eu_vat +
-                vat +
-                shipping.price
-                # custom_agency
+        with stage('pricing'):
+            calculator_out = build_calculator_out(
+                price=self.data.price,
+                broker_fee=self.BROKER_FEE,
+                additional_fees=additional_fees,
+                routes=[(route.name, route.delivery_price, route.shipping_price) for route in routes]
             )
-            total_eu.append(City(name=delivery.name, price=total_price_eu))
-
-        vats_obj = VATs(
-            eu_vats=eu_vats_list,
-            vats=vats_list
-        )
-
-        eu_calculator = EUCalculator(
-            broker_fee=self.BROKER_FEE,
-            transportation_price=delivery_cities,
-            ocean_ship=shipping_terminals,
-            additional=additional_fees,
-            vats=vats_obj,
-            custom_agency=int(0),
-            totals=total_eu
-        )
-
-        calculator_out = CalculatorOut(
-            calculator=calculator,
-            eu_calculator=eu_calculator,
-        )
 
         return Calculator(
             calculator_in_dollars=calculator_out,
@@ -8,3 +8,7 @@ class DestinationNotFoundError(Exception):
         self.message = message
         super().__init__(self.message)
 
+class FeeNotFoundError(Exception):
+    def __init__(self, message="Fee not found"):
+        self.message = message
+        super().__init__(self.message)
@@ -0,0 +1,85 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, TypeVar
+
+from app.config import settings
+from app.core.metrics import QUOTE_EXECUTOR_PENDING, QUOTE_EXECUTOR_SECONDS, QUOTE_EXECUTOR_TASKS
+
+T = TypeVar('T')
+
+INLINE = 'inline'
+THREAD = 'thread'
+
+
+def spawn_pool(max_workers: int, initializer: Callable[..., Any] | None = None,
+               initargs: tuple[Any, ...] = ()) -> ProcessPoolExecutor:
+    """
+    A process pool for work submitted from the server. Its workers are spawned rather than forked: a fork
+    would copy the running event loop and the database driver's threads into a child that cannot use them.
+    Spawned workers import the app afresh, so what they need arrives pickled, through `initargs` or per call.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'),
+                               initializer=initializer, initargs=initargs)
+
+
+class QuoteExecutor:
+    """
+    Where a quote computation runs. Work up to `inline_max_size` units (quotes, matrix cells) is cheaper to
+    run on the event loop than to hand off. Larger work goes to a thread pool; it spends its time in NumPy,
+    which releases the GIL. At most `max_pending` offloaded calls run or wait in the pool, further callers
+    wait here, so a burst of sweeps applies back-pressure instead of growing the pool queue without bound.
+    Pure-Python batches (quote jobs) have their own process pools, see `spawn_pool`.
+    """
+
+    def __init__(self,
+                 inline_max_size: int = settings.QUOTE_INLINE_MAX_SIZE,
+                 thread_workers: int = settings.QUOTE_THREAD_WORKERS,
+                 max_pending: int = settings.QUOTE_EXECUTOR_MAX_PENDING):
+        self.inline_max_size = inline_max_size
+        self.thread_workers = thread_workers
+        self.max_pending = max_pending
+        self._threads: ThreadPoolExecutor | None = None
+        self._slots: asyncio.Semaphore | None = None
+
+    def mode(self, size: int) -> str:
+        return INLINE if size <= self.inline_max_size else THREAD
+
+    def _pool(self) -> ThreadPoolExecutor:
+        # the pool starts on first use, most workers never offload anything
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix='quote')
+        return self._threads
+
+    async def run(self, fn: Callable[..., T], *args: Any, size: int) -> T:
+        """Computes `fn(*args)`. `size` is the amount of work in the caller's unit."""
+        mode = self.mode(size)
+        QUOTE_EXECUTOR_TASKS.labels(mode).inc()
+        started = time.perf_counter()
+        if mode == INLINE:
+            try:
+                return fn(*args)
+            finally:
+                QUOTE_EXECUTOR_SECONDS.labels(mode).observe(time.perf_counter() - started)
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        pending = QUOTE_EXECUTOR_PENDING.labels(mode)
+        pending.inc()
+        try:
+            async with self._slots:
+                return await asyncio.get_running_loop().run_in_executor(self._pool(), partial(fn, *args))
+        finally:
+            pending.dec()
+            QUOTE_EXECUTOR_SECONDS.labels(mode).observe(time.perf_counter() - started)
+
+    def shutdown(self) -> None:
+        if self._threads:
+            self._threads.shutdown(wait=False, cancel_futures=True)
+        self._threads = None
+        self._slots = None
+
+
+quote_executor = QuoteExecutor()
@@ -0,0 +1,114 @@
+import asyncio
+import time
+from typing import Any
+
+from app.config import settings
+from app.core.logger import logger
+from app.core.metrics import LIVE_QUOTE_PRICES
+from app.schemas.calculator import LiveQuoteSessionIn
+from app.services.calculator.bundle import TariffBundle, calculator_bundle
+from app.services.calculator.snapshot import TariffSnapshot, load_current_snapshot
+from app.services.calculator.tariff_changes import TariffChangeListener, tariff_change_listener
+from app.services.calculator.types import Calculator
+
+
+class LiveQuoteSession:
+    """
+    Quotes of one auction, location, vehicle type and destination at changing prices. The route and the fee
+    schedule are resolved once when the session opens; every price after that is quoted from them in memory.
+    """
+
+    def __init__(self, snapshot: TariffSnapshot, params: LiveQuoteSessionIn):
+        self.snapshot = snapshot
+        self.params = params
+        destination_id = snapshot.find_destination(params.destination)
+        self.fees = snapshot.fee_schedule(params.auction, params.fee_type)
+        self.routes = snapshot.find_routes(params.auction, params.vehicle_type, params.location, destination_id)
+
+    def quote(self, price: int) -> Calculator:
+        return self.snapshot.price(price, self.fees.additional_fees(price), self.routes)
+
+
+def flatten_quote(value: Any, prefix: str = '') -> dict[str, Any]:
+    """Leaves of a quote's JSON by dotted path, list items by their index."""
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, list):
+        items = enumerate(value)
+    else:
+        return {prefix: value}
+    flat = {}
+    for key, item in items:
+        flat |= flatten_quote(item, f'{prefix}.{key}' if prefix else str(key))
+    return flat
+
+
+def quote_delta(previous: dict[str, Any], current: dict[str, Any]) -> dict[str, Any]:
+    """The leaves that changed. Both quotes come from the same session, so they have the same paths."""
+    return {path: value for path, value in current.items() if previous.get(path) != value}
+
+
+class LatestPrice:
+    """The last price a client sent; prices sent while a quote is computed or held back replace each other."""
+
+    def __init__(self):
+        self._price: int | None = None
+        self._ready = asyncio.Event()
+
+    def put(self, price: int | None) -> None:
+        """None ends the session."""
+        if self._ready.is_set() and self._price is not None:
+            LIVE_QUOTE_PRICES.labels('coalesced').inc()
+        self._price = price
+        self._ready.set()
+
+    async def get(self) -> int | None:
+        await self._ready.wait()
+        self._ready.clear()
+        return self._price
+
+
+class LiveSnapshot:
+    """
+    The snapshot live sessions quote from, shared by the sessions of a worker. Loaded again (mapped from the
+    snapshot file when another worker already wrote it) when a tariff change arrives, and at least every
+    `recheck` seconds for changes made while the change bus was down. While it cannot be loaded the previous
+    one stays in use; in bundle mode it is the bundle's.
+    """
+
+    def __init__(self, listener: TariffChangeListener = tariff_change_listener,
+                 bundle: TariffBundle | None = calculator_bundle,
+                 recheck: float = settings.LIVE_QUOTE_RECHECK_SECONDS):
+        self.listener = listener
+        self.bundle = bundle
+        self.recheck = recheck
+        self._snapshot: TariffSnapshot | None = None
+        self._tried_version = 0
+        self._tried_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _due(self) -> bool:
+        return (self._snapshot is None or self.listener.version > self._tried_version
+                or time.monotonic() - self._tried_at >= self.recheck)
+
+    async def get(self) -> TariffSnapshot:
+        if self.bundle is not None:
+            return self.bundle.snapshot()
+        if self._due():
+            async with self._lock:
+                if self._due():
+                    await self._load()
+        return self._snapshot
+
+    async def _load(self) -> None:
+        self._tried_version, self._tried_at = self.listener.version, time.monotonic()
+        try:
+            self._snapshot = await load_current_snapshot()
+        except Exception as e:
+            if self._snapshot is None:
+                raise
+            logger.warning('Could not reload the live quote snapshot, keeping the previous one', exc_info=e,
+                           extra={'tariff_version': self._snapshot.matrices.version})
+
+
+live_snapshot = LiveSnapshot()
@@ -0,0 +1,76 @@
+import heapq
+from dataclasses import dataclass
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class HotKey:
+    key: str
+    count: int  # upper bound of the true count
+    error: int  # by how much `count` may overestimate
+
+
+class SpaceSaving:
+    """
+    Space-saving top-k sketch (Metwally et al.): at most `capacity` counters, a new key takes over the
+    smallest one and inherits its count as error. Every key seen more than total / capacity times is
+    tracked, so the head of `top` is exact enough to pick which quotes to prewarm. A capacity of 0 tracks
+    nothing.
+    """
+
+    def __init__(self, capacity: int = settings.QUOTE_POPULARITY_CAPACITY):
+        self.capacity = capacity
+        self.total = 0
+        self._counts: dict[str, int] = {}
+        self._errors: dict[str, int] = {}
+        # (count, key) min-heap with stale entries, one is pushed on every increment and skipped when popped
+        self._heap: list[tuple[int, str]] = []
+
+    def add(self, key: str) -> None:
+        if self.capacity <= 0:
+            return
+        self.total += 1
+        count = self._counts.get(key)
+        if count is not None:
+            count += 1
+        elif len(self._counts) < self.capacity:
+            count = 1
+            self._errors[key] = 0
+        else:
+            floor, victim = self._pop_min()
+            del self._counts[victim], self._errors[victim]
+            count = floor + 1
+            self._errors[key] = floor
+        self._counts[key] = count
+        heapq.heappush(self._heap, (count, key))
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild_heap()
+
+    def _pop_min(self) -> tuple[int, str]:
+        while True:
+            count, key = heapq.heappop(self._heap)
+            if self._counts.get(key) == count:
+                return count, key
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(count, key) for key, count in self._counts.items()]
+        heapq.heapify(self._heap)
+
+    def top(self, n: int) -> list[HotKey]:
+        ranked = heapq.nlargest(n, self._counts.items(), key=lambda item: item[1])
+        return [HotKey(key, count, self._errors[key]) for key, count in ranked]
+
+    def decay(self) -> None:
+        """Halves every count, so keys that were popular under earlier tariffs fade out."""
+        self.total //= 2
+        self._counts = {key: count // 2 for key, count in self._counts.items() if count // 2}
+        self._errors = {key: self._errors[key] // 2 for key in self._counts}
+        self._rebuild_heap()
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+
+# normalized calculator inputs (`calculator_input_key`) of the requests this worker served
+quote_popularity = SpaceSaving()
@@ -0,0 +1,146 @@
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.core.logger import logger
+from app.core.metrics import QUOTE_PREWARM_SECONDS, QUOTE_PREWARMED
+from app.database.crud.exchange_rate import ExchangeRateService
+from app.database.crud.tariff_version import TariffVersionService
+from app.database.db.session import AsyncSessionLocal
+from app.schemas.calculator import CalculatorDataIn
+from app.services.calculator.bulk import QUOTE_ERRORS
+from app.services.calculator.cache_key import calculator_input_key, quote_etag
+from app.services.calculator.popularity import SpaceSaving, quote_popularity
+from app.services.calculator.quote_cache import QuoteCache, quote_cache
+from app.services.calculator.snapshot import TariffSnapshotFile, load_current_snapshot, tariff_snapshot_file
+from app.services.calculator.stale import StaleQuotes, stale_quotes
+from app.services.tariff.store import TariffMatrixStore, tariff_matrix_store
+
+
+@dataclass(frozen=True)
+class Generation:
+    """What a quote ETag depends on besides the inputs."""
+    tariff_version: int
+    rate_id: int
+
+
+@dataclass(frozen=True)
+class PrewarmResult:
+    generation: Generation
+    requested: int
+    warmed: int
+    seconds: float
+
+
+async def current_generation() -> Generation:
+    async with AsyncSessionLocal() as session:
+        # the rate first, like get_quote_etag: bootstrapping a missing rate bumps the tariff version
+        rate = await ExchangeRateService(session).get_last_rate()
+        return Generation(await TariffVersionService(session).get_current_version(), rate.id)
+
+
+async def warm_quotes(inputs: list[CalculatorDataIn], cache: QuoteCache = quote_cache,
+                      chunk_size: int = settings.QUOTE_PREWARM_CHUNK_SIZE, stale: StaleQuotes = stale_quotes,
+                      session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+                      store: TariffMatrixStore = tariff_matrix_store,
+                      snapshot_file: TariffSnapshotFile | None = tariff_snapshot_file) -> int:
+    """
+    Quotes `inputs` from a tariff snapshot into `cache` under the ETags the API would compute, yielding
+    to requests every `chunk_size` quotes, and keeps the snapshot for stale answers. Skipped when the
+    tariffs change while the snapshot loads, the quotes would be filed under the wrong version.
+    """
+    async with session_factory() as session:
+        rate = await ExchangeRateService(session).get_last_rate()
+        tariff_version = await TariffVersionService(session).get_current_version()
+    snapshot = await load_current_snapshot(session_factory, store, snapshot_file)
+    if (snapshot.matrices.version, snapshot.rate_id) != (tariff_version, rate.id):
+        logger.warning('Tariffs changed while prewarming, quotes not prewarmed',
+                       extra={'tariff_version': tariff_version, 'snapshot_version': snapshot.matrices.version})
+        return 0
+    stale.remember_snapshot(snapshot)
+
+    warmed = 0
+    for i, data in enumerate(inputs, 1):
+        try:
+            quote = snapshot.quote(data)
+        except QUOTE_ERRORS:
+            continue
+        input_key = calculator_input_key(data)
+        cache.put(quote_etag(input_key, tariff_version, rate.id), quote, input_key)
+        warmed += 1
+        if i % chunk_size == 0:
+            await asyncio.sleep(0)
+    QUOTE_PREWARMED.inc(warmed)
+    return warmed
+
+
+class QuotePrewarmer:
+    """
+    Checks the tariff version and exchange rate every `interval` seconds. When either changed, every
+    cached quote is stale at once, so the `top_n` most requested inputs are quoted again before the
+    requests for them arrive. One prewarm runs at a time; popularity is halved after each, so inputs
+    that stopped being requested drop out.
+    """
+
+    def __init__(self, interval: float = settings.QUOTE_PREWARM_INTERVAL, top_n: int = settings.QUOTE_PREWARM_TOP_N,
+                 popularity: SpaceSaving = quote_popularity, cache: QuoteCache = quote_cache):
+        self.interval = interval
+        self.top_n = top_n
+        self.popularity = popularity
+        self.cache = cache
+        self.generation: Generation | None = None
+        self.last_result: PrewarmResult | None = None
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None and self.top_n > 0:
+            self._task = asyncio.create_task(self._run(), name='quote-prewarmer')
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def hot_inputs(self, n: int) -> list[CalculatorDataIn]:
+        return [CalculatorDataIn(**json.loads(hot.key)) for hot in self.popularity.top(n)]
+
+    async def check(self) -> PrewarmResult | None:
+        """Prewarms if the generation changed since the last check; the first check only records it."""
+        generation = await current_generation()
+        if generation == self.generation:
+            stale_quotes.confirm_snapshot(generation.tariff_version)
+            return None
+        previous, self.generation = self.generation, generation
+        if previous is None:
+            return None
+        return await self.prewarm(generation)
+
+    async def prewarm(self, generation: Generation) -> PrewarmResult:
+        async with self._lock:
+            started = time.perf_counter()
+            inputs = self.hot_inputs(self.top_n)
+            warmed = await warm_quotes(inputs, self.cache)
+            self.popularity.decay()
+            elapsed = time.perf_counter() - started
+            QUOTE_PREWARM_SECONDS.observe(elapsed)
+            self.last_result = PrewarmResult(generation, len(inputs), warmed, round(elapsed, 4))
+            logger.info(f'Prewarmed {warmed} of {len(inputs)} hot quotes in {elapsed:.3f}s',
+                        extra={'tariff_version': generation.tariff_version, 'rate_id': generation.rate_id})
+            return self.last_result
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.check()
+            except Exception as e:
+                logger.warning('Hot quote prewarm failed', exc_info=e)
+            await asyncio.sleep(self.interval)
+
+
+quote_prewarmer = QuotePrewarmer()
@@ -0,0 +1,157 @@
+from typing import Sequence
+
+from app.services.calculator.types import City, DefaultCalculator, AdditionalFeesOut, EUCalculator, VATs, CalculatorOut, \
+    SpecialFee
+
+# (terminal name, delivery price, shipping price), cheapest route first
+Route = tuple[str, int, int]
+
+EU_VAT = 0.1
+VAT = 0.21
+
+
+def auction_fee_amount(price: int, car_price_fee: float) -> float:
+    # fees below 1 are a share of the car price, anything else is a flat amount
+    if car_price_fee < 1:
+        return price * car_price_fee
+    return car_price_fee
+
+
+def build_additional_fees(special_fees: Sequence[tuple[str, int]], auction_fee: float, internet_fee: float,
+                          live_fee: float) -> AdditionalFeesOut:
+    all_fees_summ = sum([amount for _, amount in special_fees])
+    special_fees_obj = [SpecialFee(name=name, price=amount) for name, amount in special_fees]
+
+    addit_fees = all_fees_summ + int(auction_fee) + internet_fee + live_fee
+    special_fees_obj.extend([SpecialFee(name='Auction Fee', price=auction_fee),
+                             SpecialFee(name='Internet Fee', price=internet_fee),
+                             SpecialFee(name='Live Fee', price=live_fee)])
+
+    return AdditionalFeesOut(summ=addit_fees, fees=special_fees_obj, auction_fee=auction_fee,
+                             internet_fee=internet_fee, live_fee=live_fee)
+
+
+def build_calculator_out(price: int, broker_fee: int, additional_fees: AdditionalFeesOut,
+                         routes: Sequence[Route]) -> CalculatorOut:
+    delivery_cities = [City(name=name, price=delivery_price) for name, delivery_price, _ in routes]
+    shipping_terminals = [City(name=name, price=shipping_price) for name, _, shipping_price in routes]
+
+    # Обычный калькулятор (в долларах)
+    total_default: list[City] = []
+    for delivery, shipping in zip(delivery_cities, shipping_terminals):
+        total_price = (
+                delivery.price +
+                shipping.price +
+                additional_fees.summ +
+                broker_fee +
+                price
+        )
+        total_default.append(City(name=delivery.name, price=round(total_price)))
+
+    calculator = DefaultCalculator(
+        broker_fee=broker_fee,
+        transportation_price=delivery_cities,
+        ocean_ship=shipping_terminals,
+        additional=additional_fees,
+        auction_fee=additional_fees.auction_fee,
+        live_fee=additional_fees.live_fee,
+        internet_fee=additional_fees.internet_fee,
+        totals=total_default
+    )
+
+    # ЕС калькулятор (в долларах)
+    eu_vats_list: list[City] = []
+    vats_list: list[City] = []
+    total_eu: list[City] = []
+
+    for delivery, shipping in zip(delivery_cities, shipping_terminals):
+        base_sum = (
+                broker_fee +
+                shipping.price +
+                delivery.price +
+                additional_fees.summ +
+                price
+        )
+
+        eu_vat = round(base_sum * EU_VAT)
+        eu_vats_list.append(City(name=delivery.name, price=eu_vat))
+
+        vat = round((eu_vat + base_sum) * VAT)
+        vats_list.append(City(name=delivery.name, price=vat))
+
+        total_price_eu = round(
+            delivery.price +
+            broker_fee +
+            additional_fees.summ +
+            price +
+            eu_vat +
+            vat +
+            shipping.price
+            # custom_agency
+        )
+        total_eu.append(City(name=delivery.name, price=total_price_eu))
+
+    vats_obj = VATs(
+        eu_vats=eu_vats_list,
+        vats=vats_list
+    )
+
+    eu_calculator = EUCalculator(
+        broker_fee=broker_fee,
+        transportation_price=delivery_cities,
+        ocean_ship=shipping_terminals,
+        additional=additional_fees,
+        vats=vats_obj,
+        custom_agency=int(0),
+        totals=total_eu
+    )
+
+    return CalculatorOut(
+        calculator=calculator,
+        eu_calculator=eu_calculator,
+    )
+
+
+def convert_calculator_out(calculator: CalculatorOut, rate: float) -> CalculatorOut:
+    def usd_to_euro(usd: int) -> int:
+        return round(usd * rate)
+
+    def city_to_euro(cities: list[City]) -> list[City]:
+        return [City(name=city.name, price=usd_to_euro(city.price))
+         for city in cities]
+
+    def additional_fee_to_euro(additional_fees: AdditionalFeesOut) -> AdditionalFeesOut:
+        special_fees = [
+            SpecialFee(name=special_fee.name, price=usd_to_euro(special_fee.price))
+            for special_fee in additional_fees.fees
+        ]
+        return AdditionalFeesOut(summ=additional_fees.summ, fees=special_fees,
+                                 auction_fee=additional_fees.auction_fee, internet_fee=additional_fees.internet_fee,
+                                 live_fee=additional_fees.live_fee)
+
+
+    default_calculator = DefaultCalculator(
+        broker_fee=usd_to_euro(calculator.calculator.broker_fee),
+        transportation_price=city_to_euro(calculator.calculator.transportation_price),
+        ocean_ship=city_to_euro(calculator.calculator.ocean_ship),
+        additional=additional_fee_to_euro(calculator.calculator.additional),
+        totals=city_to_euro(calculator.calculator.totals),
+        auction_fee=usd_to_euro(calculator.calculator.auction_fee),
+        live_fee=usd_to_euro(calculator.calculator.live_fee),
+        internet_fee=usd_to_euro(calculator.calculator.internet_fee)
+    )
+    eu_calculator = EUCalculator(
+        broker_fee=usd_to_euro(calculator.eu_calculator.broker_fee),
+        transportation_price=city_to_euro(calculator.eu_calculator.transportation_price),
+        ocean_ship=city_to_euro(calculator.eu_calculator.ocean_ship),
+        additional=additional_fee_to_euro(calculator.eu_calculator.additional),
+        totals=city_to_euro(calculator.eu_calculator.totals),
+        vats=VATs(vats=city_to_euro(calculator.eu_calculator.vats.vats),
+                  eu_vats=city_to_euro(calculator.eu_calculator.vats.eu_vats)),
+
+    )
+
+    return CalculatorOut(
+        calculator=default_calculator,
+        eu_calculator=eu_calculator
+    )
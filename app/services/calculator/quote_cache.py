@@ -0,0 +1,71 @@
+import time
+from collections import OrderedDict
+
+from app.config import settings
+from app.core.metrics import QUOTE_CACHE_REQUESTS
+from app.services.calculator.types import Calculator
+
+
+class QuoteCache:
+    """
+    Computed quotes by ETag, least recently used evicted first. The ETag covers the inputs, the tariff
+    version and the exchange rate, so an entry never needs invalidating, it just stops being asked for.
+    The newest ETag per input key is remembered too, for answering while the database is unavailable.
+    """
+
+    def __init__(self, max_size: int = settings.QUOTE_CACHE_SIZE):
+        self.max_size = max_size
+        self._quotes: OrderedDict[str, Calculator] = OrderedDict()
+        self._latest: OrderedDict[str, tuple[str, float]] = OrderedDict()  # input key -> (etag, stored at)
+
+    def get(self, etag: str) -> Calculator | None:
+        quote = self._quotes.get(etag)
+        if quote is None:
+            QUOTE_CACHE_REQUESTS.labels('miss').inc()
+            return None
+        self._quotes.move_to_end(etag)
+        QUOTE_CACHE_REQUESTS.labels('hit').inc()
+        return quote
+
+    def put(self, etag: str, quote: Calculator, input_key: str | None = None) -> None:
+        if self.max_size <= 0:
+            return
+        self._quotes[etag] = quote
+        self._quotes.move_to_end(etag)
+        while len(self._quotes) > self.max_size:
+            self._quotes.popitem(last=False)
+        if input_key is not None:
+            self._latest[input_key] = (etag, time.monotonic())
+            self._latest.move_to_end(input_key)
+            while len(self._latest) > self.max_size:
+                self._latest.popitem(last=False)
+
+    def last_good(self, input_key: str) -> tuple[Calculator, float] | None:
+        """The newest quote stored for `input_key`, whatever its tariff version, and its age in seconds."""
+        latest = self._latest.get(input_key)
+        if latest is None:
+            return None
+        etag, stored_at = latest
+        quote = self._quotes.get(etag)
+        return (quote, time.monotonic() - stored_at) if quote is not None else None
+
+    def drop_superseded(self) -> int:
+        """
+        Drops the quotes that are not the newest for their inputs, nothing asks for older tariff versions.
+        The newest stay for stale answers until the new version replaces them. Returns how many were dropped.
+        """
+        newest = {etag for etag, _ in self._latest.values()}
+        superseded = [etag for etag in self._quotes if etag not in newest]
+        for etag in superseded:
+            del self._quotes[etag]
+        return len(superseded)
+
+    def clear(self) -> None:
+        self._quotes.clear()
+        self._latest.clear()
+
+    def __len__(self) -> int:
+        return len(self._quotes)
+
+
+quote_cache = QuoteCache()
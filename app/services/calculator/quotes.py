@@ -0,0 +1,85 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.http_cache import etag_matches
+from app.core.logger import logger
+from app.core.single_flight import SingleFlight
+from app.schemas.calculator import CalculatorDataIn
+from app.services.calculator.bundle import TariffBundle, calculator_bundle
+from app.services.calculator.cache_key import get_quote_etag
+from app.services.calculator.calculator_service import CalculatorService
+from app.services.calculator.quote_cache import quote_cache
+from app.services.calculator.stale import stale_quotes
+from app.services.calculator.types import Calculator
+
+# identical requests in flight (the same ETag: inputs, tariff version and rate) share one calculation
+quote_flight: SingleFlight[Calculator] = SingleFlight('quote')
+
+
+@dataclass(frozen=True)
+class QuoteResult:
+    quote: Calculator | None  # None when the caller's ETag still matches
+    etag: str | None  # None for stale quotes
+    stale_age: float | None = None
+
+
+async def resolve_quote(db: AsyncSession | None, input_key: str, get_input: Callable[[], Awaitable[CalculatorDataIn]],
+                        if_none_match: str | None = None) -> QuoteResult:
+    """
+    The quote for `input_key`, from the cache or calculated. When the database fails or the quote misses
+    QUOTE_DB_DEADLINE, the last good quote is served instead, marked stale, while the calculation carries
+    on in the background and refreshes the cache; with nothing young enough to serve the error is raised.
+    In bundle mode there is no session, the quote comes from the bundle mapped when the call started.
+    """
+    try:
+        async with asyncio.timeout(settings.QUOTE_DB_DEADLINE or None):
+            snapshot = calculator_bundle.snapshot() if calculator_bundle is not None else None
+            if snapshot is not None:
+                etag = TariffBundle.etag(snapshot, input_key)
+            else:
+                etag = await get_quote_etag(db, input_key)
+            if etag_matches(if_none_match, etag):
+                return QuoteResult(None, etag)
+            if (quote := quote_cache.get(etag)) is None:
+                # the calculation outlives this call when it misses the deadline, so it gets its own
+                # session; the caller's connection goes back to the pool meanwhile
+                if db is not None:
+                    await db.commit()
+
+                async def calculate(session: AsyncSession | None) -> Calculator:
+                    data = await get_input()
+                    calculator_service = CalculatorService(
+                        db=session,
+                        price=data.price,
+                        auction=data.auction,
+                        fee_type=data.fee_type,
+                        location=data.location,
+                        vehicle_type=data.vehicle_type,
+                        destination=data.destination,
+                        snapshot=snapshot
+                    )
+                    return await calculator_service.calculate()
+
+                async def compute() -> Calculator:
+                    if snapshot is not None:
+                        quote = await calculate(None)
+                    else:
+                        async with AsyncSession(bind=db.bind, expire_on_commit=False) as session:
+                            quote = await calculate(session)
+                    quote_cache.put(etag, quote, input_key)
+                    return quote
+
+                quote = await quote_flight.do(etag, compute)
+            return QuoteResult(quote, etag)
+    except (SQLAlchemyError, OSError) as e:  # TimeoutError is an OSError
+        stale = await stale_quotes.get(input_key, get_input)
+        if stale is None:
+            raise
+        quote, age = stale
+        logger.warning('Serving a stale quote', exc_info=e, extra={'input_key': input_key, 'age': round(age)})
+        return QuoteResult(quote, None, age)
@@ -0,0 +1,399 @@
+import asyncio
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.core.logger import logger
+from app.core.utils import BASE_DIR
+from app.database.crud.destination import DestinationService
+from app.database.crud.exchange_rate import ExchangeRateService
+from app.database.crud.tariff_version import TariffVersionService
+from app.database.db.session import AsyncSessionLocal
+from app.database.models import AdditionalFee, AdditionalSpecialFee, Destination, Fee, FeeType, Location, Terminal, \
+    VehicleType
+from app.enums.auction import AuctionEnum
+from app.enums.fee_type import FeeTypeEnum
+from app.enums.vehicle_type import VehicleTypeEnum
+from app.schemas.calculator import CalculatorDataIn
+from app.services.calculator.calculator_service import CalculatorService
+from app.services.calculator.exceptions import DestinationNotFoundError, FeeNotFoundError, LocationNotFoundError
+from app.services.calculator.pricing import Route, auction_fee_amount, build_additional_fees, build_calculator_out, \
+    convert_calculator_out
+from app.services.calculator.types import AdditionalFeesOut, Calculator
+from app.services.tariff.array_file import StringTable, decode_strings, map_array_file, read_array_file_meta, \
+    write_array_file
+from app.services.tariff.matrices import TariffMatrices
+from app.services.tariff.store import TariffMatrixStore, tariff_matrix_store
+
+# [band x (min, max, fee)] sorted by min, same order the fee services query in
+Bands = np.ndarray
+# bumped whenever the arrays written by `TariffSnapshot.to_file` change
+SNAPSHOT_FILE_FORMAT = 1
+
+
+@lru_cache(maxsize=1024)
+def like_pattern(pattern: str) -> re.Pattern:
+    """SQL ILIKE pattern as a regex: % matches any run, _ any single character."""
+    parts = (('.*' if char == '%' else '.' if char == '_' else re.escape(char)) for char in pattern)
+    return re.compile(''.join(parts), re.IGNORECASE | re.DOTALL)
+
+
+def find_band(bands: Bands, price: int) -> np.ndarray | None:
+    matches = np.flatnonzero((bands[:, 0] <= price) & (bands[:, 1] >= price))
+    return bands[matches[0]] if len(matches) else None
+
+
+def _bands(rows) -> Bands:
+    return np.array(rows, dtype=np.float64).reshape(-1, 3)
+
+
+def _table(rows, width: int) -> np.ndarray:
+    return np.array(rows, dtype=np.int64).reshape(-1, width)
+
+
+@dataclass
+class TariffSnapshot:
+    """
+    Everything `CalculatorService.calculate` reads, loaded once, so quotes can be computed without a database.
+    Lookups mirror the CRUD services and the arithmetic is shared through `pricing`, so a snapshot quote
+    equals the API response for the same tariff version and exchange rate.
+    """
+    matrices: TariffMatrices
+    terminal_names: list[str]
+    vehicle_types: dict[tuple[AuctionEnum, VehicleTypeEnum], int]
+    locations: list[tuple[int, str]]
+    destinations: list[tuple[int, str]]
+    default_destination_id: int
+    fee_bands: dict[tuple[AuctionEnum, FeeTypeEnum], Bands]
+    int_proxy_bands: Bands
+    live_bid_bands: Bands
+    special_fees: dict[AuctionEnum, list[tuple[str, int]]]
+    rate: float
+    rate_id: int
+    broker_fee: int = CalculatorService.BROKER_FEE
+
+    def __post_init__(self):
+        # lower-cased name -> location ids, an exact name (the usual request) skips the ILIKE scan
+        self.location_index: dict[str, list[int]] = {}
+        for location_id, name in self.locations:
+            self.location_index.setdefault(name.lower(), []).append(location_id)
+
+    @classmethod
+    async def load(cls, session: AsyncSession, matrices: TariffMatrices) -> 'TariffSnapshot':
+        # both may write (missing default destination / exchange rate), exactly like the first API call would
+        default_destination = await DestinationService(session).get_default()
+        rate = await ExchangeRateService(session).get_last_rate()
+
+        terminals = dict((await session.execute(select(Terminal.id, Terminal.name))).tuples().all())
+        vehicle_types = {}
+        for row in await session.execute(
+                select(VehicleType.id, VehicleType.auction, VehicleType.vehicle_type)
+                .where(VehicleType.auction.is_not(None), VehicleType.vehicle_type.is_not(None))
+                .order_by(VehicleType.specific_type.is_not(None), VehicleType.id)):
+            vehicle_types.setdefault((row.auction, row.vehicle_type), row.id)
+
+        fee_rows: dict[tuple[AuctionEnum, FeeTypeEnum], list] = {}
+        for row in await session.execute(
+                select(FeeType.auction, FeeType.fee_type, Fee.car_price_min, Fee.car_price_max, Fee.car_price_fee)
+                .join(Fee, Fee.fee_type_id == FeeType.id)
+                .order_by(Fee.car_price_min)):
+            fee_rows.setdefault((row.auction, row.fee_type), []).append(tuple(row)[2:])
+
+        int_proxy = await session.execute(
+            select(AdditionalFee.int_proxy_min, AdditionalFee.int_proxy_max, AdditionalFee.int_fee)
+            .where(AdditionalFee.int_proxy_min.is_not(None), AdditionalFee.int_proxy_max.is_not(None))
+            .order_by(AdditionalFee.int_proxy_min)
+        )
+        live_bid = await session.execute(
+            select(AdditionalFee.live_bid_min, AdditionalFee.live_bid_max, AdditionalFee.live_bid_fee)
+            .where(AdditionalFee.live_bid_min.is_not(None), AdditionalFee.live_bid_max.is_not(None))
+            .order_by(AdditionalFee.live_bid_min)
+        )
+
+        special_fees: dict[AuctionEnum, list[tuple[str, int]]] = {}
+        for row in await session.execute(
+                select(AdditionalSpecialFee.auction, AdditionalSpecialFee.name, AdditionalSpecialFee.amount)
+                .order_by(AdditionalSpecialFee.id)):
+            special_fees.setdefault(row.auction, []).append((row.name, row.amount))
+
+        return cls(
+            matrices=matrices,
+            terminal_names=[terminals.get(terminal_id, str(terminal_id))
+                            for terminal_id in matrices.terminal_ids.tolist()],
+            vehicle_types=vehicle_types,
+            locations=list((await session.execute(
+                select(Location.id, Location.name).order_by(Location.id))).tuples().all()),
+            destinations=list((await session.execute(
+                select(Destination.id, Destination.name).order_by(Destination.id))).tuples().all()),
+            default_destination_id=default_destination.id,
+            fee_bands={key: _bands(rows) for key, rows in fee_rows.items()},
+            int_proxy_bands=_bands(int_proxy.tuples().all()),
+            live_bid_bands=_bands(live_bid.tuples().all()),
+            special_fees=special_fees,
+            rate=rate.rate,
+            rate_id=rate.id,
+        )
+
+    def to_file(self, path: Path) -> None:
+        """Writes the snapshot as NumPy arrays, names go to a string table and are referred to by index."""
+        strings = StringTable()
+        fee_keys = list(self.fee_bands)
+        arrays = {
+            'location_ids': self.matrices.location_ids,
+            'terminal_ids': self.matrices.terminal_ids,
+            'destination_ids': self.matrices.destination_ids,
+            'vehicle_type_ids': self.matrices.vehicle_type_ids,
+            'delivery': self.matrices.delivery,
+            'shipping': self.matrices.shipping,
+            'terminal_names': np.array([strings.add(name) for name in self.terminal_names], dtype=np.int64),
+            'vehicle_types': _table([(strings.add(auction.value), strings.add(vehicle_type.value), vehicle_type_id)
+                                     for (auction, vehicle_type), vehicle_type_id in self.vehicle_types.items()], 3),
+            'locations': _table([(location_id, strings.add(name)) for location_id, name in self.locations], 2),
+            'destinations': _table([(destination_id, strings.add(name))
+                                    for destination_id, name in self.destinations], 2),
+            # bands of every (auction, fee type) one after the other, the keys hold their lengths
+            'fee_band_keys': _table([(strings.add(auction.value), strings.add(fee_type.value),
+                                      len(self.fee_bands[auction, fee_type])) for auction, fee_type in fee_keys], 3),
+            'fee_bands': np.concatenate([self.fee_bands[key] for key in fee_keys]) if fee_keys else _bands([]),
+            'int_proxy_bands': self.int_proxy_bands,
+            'live_bid_bands': self.live_bid_bands,
+            'special_fees': _table([(strings.add(auction.value), strings.add(name), amount)
+                                    for auction, fees in self.special_fees.items() for name, amount in fees], 3),
+        }
+        arrays['strings'], arrays['string_offsets'] = strings.encode()
+        meta = {
+            'format': SNAPSHOT_FILE_FORMAT,
+            'version': self.matrices.version,
+            'rate': self.rate,
+            'rate_id': self.rate_id,
+            'default_destination_id': self.default_destination_id,
+            'broker_fee': self.broker_fee,
+        }
+        write_array_file(path, meta, arrays)
+
+    @classmethod
+    def from_file(cls, path: Path) -> 'TariffSnapshot':
+        """Maps a file written by `to_file`; the matrices and bands stay read-only views of the mapping."""
+        meta, arrays = map_array_file(path)
+        if meta.get('format') != SNAPSHOT_FILE_FORMAT:
+            raise ValueError(f'Tariff snapshot file format {meta.get("format")}, expected {SNAPSHOT_FILE_FORMAT}')
+        strings = decode_strings(arrays['strings'], arrays['string_offsets'])
+
+        fee_bands, start = {}, 0
+        for auction, fee_type, count in arrays['fee_band_keys'].tolist():
+            fee_bands[AuctionEnum(strings[auction]), FeeTypeEnum(strings[fee_type])] = \
+                arrays['fee_bands'][start:start + count]
+            start += count
+        special_fees: dict[AuctionEnum, list[tuple[str, int]]] = {}
+        for auction, name, amount in arrays['special_fees'].tolist():
+            special_fees.setdefault(AuctionEnum(strings[auction]), []).append((strings[name], amount))
+
+        return cls(
+            matrices=TariffMatrices(
+                version=meta['version'],
+                location_ids=arrays['location_ids'],
+                terminal_ids=arrays['terminal_ids'],
+                destination_ids=arrays['destination_ids'],
+                vehicle_type_ids=arrays['vehicle_type_ids'],
+                delivery=arrays['delivery'],
+                shipping=arrays['shipping'],
+            ),
+            terminal_names=[strings[i] for i in arrays['terminal_names'].tolist()],
+            vehicle_types={(AuctionEnum(strings[auction]), VehicleTypeEnum(strings[vehicle_type])): vehicle_type_id
+                           for auction, vehicle_type, vehicle_type_id in arrays['vehicle_types'].tolist()},
+            locations=[(location_id, strings[name]) for location_id, name in arrays['locations'].tolist()],
+            destinations=[(destination_id, strings[name])
+                          for destination_id, name in arrays['destinations'].tolist()],
+            default_destination_id=meta['default_destination_id'],
+            fee_bands=fee_bands,
+            int_proxy_bands=arrays['int_proxy_bands'],
+            live_bid_bands=arrays['live_bid_bands'],
+            special_fees=special_fees,
+            rate=meta['rate'],
+            rate_id=meta['rate_id'],
+            broker_fee=meta['broker_fee'],
+        )
+
+    def _find_location(self, location_name: str, vehicle_type_id: int) -> int | None:
+        """Same pattern priority as `LocationService.get_location`, limited to locations with delivery prices."""
+        delivery = self.matrices.delivery[self.matrices.vehicle_type_position(vehicle_type_id)]
+        clean_name = re.sub(r'\s*\([^)]*\)', '', location_name).strip()
+        for pattern in (location_name, clean_name, f"%{clean_name}%", f"{clean_name}%"):
+            if '%' in pattern or '_' in pattern:
+                regex = like_pattern(pattern)
+                candidates = (location_id for location_id, name in self.locations if regex.fullmatch(name))
+            else:
+                candidates = self.location_index.get(pattern.lower(), [])
+            for location_id in candidates:
+                if np.isfinite(delivery[self.matrices.location_position(location_id)]).any():
+                    return location_id
+        return None
+
+    def _find_destination(self, destination: str | None) -> int | None:
+        if destination is None:
+            return self.default_destination_id
+        regex = like_pattern(destination)
+        return next((destination_id for destination_id, name in self.destinations if regex.fullmatch(name)), None)
+
+    def routes(self, location_id: int, destination_id: int, vehicle_type_id: int) -> list[Route]:
+        """Terminals served by both legs, cheapest first, ties by terminal id like the route_cost lookup."""
+        v = self.matrices.vehicle_type_position(vehicle_type_id)
+        delivery = self.matrices.delivery[v, self.matrices.location_position(location_id)]
+        shipping = self.matrices.shipping[v, :, self.matrices.destination_position(destination_id)]
+        total = delivery + shipping
+        served = np.flatnonzero(np.isfinite(total))
+        ordered = served[np.argsort(total[served], kind='stable')]
+        return [(self.terminal_names[t], int(delivery[t]), int(shipping[t])) for t in ordered.tolist()]
+
+    def fee_schedule(self, auction: AuctionEnum, fee_type: FeeTypeEnum | None) -> 'FeeSchedule':
+        return FeeSchedule(
+            auction=auction,
+            auction_bands=self.fee_bands.get((auction, fee_type or FeeTypeEnum.NON_CLEAN_TITLE_FEE)),
+            int_proxy_bands=self.int_proxy_bands,
+            live_bid_bands=self.live_bid_bands,
+            special_fees=self.special_fees.get(auction, []),
+        )
+
+    def find_routes(self, auction: AuctionEnum, vehicle_type: VehicleTypeEnum, location: str,
+                    destination_id: int) -> list[Route]:
+        vehicle_type_id = self.vehicle_types.get((auction, vehicle_type))
+        location_id = self._find_location(location, vehicle_type_id) if vehicle_type_id else None
+        if location_id is None:
+            raise LocationNotFoundError(f'Location {location} not found')
+        return self.routes(location_id, destination_id, vehicle_type_id)
+
+    def find_destination(self, destination: str | None) -> int:
+        destination_id = self._find_destination(destination)
+        if destination_id is None:
+            raise DestinationNotFoundError(f'Destination {destination} not found')
+        return destination_id
+
+    def price(self, price: int, additional_fees: AdditionalFeesOut, routes: list[Route]) -> Calculator:
+        calculator_out = build_calculator_out(
+            price=price,
+            broker_fee=self.broker_fee,
+            additional_fees=additional_fees,
+            routes=routes,
+        )
+        return Calculator(
+            calculator_in_dollars=calculator_out,
+            calculator_in_currency=convert_calculator_out(calculator_out, self.rate),
+        )
+
+    def quote(self, data: CalculatorDataIn) -> Calculator:
+        # destination, fees, location: the order CalculatorService fails in
+        destination_id = self.find_destination(data.destination)
+        additional_fees = self.fee_schedule(data.auction, data.fee_type).additional_fees(data.price)
+        routes = self.find_routes(data.auction, data.vehicle_type, data.location, destination_id)
+        return self.price(data.price, additional_fees, routes)
+
+
+@dataclass(frozen=True)
+class FeeSchedule:
+    """The fees of one auction and fee type; only the price is left to find the bands."""
+    auction: AuctionEnum
+    auction_bands: Bands | None
+    int_proxy_bands: Bands
+    live_bid_bands: Bands
+    special_fees: list[tuple[str, int]]
+
+    def additional_fees(self, price: int) -> AdditionalFeesOut:
+        auction_band = find_band(self.auction_bands, price) if self.auction_bands is not None else None
+        if auction_band is None:
+            raise FeeNotFoundError(f'No auction fee for {self.auction.value} at price {price}')
+        auction_fee = auction_fee_amount(price, float(auction_band[2]))
+
+        internet_fee = 0
+        live_fee = 0
+        if self.auction == AuctionEnum.IAAI:
+            band = find_band(self.int_proxy_bands, price)
+            if band is None:
+                raise FeeNotFoundError(f'No internet fee at price {price}')
+            internet_fee = float(band[2])
+        elif self.auction == AuctionEnum.COPART:
+            band = find_band(self.live_bid_bands, price)
+            if band is None:
+                raise FeeNotFoundError(f'No live bid fee at price {price}')
+            live_fee = float(band[2])
+        return build_additional_fees(self.special_fees, auction_fee, internet_fee, live_fee)
+
+
+class TariffSnapshotFile:
+    """
+    The snapshot shared by the worker processes of a host. The first worker to load a tariff version from
+    the database writes it, the others map the file instead of running the queries, and the OS keeps one
+    copy of the arrays for all of them. Mapped again whenever the file is replaced.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.written_at: float | None = None  # mtime of the mapped file
+        self._snapshot: TariffSnapshot | None = None
+        self._mapped: tuple[int, int, int] | None = None
+
+    def read(self) -> TariffSnapshot | None:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        mapped = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if mapped != self._mapped:
+            try:
+                self._snapshot = TariffSnapshot.from_file(self.path)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning('Could not map the tariff snapshot file', exc_info=e, extra={'path': str(self.path)})
+                return None
+            self._mapped, self.written_at = mapped, stat.st_mtime
+        return self._snapshot
+
+    def holds(self, version: int, rate_id: int) -> bool:
+        try:
+            meta = read_array_file_meta(self.path)
+        except (OSError, ValueError):
+            return False
+        return (meta.get('format'), meta.get('version'), meta.get('rate_id')) == (SNAPSHOT_FILE_FORMAT, version,
+                                                                                   rate_id)
+
+    def write(self, snapshot: TariffSnapshot) -> None:
+        if self.holds(snapshot.matrices.version, snapshot.rate_id):
+            return
+        snapshot.to_file(self.path)
+        logger.info(f'Tariff snapshot for version {snapshot.matrices.version} written to {self.path}',
+                    extra={'tariff_version': snapshot.matrices.version, 'nbytes': snapshot.matrices.nbytes})
+
+
+tariff_snapshot_file = TariffSnapshotFile(BASE_DIR / settings.TARIFF_SNAPSHOT_FILE) \
+    if settings.TARIFF_SNAPSHOT_FILE else None
+
+
+async def load_current_snapshot(session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+                                store: TariffMatrixStore = tariff_matrix_store,
+                                file: TariffSnapshotFile | None = tariff_snapshot_file) -> TariffSnapshot:
+    """
+    The snapshot of the current tariff version and exchange rate: mapped from `file` when it holds them,
+    otherwise loaded from the database and written to `file` for the other workers.
+    """
+    if file is not None and (snapshot := file.read()) is not None:
+        async with session_factory() as session:
+            # the rate first: bootstrapping a missing rate bumps the tariff version
+            rate = await ExchangeRateService(session).get_last_rate()
+            version = await TariffVersionService(session).get_current_version()
+        if (snapshot.matrices.version, snapshot.rate_id) == (version, rate.id):
+            store.replace(snapshot.matrices)
+            return snapshot
+
+    matrices = await store.get()
+    async with session_factory() as session:
+        snapshot = await TariffSnapshot.load(session, matrices)
+    if file is not None:
+        try:
+            await asyncio.to_thread(file.write, snapshot)
+        except OSError as e:
+            logger.warning('Could not write the tariff snapshot file', exc_info=e, extra={'path': str(file.path)})
+    return snapshot
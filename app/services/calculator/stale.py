@@ -0,0 +1,58 @@
+import time
+from typing import Awaitable, Callable
+
+from app.config import settings
+from app.core.logger import logger
+from app.core.metrics import QUOTE_STALE_RESPONSES
+from app.schemas.calculator import CalculatorDataIn
+from app.services.calculator.quote_cache import QuoteCache, quote_cache
+from app.services.calculator.snapshot import TariffSnapshot
+from app.services.calculator.types import Calculator
+
+
+class StaleQuotes:
+    """
+    What the calculator can still answer from when the database is slow or down: the last quote cached
+    for the same inputs, otherwise a quote from the last tariff snapshot. Either is served only while it
+    is younger than `max_age`; a snapshot's age counts from the last time it was confirmed current.
+    """
+
+    def __init__(self, cache: QuoteCache = quote_cache, max_age: float = settings.QUOTE_STALE_MAX_AGE):
+        self.cache = cache
+        self.max_age = max_age
+        self.snapshot: TariffSnapshot | None = None
+        self._snapshot_verified_at = 0.0
+
+    def remember_snapshot(self, snapshot: TariffSnapshot, age: float = 0.0) -> None:
+        """`age`: seconds since the snapshot was last known to be current."""
+        self.snapshot = snapshot
+        self._snapshot_verified_at = time.monotonic() - age
+
+    def confirm_snapshot(self, tariff_version: int) -> None:
+        if self.snapshot is not None and self.snapshot.matrices.version == tariff_version:
+            self._snapshot_verified_at = time.monotonic()
+
+    async def get(self, input_key: str,
+                  get_input: Callable[[], Awaitable[CalculatorDataIn]]) -> tuple[Calculator, float] | None:
+        """The stale quote for `input_key` and its age in seconds, None when there is nothing young enough."""
+        if self.max_age <= 0:
+            return None
+        last_good = self.cache.last_good(input_key)
+        if last_good is not None and last_good[1] <= self.max_age:
+            QUOTE_STALE_RESPONSES.labels('cache').inc()
+            return last_good
+
+        age = time.monotonic() - self._snapshot_verified_at
+        if self.snapshot is None or age > self.max_age:
+            return None
+        try:
+            data = await get_input()
+        except Exception as e:
+            logger.warning('No input for a stale quote', exc_info=e, extra={'input_key': input_key})
+            return None
+        quote = self.snapshot.quote(data)
+        QUOTE_STALE_RESPONSES.labels('snapshot').inc()
+        return quote, age
+
+
+stale_quotes = StaleQuotes()
@@ -0,0 +1,69 @@
+import asyncio
+
+from app.config import settings
+from app.core.logger import logger
+from app.core.metrics import TARIFF_CHANGE_MESSAGES
+from app.services.calculator.prewarm import QuotePrewarmer, quote_prewarmer
+from app.services.calculator.quote_cache import QuoteCache, quote_cache
+from app.services.tariff.changes import TariffChange, TariffChangeBus, get_tariff_change_bus
+from app.services.tariff.store import TariffMatrixStore, tariff_matrix_store
+
+
+class TariffChangeListener:
+    """
+    Applies tariff changes published by any instance as they commit, instead of when the prewarmer's next poll
+    or the next request notices them: the superseded quotes are dropped, the matrices of the new version are
+    built and the hot quotes prewarmed. Versions already seen are ignored, the instance's own publications too.
+    """
+
+    def __init__(self, bus: TariffChangeBus | None = None, cache: QuoteCache = quote_cache,
+                 store: TariffMatrixStore = tariff_matrix_store, prewarmer: QuotePrewarmer = quote_prewarmer,
+                 retry_seconds: float = settings.TARIFF_CHANGE_RETRY_SECONDS):
+        self.bus = bus
+        self.cache = cache
+        self.store = store
+        self.prewarmer = prewarmer
+        self.retry_seconds = retry_seconds
+        self.version = 0
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name='tariff-change-listener')
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def apply(self, change: TariffChange) -> bool:
+        if change.version <= self.version:
+            TARIFF_CHANGE_MESSAGES.labels('ignored').inc()
+            return False
+        self.version = change.version
+        dropped = self.cache.drop_superseded()
+        await self.store.get()
+        await self.prewarmer.check()
+        TARIFF_CHANGE_MESSAGES.labels('applied').inc()
+        logger.info(f'Tariff change {change.version} from {change.source} applied',
+                    extra={'tariff_version': change.version, 'dropped_quotes': dropped})
+        return True
+
+    async def _run(self) -> None:
+        bus = self.bus or get_tariff_change_bus()
+        while True:
+            try:
+                async for change in bus.subscribe():
+                    try:
+                        await self.apply(change)
+                    except Exception as e:
+                        logger.warning('Could not apply a tariff change', exc_info=e,
+                                       extra={'tariff_version': change.version})
+            except Exception as e:
+                logger.warning(f'Tariff change subscription failed, subscribing again in {self.retry_seconds}s',
+                               exc_info=e)
+            await asyncio.sleep(self.retry_seconds)
+
+
+tariff_change_listener = TariffChangeListener()
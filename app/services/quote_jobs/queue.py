@@ -0,0 +1,56 @@
+import asyncio
+from abc import ABC, abstractmethod
+
+from redis import asyncio as aioredis
+
+from app.config import settings, QuoteJobQueueBackend
+
+
+class QuoteJobQueue(ABC):
+    # in-process queues lose their content on restart, so unfinished jobs are re-enqueued from the database
+    durable: bool = False
+
+    @abstractmethod
+    async def put(self, job_id: int) -> None: ...
+
+    @abstractmethod
+    async def get(self) -> int: ...
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryQuoteJobQueue(QuoteJobQueue):
+    def __init__(self):
+        self._queue: asyncio.Queue[int] = asyncio.Queue()
+
+    async def put(self, job_id: int) -> None:
+        await self._queue.put(job_id)
+
+    async def get(self) -> int:
+        return await self._queue.get()
+
+
+class RedisQuoteJobQueue(QuoteJobQueue):
+    """Shared list, so every instance's workers take jobs submitted to any instance."""
+    durable = True
+    KEY = 'quote_jobs:queue'
+
+    def __init__(self, url: str = settings.REDIS_URL):
+        self.redis = aioredis.Redis.from_url(url)
+
+    async def put(self, job_id: int) -> None:
+        await self.redis.rpush(self.KEY, job_id)
+
+    async def get(self) -> int:
+        _, job_id = await self.redis.blpop([self.KEY])
+        return int(job_id)
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+
+def create_quote_job_queue(backend: QuoteJobQueueBackend = settings.QUOTE_JOB_QUEUE) -> QuoteJobQueue:
+    if backend == QuoteJobQueueBackend.REDIS:
+        return RedisQuoteJobQueue()
+    return InMemoryQuoteJobQueue()
@@ -0,0 +1,238 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, UTC
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.core.logger import logger
+from app.core.utils import BASE_DIR
+from app.database.crud.exchange_rate import ExchangeRateService
+from app.database.crud.quote_job import QuoteJobService
+from app.database.crud.tariff_version import TariffVersionService
+from app.database.db.session import AsyncSessionLocal
+from app.database.models import QuoteJob
+from app.enums.quote_job import QuoteJobStatusEnum
+from app.services.calculator.bulk import QUOTE_COLUMNS, count_lots, init_worker, missing_columns, quote_chunk, \
+    read_lots
+from app.services.calculator.executor import spawn_pool
+from app.services.calculator.snapshot import TariffSnapshot, TariffSnapshotFile, load_current_snapshot, \
+    tariff_snapshot_file
+from app.services.quote_jobs.queue import QuoteJobQueue, create_quote_job_queue
+from app.services.tariff.store import TariffMatrixStore, tariff_matrix_store
+
+QUOTE_JOB_DIR = BASE_DIR / settings.QUOTE_JOB_DIR
+
+
+def quote_job_path(job: QuoteJob) -> Path:
+    return QUOTE_JOB_DIR / f'{job.id}{Path(job.filename).suffix.lower()}'
+
+
+def result_row(row_number: int, quoted: dict[str, Any]) -> dict[str, Any]:
+    # Parquet cells may be dates or decimals, the JSON column takes them as text
+    lot = {key: value if isinstance(value, (str, int, float, bool, type(None))) else str(value)
+           for key, value in quoted.items() if key not in QUOTE_COLUMNS}
+    quote = None if quoted['error_type'] else {key: quoted[key] for key in QUOTE_COLUMNS[:-2]}
+    return {'row_number': row_number, 'lot': lot, 'quote': quote,
+            'error_type': quoted['error_type'], 'error': quoted['error']}
+
+
+@dataclass(eq=False)
+class SnapshotPool:
+    """
+    Quotes from one snapshot, in a process pool whose workers hold it or, without processes, in a thread.
+    Jobs hold the pool for their whole run. Once the tariffs move on it is retired and shut down when the
+    last job quoting from it releases it.
+    """
+    snapshot: TariffSnapshot
+    executor: ProcessPoolExecutor | None
+    jobs: int = 0
+    retired: bool = False
+
+    @property
+    def key(self) -> tuple[int, int]:
+        return self.snapshot.matrices.version, self.snapshot.rate_id
+
+    async def quote(self, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        if self.executor is None:
+            return await loop.run_in_executor(None, partial(quote_chunk, rows, snapshot=self.snapshot))
+        return await loop.run_in_executor(self.executor, quote_chunk, rows)
+
+    def release(self) -> None:
+        self.jobs -= 1
+        self._shutdown_if_idle()
+
+    def retire(self) -> None:
+        self.retired = True
+        self._shutdown_if_idle()
+
+    def _shutdown_if_idle(self) -> None:
+        if self.retired and not self.jobs and self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class QuoteJobRunner:
+    """
+    Background workers for uploaded quote batches. Chunks are quoted from a TariffSnapshot in a process
+    pool, so large batches never run on the event loop that serves the calculator. Progress and results
+    are committed after every chunk. With a durable queue, jobs whose heartbeat stopped (their instance died
+    mid-run) are swept back into the queue every half lease.
+    """
+
+    def __init__(self,
+                 queue: QuoteJobQueue,
+                 session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+                 workers: int = settings.QUOTE_JOB_WORKERS,
+                 processes: int = settings.QUOTE_JOB_PROCESSES,
+                 chunk_size: int = settings.QUOTE_JOB_CHUNK_SIZE,
+                 lease_seconds: float = settings.QUOTE_JOB_LEASE_SECONDS,
+                 store: TariffMatrixStore = tariff_matrix_store,
+                 snapshot_file: TariffSnapshotFile | None = tariff_snapshot_file):
+        self.queue = queue
+        self.session_factory = session_factory
+        self.workers = workers
+        self.processes = processes
+        self.chunk_size = chunk_size
+        self.lease_seconds = lease_seconds
+        self.store = store
+        self.snapshot_file = snapshot_file
+        self._tasks: list[asyncio.Task] = []
+        self._pool: SnapshotPool | None = None
+        self._pool_lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        QUOTE_JOB_DIR.mkdir(parents=True, exist_ok=True)
+        if not self.queue.durable:
+            async with self.session_factory() as session:
+                for job in await QuoteJobService(session).get_unfinished():
+                    await self.queue.put(job.id)
+        self._tasks = [asyncio.create_task(self._work(), name=f'quote-job-worker-{i}') for i in range(self.workers)]
+        if self.queue.durable and self.lease_seconds > 0:
+            self._tasks.append(asyncio.create_task(self._sweep(), name='quote-job-sweeper'))
+        logger.info(f'Quote job runner started with {self.workers} workers, {self.processes} processes')
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._pool:
+            self._pool.retire()
+            self._pool = None
+        await self.queue.close()
+
+    async def submit(self, job: QuoteJob) -> None:
+        await self.queue.put(job.id)
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self.queue.get()
+            try:
+                await self.process(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f'Quote job {job_id} failed', exc_info=e, extra={'job_id': job_id})
+                await self._fail(job_id, str(e))
+
+    async def requeue_abandoned(self) -> list[int]:
+        heartbeat_before = datetime.now(UTC) - timedelta(seconds=self.lease_seconds)
+        async with self.session_factory() as session:
+            job_ids = await QuoteJobService(session).requeue_abandoned(heartbeat_before)
+            await session.commit()
+        for job_id in job_ids:
+            logger.warning(f'Quote job {job_id} lost its worker, requeued', extra={'job_id': job_id})
+            await self.queue.put(job_id)
+        return job_ids
+
+    async def _sweep(self) -> None:
+        while True:
+            try:
+                await self.requeue_abandoned()
+            except Exception as e:
+                logger.error('Sweeping abandoned quote jobs failed', exc_info=e)
+            await asyncio.sleep(self.lease_seconds / 2)
+
+    async def _acquire_pool(self) -> SnapshotPool:
+        """The pool for the current tariff version and rate, held until `release()`."""
+        async with self._pool_lock:
+            async with self.session_factory() as session:
+                rate = await ExchangeRateService(session).get_last_rate()
+                version = await TariffVersionService(session).get_current_version()
+            if self._pool is None or self._pool.key != (version, rate.id):
+                snapshot = await load_current_snapshot(self.session_factory, self.store, self.snapshot_file)
+                if self._pool is not None:
+                    self._pool.retire()
+                executor = spawn_pool(self.processes, init_worker, (snapshot,)) if self.processes else None
+                self._pool = SnapshotPool(snapshot, executor)
+            self._pool.jobs += 1
+            return self._pool
+
+    async def process(self, job_id: int) -> None:
+        async with self.session_factory() as session:
+            job_service = QuoteJobService(session)
+            job = await job_service.get(job_id)
+            if not job or job.status in (QuoteJobStatusEnum.COMPLETED, QuoteJobStatusEnum.FAILED):
+                return
+            path = quote_job_path(job)
+
+            # a job interrupted by a restart starts over
+            await job_service.clear_results(job.id)
+            pool = await self._acquire_pool()
+            try:
+                await self._run(session, job, pool)
+            finally:
+                pool.release()
+        path.unlink(missing_ok=True)
+
+    async def _run(self, session: AsyncSession, job: QuoteJob, pool: SnapshotPool) -> None:
+        loop = asyncio.get_running_loop()
+        job_service = QuoteJobService(session)
+        path = quote_job_path(job)
+        version = pool.snapshot.matrices.version
+        job.status = QuoteJobStatusEnum.RUNNING
+        job.started_at = job.heartbeat_at = datetime.now(UTC)
+        job.processed_rows = job.failed_rows = 0
+        job.tariff_version = version
+        job.total_rows = await loop.run_in_executor(None, count_lots, path)
+        await session.commit()
+        logger.info(f'Quote job {job.id} started, {job.total_rows} rows',
+                    extra={'job_id': job.id, 'tariff_version': version})
+
+        chunks = read_lots(path, self.chunk_size)
+        while (chunk := await loop.run_in_executor(None, next, chunks, None)) is not None:
+            missing = missing_columns(chunk[0]) if chunk else []
+            if missing:
+                raise ValueError(f'missing columns {", ".join(missing)}')
+            quoted = await pool.quote(chunk)
+            await job_service.add_results(job.id, [
+                result_row(job.processed_rows + offset + 1, row) for offset, row in enumerate(quoted)
+            ])
+            job.processed_rows += len(quoted)
+            job.failed_rows += sum(1 for row in quoted if row['error_type'])
+            job.heartbeat_at = datetime.now(UTC)
+            await session.commit()
+
+        job.status = QuoteJobStatusEnum.COMPLETED
+        job.finished_at = datetime.now(UTC)
+        await session.commit()
+        logger.info(f'Quote job {job.id} completed, {job.processed_rows} rows, {job.failed_rows} failed',
+                    extra={'job_id': job.id})
+
+    async def _fail(self, job_id: int, error: str) -> None:
+        async with self.session_factory() as session:
+            job = await QuoteJobService(session).get(job_id)
+            if job:
+                job.status = QuoteJobStatusEnum.FAILED
+                job.error = error
+                job.finished_at = datetime.now(UTC)
+                await session.commit()
+                quote_job_path(job).unlink(missing_ok=True)
+
+
+quote_job_runner = QuoteJobRunner(create_quote_job_queue())
@@ -0,0 +1,108 @@
+import json
+import os
+import struct
+import sys
+import tempfile
+from itertools import pairwise
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+# layout: magic, u64 header length, JSON header, then every array at a 64-byte aligned offset
+MAGIC = b'TARIFFS\x01'
+ALIGNMENT = 64
+_LENGTH = struct.Struct('<Q')
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+class StringTable:
+    """Every distinct string stored once, arrays refer to strings by their index."""
+
+    def __init__(self):
+        self._index: dict[str, int] = {}
+
+    def add(self, value: str) -> int:
+        return self._index.setdefault(value, len(self._index))
+
+    def encode(self) -> tuple[np.ndarray, np.ndarray]:
+        """UTF-8 bytes of all strings and the [n + 1] offsets delimiting them."""
+        encoded = [value.encode() for value in self._index]
+        offsets = np.cumsum([0] + [len(value) for value in encoded], dtype=np.int64)
+        return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+
+def decode_strings(data: np.ndarray, offsets: np.ndarray) -> list[str]:
+    raw = data.tobytes()
+    return [sys.intern(raw[start:end].decode()) for start, end in pairwise(offsets.tolist())]
+
+
+def write_array_file(path: Path, meta: dict[str, Any], arrays: dict[str, np.ndarray]) -> None:
+    """
+    Writes next to `path` and renames over it: readers see the old file or the new one, never a partial write,
+    and processes that mapped the old file keep reading it until they map again.
+    """
+    layout, size = {}, 0
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    for name, array in arrays.items():
+        layout[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': size}
+        size = _align(size + array.nbytes)
+    header = json.dumps({'meta': meta, 'arrays': layout}).encode()
+    data_start = _align(len(MAGIC) + _LENGTH.size + len(header))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # a unique name per writer, threads and processes may export the same file at once
+    fd, name = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=path.parent)
+    partial = Path(name)
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(MAGIC + _LENGTH.pack(len(header)) + header)
+            for name, array in arrays.items():
+                file.seek(data_start + layout[name]['offset'])
+                file.write(array.tobytes())
+            file.truncate(data_start + size)
+            file.flush()
+            os.fsync(file.fileno())
+            # mkstemp creates the file readable by its owner only, other users' workers map it too
+            os.fchmod(file.fileno(), 0o644)
+        os.replace(partial, path)
+    finally:
+        partial.unlink(missing_ok=True)
+
+
+def _read_header(raw: np.ndarray) -> tuple[dict[str, Any], int]:
+    if bytes(raw[:len(MAGIC)]) != MAGIC:
+        raise ValueError('Not a tariff array file')
+    start = len(MAGIC) + _LENGTH.size
+    (length,) = _LENGTH.unpack(bytes(raw[len(MAGIC):start]))
+    return json.loads(bytes(raw[start:start + length])), _align(start + length)
+
+
+def read_array_file_meta(path: Path) -> dict[str, Any]:
+    """The metadata alone, without mapping the arrays."""
+    with path.open('rb') as file:
+        head = file.read(len(MAGIC) + _LENGTH.size)
+        if head[:len(MAGIC)] != MAGIC:
+            raise ValueError('Not a tariff array file')
+        (length,) = _LENGTH.unpack(head[len(MAGIC):])
+        return json.loads(file.read(length))['meta']
+
+
+def map_array_file(path: Path) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+    """
+    Maps the file read-only. The arrays are views of the mapping, so processes mapping the same file share
+    its pages through the OS page cache instead of holding a copy each.
+    """
+    buffer = np.memmap(path, dtype=np.uint8, mode='r')
+    header, data_start = _read_header(buffer)
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        dtype = np.dtype(spec['dtype'])
+        start = data_start + spec['offset']
+        count = int(np.prod(spec['shape'], dtype=np.int64))
+        # plain ndarray views: they pickle like any array, the memmap subclass would not survive the trip
+        arrays[name] = np.asarray(buffer[start:start + count * dtype.itemsize]).view(dtype).reshape(spec['shape'])
+    return header['meta'], arrays
@@ -0,0 +1,206 @@
+import asyncio
+import json
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator
+
+from redis import asyncio as aioredis
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings, TariffChangeBusBackend
+from app.core.logger import logger
+from app.database.models import TariffVersion
+
+
+@dataclass(frozen=True)
+class TariffChange:
+    version: int
+    source: str
+
+    def encode(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def decode(cls, payload: str | bytes) -> 'TariffChange':
+        return cls(**json.loads(payload))
+
+
+class TariffChangeBus(ABC):
+    """Fan-out of committed tariff versions: every subscriber of every instance receives every change."""
+
+    def __init__(self, channel: str = settings.TARIFF_CHANGE_CHANNEL):
+        self.channel = channel
+
+    @abstractmethod
+    async def publish(self, change: TariffChange) -> None: ...
+
+    @abstractmethod
+    def subscribe(self) -> AsyncIterator[TariffChange]: ...
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryTariffChangeBus(TariffChangeBus):
+    """Reaches the subscribers of this process only, for a single instance and for tests."""
+
+    def __init__(self, channel: str = settings.TARIFF_CHANGE_CHANNEL):
+        super().__init__(channel)
+        self._subscribers: set[asyncio.Queue[TariffChange]] = set()
+
+    async def publish(self, change: TariffChange) -> None:
+        for queue in self._subscribers:
+            queue.put_nowait(change)
+
+    async def subscribe(self) -> AsyncIterator[TariffChange]:
+        queue: asyncio.Queue[TariffChange] = asyncio.Queue()
+        self._subscribers.add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers.discard(queue)
+
+
+class RedisTariffChangeBus(TariffChangeBus):
+    """Redis pub/sub; messages published while an instance is disconnected are not delivered to it."""
+
+    def __init__(self, url: str = settings.REDIS_URL, channel: str = settings.TARIFF_CHANGE_CHANNEL):
+        super().__init__(channel)
+        self.redis = aioredis.Redis.from_url(url)
+
+    async def publish(self, change: TariffChange) -> None:
+        await self.redis.publish(self.channel, change.encode())
+
+    async def subscribe(self) -> AsyncIterator[TariffChange]:
+        async with self.redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+            await pubsub.subscribe(self.channel)
+            async for message in pubsub.listen():
+                yield TariffChange.decode(message['data'])
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+
+class PostgresTariffChangeBus(TariffChangeBus):
+    """
+    Postgres LISTEN/NOTIFY, no extra infrastructure. Uses asyncpg connections of its own outside the pool:
+    one to publish and one per subscription, a listening connection has to stay open and must not be
+    interrupted by the publishing queries.
+    """
+
+    def __init__(self, dsn: str | None = None, channel: str = settings.TARIFF_CHANGE_CHANNEL):
+        super().__init__(channel)
+        self.dsn = dsn
+        self._connection = None  # publishes
+        self._listening: set = set()  # one connection per subscription
+
+    async def _connect(self):
+        import asyncpg
+
+        from app.database.db.session import SQLALCHEMY_DATABASE_URL
+        return await asyncpg.connect(self.dsn or SQLALCHEMY_DATABASE_URL)
+
+    async def publish(self, change: TariffChange) -> None:
+        if self._connection is None or self._connection.is_closed():
+            self._connection = await self._connect()
+        await self._connection.execute('SELECT pg_notify($1, $2)', self.channel, change.encode())
+
+    async def subscribe(self) -> AsyncIterator[TariffChange]:
+        connection = await self._connect()
+        self._listening.add(connection)
+        queue: asyncio.Queue[TariffChange | None] = asyncio.Queue()
+
+        def on_notify(_connection, _pid, _channel, payload: str) -> None:
+            queue.put_nowait(TariffChange.decode(payload))
+
+        def on_terminate(_connection) -> None:
+            queue.put_nowait(None)
+
+        try:
+            await connection.add_listener(self.channel, on_notify)
+            connection.add_termination_listener(on_terminate)
+            while (change := await queue.get()) is not None:
+                yield change
+            raise ConnectionError('Postgres connection listening for tariff changes was closed')
+        finally:
+            self._listening.discard(connection)
+            if not connection.is_closed():
+                await connection.close()
+
+    async def close(self) -> None:
+        for connection in [self._connection, *self._listening]:
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+        self._connection = None
+        self._listening.clear()
+
+
+def create_tariff_change_bus(backend: TariffChangeBusBackend = settings.TARIFF_CHANGE_BUS) -> TariffChangeBus:
+    if backend == TariffChangeBusBackend.REDIS:
+        return RedisTariffChangeBus()
+    if backend == TariffChangeBusBackend.POSTGRES:
+        return PostgresTariffChangeBus()
+    return InMemoryTariffChangeBus()
+
+
+_tariff_change_bus: TariffChangeBus | None = None
+
+
+def get_tariff_change_bus() -> TariffChangeBus:
+    global _tariff_change_bus
+    if _tariff_change_bus is None:
+        _tariff_change_bus = create_tariff_change_bus()
+    return _tariff_change_bus
+
+
+async def close_tariff_change_bus() -> None:
+    global _tariff_change_bus
+    if _tariff_change_bus is not None:
+        await _tariff_change_bus.close()
+        _tariff_change_bus = None
+
+
+async def publish_tariff_change(change: TariffChange) -> None:
+    """Called by writers after their commit. A lost notification only delays the workers until their next poll."""
+    try:
+        await get_tariff_change_bus().publish(change)
+    except Exception as e:
+        logger.warning('Could not publish a tariff change', exc_info=e, extra={'tariff_version': change.version})
+        return
+    logger.info(f'Tariff change {change.version} published', extra={'tariff_version': change.version,
+                                                                    'source': change.source})
+
+
+# ORM writers (admin endpoints, the exchange rate bootstrap) record versions through `bump_tariff_version`;
+# the new versions are published once their transaction commits
+PENDING_CHANGES_KEY = 'pending_tariff_changes'
+_publishing: set[asyncio.Task] = set()
+
+
+@event.listens_for(Session, 'after_flush')
+def collect_tariff_changes(session: Session, flush_context) -> None:
+    changes = [TariffChange(obj.id, obj.source) for obj in session.new if isinstance(obj, TariffVersion)]
+    if changes:
+        session.info.setdefault(PENDING_CHANGES_KEY, []).extend(changes)
+
+
+@event.listens_for(Session, 'after_rollback')
+def discard_tariff_changes(session: Session) -> None:
+    session.info.pop(PENDING_CHANGES_KEY, None)
+
+
+@event.listens_for(Session, 'after_commit')
+def publish_committed_tariff_changes(session: Session) -> None:
+    changes = session.info.pop(PENDING_CHANGES_KEY, None)
+    if not changes:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # synchronous writers have no loop to publish from, the workers' version polling picks the change up
+        return
+    task = loop.create_task(publish_tariff_change(max(changes, key=lambda change: change.version)))
+    _publishing.add(task)
+    task.add_done_callback(_publishing.discard)
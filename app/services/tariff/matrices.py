@@ -0,0 +1,116 @@
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models import DeliveryPrice, Destination, Location, ShippingPrice, Terminal, VehicleType
+
+# marks "no terminal" in the argmin results, terminal positions are otherwise >= 0
+NO_ROUTE = -1
+
+
+@dataclass(frozen=True)
+class CheapestRoutes:
+    """Cheapest transport leg for every (location, destination) pair of one vehicle type."""
+    cost: np.ndarray  # [location x destination] float, NaN where no terminal connects the pair
+    terminal: np.ndarray  # [location x destination] terminal position, NO_ROUTE where cost is NaN
+
+
+@dataclass(frozen=True)
+class TariffMatrices:
+    """
+    Dense copies of the price tables. Axes follow the sorted id vectors, so position i of the location axis
+    is location `location_ids[i]`. Missing routes are NaN, which propagates through the sums below.
+    """
+    version: int
+    location_ids: np.ndarray
+    terminal_ids: np.ndarray
+    destination_ids: np.ndarray
+    vehicle_type_ids: np.ndarray
+    delivery: np.ndarray  # [vehicle_type x location x terminal]
+    shipping: np.ndarray  # [vehicle_type x terminal x destination]
+
+    @staticmethod
+    def _position(ids: np.ndarray, obj_id: int, name: str) -> int:
+        position = int(np.searchsorted(ids, obj_id))
+        if position == len(ids) or ids[position] != obj_id:
+            raise KeyError(f'{name} {obj_id} is not in the tariff matrices')
+        return position
+
+    def location_position(self, location_id: int) -> int:
+        return self._position(self.location_ids, location_id, 'location')
+
+    def terminal_position(self, terminal_id: int) -> int:
+        return self._position(self.terminal_ids, terminal_id, 'terminal')
+
+    def destination_position(self, destination_id: int) -> int:
+        return self._position(self.destination_ids, destination_id, 'destination')
+
+    def vehicle_type_position(self, vehicle_type_id: int) -> int:
+        return self._position(self.vehicle_type_ids, vehicle_type_id, 'vehicle_type')
+
+    def route_costs(self, vehicle_type_id: int, locations: slice = slice(None)) -> np.ndarray:
+        """[location x terminal x destination] delivery + shipping, NaN where either leg is missing."""
+        v = self.vehicle_type_position(vehicle_type_id)
+        return self.delivery[v, locations][:, :, np.newaxis] + self.shipping[v][np.newaxis, :, :]
+
+    def cheapest_routes(self, vehicle_type_id: int, locations: slice = slice(None)) -> CheapestRoutes:
+        """Pass a location slice to bound the size of the intermediate cube on large tariffs."""
+        costs = self.route_costs(vehicle_type_id, locations)
+        # inf instead of NaN keeps argmin meaningful and avoids all-NaN slice warnings from nanmin
+        costs = np.where(np.isnan(costs), np.inf, costs)
+        terminal = costs.argmin(axis=1)
+        cost = np.take_along_axis(costs, terminal[:, np.newaxis, :], axis=1)[:, 0, :]
+        unreachable = np.isinf(cost)
+        cost[unreachable] = np.nan
+        terminal[unreachable] = NO_ROUTE
+        return CheapestRoutes(cost=cost, terminal=terminal)
+
+    @property
+    def nbytes(self) -> int:
+        return self.delivery.nbytes + self.shipping.nbytes
+
+
+async def _ids(session: AsyncSession, model) -> np.ndarray:
+    result = await session.execute(select(model.id).order_by(model.id))
+    return np.fromiter(result.scalars(), dtype=np.int64)
+
+
+async def _fill(session: AsyncSession, matrix: np.ndarray, columns, axes: tuple[np.ndarray, ...]) -> None:
+    result = await session.execute(select(*columns))
+    rows = np.array(result.all(), dtype=np.float64).reshape(-1, len(columns))
+    if not len(rows):
+        return
+    # ids -> axis positions in one vectorised lookup per axis
+    positions = tuple(np.searchsorted(ids, rows[:, i].astype(np.int64)) for i, ids in enumerate(axes))
+    matrix[positions] = rows[:, -1]
+
+
+async def build_tariff_matrices(session: AsyncSession, version: int) -> TariffMatrices:
+    location_ids = await _ids(session, Location)
+    terminal_ids = await _ids(session, Terminal)
+    destination_ids = await _ids(session, Destination)
+    vehicle_type_ids = await _ids(session, VehicleType)
+
+    delivery = np.full((len(vehicle_type_ids), len(location_ids), len(terminal_ids)), np.nan)
+    await _fill(session, delivery,
+                (DeliveryPrice.vehicle_type_id, DeliveryPrice.location_id, DeliveryPrice.terminal_id,
+                 DeliveryPrice.price),
+                (vehicle_type_ids, location_ids, terminal_ids))
+
+    shipping = np.full((len(vehicle_type_ids), len(terminal_ids), len(destination_ids)), np.nan)
+    await _fill(session, shipping,
+                (ShippingPrice.vehicle_type_id, ShippingPrice.terminal_id, ShippingPrice.destination_id,
+                 ShippingPrice.price),
+                (vehicle_type_ids, terminal_ids, destination_ids))
+
+    return TariffMatrices(
+        version=version,
+        location_ids=location_ids,
+        terminal_ids=terminal_ids,
+        destination_ids=destination_ids,
+        vehicle_type_ids=vehicle_type_ids,
+        delivery=delivery,
+        shipping=shipping,
+    )
@@ -0,0 +1,231 @@
+import csv
+import io
+import json
+import zlib
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Iterator
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.database.db.session import AsyncSessionLocal
+from app.database.models import AdditionalFee, AdditionalSpecialFee, Destination, Fee, FeeType, Location, Terminal, \
+    VehicleType
+from app.enums.price_list import PriceListDatasetEnum, PriceListFormatEnum
+from app.services.calculator.calculator_service import CalculatorService
+from app.services.calculator.executor import QuoteExecutor, quote_executor
+from app.services.tariff.matrices import NO_ROUTE, TariffMatrices
+from app.services.tariff.store import TariffMatrixStore, tariff_matrix_store
+
+ROUTE_COLUMNS = ('location', 'state', 'destination', 'auction', 'vehicle_type', 'terminal',
+                 'delivery_price', 'shipping_price', 'transport_price', 'fixed_fees', 'broker_fee')
+FEE_COLUMNS = ('kind', 'auction', 'fee_type', 'name', 'price_min', 'price_max', 'amount')
+PRICE_LIST_COLUMNS = {
+    PriceListDatasetEnum.ROUTES: ROUTE_COLUMNS,
+    PriceListDatasetEnum.FEES: FEE_COLUMNS,
+}
+PRICE_LIST_MEDIA_TYPES = {
+    PriceListFormatEnum.CSV: 'text/csv',
+    PriceListFormatEnum.NDJSON: 'application/x-ndjson',
+}
+
+# locations priced per step, bounds the [location x terminal x destination] intermediate
+LOCATION_CHUNK = 256
+# encoded bytes buffered before a chunk is handed to the response
+FLUSH_BYTES = 64 * 1024
+
+
+@dataclass
+class RouteLabels:
+    """Names for the matrix axes; lists are aligned with the matrices' id vectors."""
+    locations: list[tuple[str, str | None]]
+    terminals: list[str]
+    destinations: list[str]
+    vehicle_types: dict[int, tuple[str, str]]
+    fixed_fees: dict[str, int]
+
+
+async def load_route_labels(session: AsyncSession, matrices: TariffMatrices) -> RouteLabels:
+    locations = {row.id: (row.name, row.state) for row in await session.execute(
+        select(Location.id, Location.name, Location.state))}
+    terminals = dict((await session.execute(select(Terminal.id, Terminal.name))).tuples().all())
+    destinations = dict((await session.execute(select(Destination.id, Destination.name))).tuples().all())
+    vehicle_types = {
+        row.id: (row.auction.value, row.vehicle_type.value) for row in await session.execute(
+            select(VehicleType.id, VehicleType.auction, VehicleType.vehicle_type)
+            .where(VehicleType.specific_type.is_(None),
+                   VehicleType.auction.is_not(None),
+                   VehicleType.vehicle_type.is_not(None))
+            .order_by(VehicleType.id)
+        )
+    }
+    fixed_fees = {auction.value: int(amount) for auction, amount in await session.execute(
+        select(AdditionalSpecialFee.auction, func.sum(AdditionalSpecialFee.amount))
+        .group_by(AdditionalSpecialFee.auction)
+    )}
+    compiled_vehicle_types = set(matrices.vehicle_type_ids.tolist())
+    return RouteLabels(
+        locations=[locations.get(location_id, (str(location_id), None)) for location_id in
+                   matrices.location_ids.tolist()],
+        terminals=[terminals.get(terminal_id, str(terminal_id)) for terminal_id in matrices.terminal_ids.tolist()],
+        destinations=[destinations.get(destination_id, str(destination_id)) for destination_id in
+                      matrices.destination_ids.tolist()],
+        vehicle_types={vehicle_type_id: label for vehicle_type_id, label in vehicle_types.items()
+                       if vehicle_type_id in compiled_vehicle_types},
+        fixed_fees=fixed_fees,
+    )
+
+
+@dataclass
+class RouteChunk:
+    """Cheapest routes of one vehicle type for a block of locations, positions index the matrix axes."""
+    vehicle_type_id: int
+    location_positions: np.ndarray
+    destination_positions: np.ndarray
+    terminal_positions: np.ndarray
+    delivery: np.ndarray
+    shipping: np.ndarray
+
+
+def route_chunk_size(matrices: TariffMatrices) -> int:
+    """Matrix cells one chunk reduces, the unit the quote executor thresholds on."""
+    return min(LOCATION_CHUNK, len(matrices.location_ids)) * len(matrices.terminal_ids) * \
+        len(matrices.destination_ids)
+
+
+def compute_route_chunk(matrices: TariffMatrices, vehicle_type_id: int, start: int) -> RouteChunk:
+    v = matrices.vehicle_type_position(vehicle_type_id)
+    cheapest = matrices.cheapest_routes(vehicle_type_id, slice(start, start + LOCATION_CHUNK))
+    location_positions, destination_positions = np.nonzero(cheapest.terminal != NO_ROUTE)
+    terminal_positions = cheapest.terminal[location_positions, destination_positions]
+    location_positions += start
+    return RouteChunk(
+        vehicle_type_id=vehicle_type_id,
+        location_positions=location_positions,
+        destination_positions=destination_positions,
+        terminal_positions=terminal_positions,
+        delivery=matrices.delivery[v, location_positions, terminal_positions],
+        shipping=matrices.shipping[v, terminal_positions, destination_positions],
+    )
+
+
+def route_chunk_rows(chunk: RouteChunk, labels: RouteLabels,
+                     broker_fee: int = CalculatorService.BROKER_FEE) -> Iterator[dict[str, Any]]:
+    auction, vehicle_type = labels.vehicle_types[chunk.vehicle_type_id]
+    for l, d, t, delivery_price, shipping_price in zip(
+            chunk.location_positions.tolist(), chunk.destination_positions.tolist(),
+            chunk.terminal_positions.tolist(), chunk.delivery.tolist(), chunk.shipping.tolist()):
+        location, state = labels.locations[l]
+        yield {
+            'location': location,
+            'state': state,
+            'destination': labels.destinations[d],
+            'auction': auction,
+            'vehicle_type': vehicle_type,
+            'terminal': labels.terminals[t],
+            'delivery_price': int(delivery_price),
+            'shipping_price': int(shipping_price),
+            'transport_price': int(delivery_price + shipping_price),
+            'fixed_fees': labels.fixed_fees.get(auction, 0),
+            'broker_fee': broker_fee,
+        }
+
+
+async def iter_route_rows(matrices: TariffMatrices, labels: RouteLabels,
+                          executor: QuoteExecutor = quote_executor) -> AsyncIterator[dict[str, Any]]:
+    """
+    Cheapest terminal for every location x destination x vehicle type, one location chunk at a time.
+    The reduction over terminals is NumPy and leaves the event loop once a chunk is large enough.
+    """
+    size = route_chunk_size(matrices)
+    for vehicle_type_id in labels.vehicle_types:
+        for start in range(0, len(matrices.location_ids), LOCATION_CHUNK):
+            chunk = await executor.run(compute_route_chunk, matrices, vehicle_type_id, start, size=size)
+            for row in route_chunk_rows(chunk, labels):
+                yield row
+
+
+async def iter_fee_rows(session: AsyncSession) -> AsyncIterator[dict[str, Any]]:
+    """Price-dependent fee bands and flat per-auction fees; amounts below 1 are a share of the car price."""
+    auction_fees = await session.stream(
+        select(FeeType.auction, FeeType.fee_type, Fee.car_price_min, Fee.car_price_max, Fee.car_price_fee)
+        .join(Fee, Fee.fee_type_id == FeeType.id)
+        .order_by(FeeType.id, Fee.car_price_min)
+    )
+    async for auction, fee_type, price_min, price_max, amount in auction_fees:
+        yield {'kind': 'auction_fee', 'auction': auction.value, 'fee_type': fee_type.value, 'name': None,
+               'price_min': price_min, 'price_max': price_max, 'amount': amount}
+
+    # the calculator charges the internet fee on IAAI and the live bid fee on COPART
+    for kind, auction, columns in (
+            ('internet_fee', 'IAAI', (AdditionalFee.int_proxy_min, AdditionalFee.int_proxy_max, AdditionalFee.int_fee)),
+            ('live_bid_fee', 'COPART',
+             (AdditionalFee.live_bid_min, AdditionalFee.live_bid_max, AdditionalFee.live_bid_fee))):
+        bands = await session.stream(select(*columns).where(columns[0].is_not(None)).order_by(columns[0]))
+        async for price_min, price_max, amount in bands:
+            yield {'kind': kind, 'auction': auction, 'fee_type': None, 'name': None,
+                   'price_min': price_min, 'price_max': price_max, 'amount': amount}
+
+    special_fees = await session.stream(
+        select(AdditionalSpecialFee.auction, AdditionalSpecialFee.name, AdditionalSpecialFee.amount)
+        .order_by(AdditionalSpecialFee.auction, AdditionalSpecialFee.id)
+    )
+    async for auction, name, amount in special_fees:
+        yield {'kind': 'special_fee', 'auction': auction.value, 'fee_type': None, 'name': name,
+               'price_min': None, 'price_max': None, 'amount': amount}
+
+
+async def iter_price_list_rows(dataset: PriceListDatasetEnum,
+                               session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+                               store: TariffMatrixStore = tariff_matrix_store) -> AsyncIterator[dict[str, Any]]:
+    if dataset == PriceListDatasetEnum.ROUTES:
+        matrices = await store.get()
+        async with session_factory() as session:
+            labels = await load_route_labels(session, matrices)
+        async for row in iter_route_rows(matrices, labels):
+            yield row
+    else:
+        async with session_factory() as session:
+            async for row in iter_fee_rows(session):
+                yield row
+
+
+async def encode_rows(rows: AsyncIterator[dict[str, Any]], columns: tuple[str, ...],
+                      output_format: PriceListFormatEnum) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    if output_format == PriceListFormatEnum.CSV:
+        writer = csv.DictWriter(buffer, fieldnames=columns, lineterminator='\n')
+        writer.writeheader()
+        write = writer.writerow
+    else:
+        def write(row: dict[str, Any]) -> None:
+            buffer.write(json.dumps(row, separators=(',', ':')))
+            buffer.write('\n')
+
+    async for row in rows:
+        write(row)
+        if buffer.tell() >= FLUSH_BYTES:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    # wbits=31 writes a gzip header and trailer around the deflate stream
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def stream_price_list(dataset: PriceListDatasetEnum, output_format: PriceListFormatEnum, gzip: bool = False,
+                      session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+                      store: TariffMatrixStore = tariff_matrix_store) -> AsyncIterator[bytes]:
+    rows = iter_price_list_rows(dataset, session_factory, store)
+    chunks = encode_rows(rows, PRICE_LIST_COLUMNS[dataset], output_format)
+    return gzip_chunks(chunks) if gzip else chunks
@@ -0,0 +1,45 @@
+import asyncio
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.logger import logger
+from app.database.crud.tariff_version import TariffVersionService
+from app.database.db.session import AsyncSessionLocal
+from app.services.tariff.matrices import TariffMatrices, build_tariff_matrices
+
+
+class TariffMatrixStore:
+    """
+    Keeps the compiled matrices of the current tariff version in memory. Each `get` costs one
+    tariff_version lookup; the matrices are rebuilt only after a writer recorded a new version.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal):
+        self.session_factory = session_factory
+        self._matrices: TariffMatrices | None = None
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> TariffMatrices:
+        async with self.session_factory() as session:
+            version = await TariffVersionService(session).get_current_version()
+            if self._matrices is not None and self._matrices.version == version:
+                return self._matrices
+            async with self._lock:
+                if self._matrices is None or self._matrices.version != version:
+                    started = time.perf_counter()
+                    self._matrices = await build_tariff_matrices(session, version)
+                    logger.info(f'Tariff matrices for version {version} built in '
+                                f'{time.perf_counter() - started:.3f}s',
+                                extra={'tariff_version': version, 'nbytes': self._matrices.nbytes})
+            return self._matrices
+
+    def replace(self, matrices: TariffMatrices) -> None:
+        """Adopts matrices mapped from the shared snapshot file, `get` serves them while their version is current."""
+        self._matrices = matrices
+
+    def invalidate(self) -> None:
+        self._matrices = None
+
+
+tariff_matrix_store = TariffMatrixStore()
@@ -0,0 +1,208 @@
+import math
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.logger import logger
+from app.database.models.route_cost import refresh_route_costs
+from app.services.tariff.changes import TariffChange, publish_tariff_change
+from app.services.tariff_import.exceptions import TariffValidationError
+from app.services.tariff_import.sources import DEFAULT_SOURCE_DIR, TARIFF_SOURCES, TableSource, TariffLookups
+from app.services.tariff_import.versioning import BULK_LOAD_SOURCE, record_tariff_version
+
+# the calculator only accepts whole prices above zero, so bands have to cover [1, ...)
+MIN_COVERED_PRICE = 1
+
+
+def band_problems(label: str, bands: Iterable[tuple[float, float]]) -> list[str]:
+    """Checks that price bands sorted by lower bound cover every whole price without overlapping."""
+    problems = []
+    covered_to = None
+    for band_min, band_max in bands:
+        if band_max < band_min:
+            problems.append(f'{label}: band {band_min}-{band_max} is inverted')
+        if covered_to is None:
+            if band_min > MIN_COVERED_PRICE:
+                problems.append(f'{label}: prices below {band_min} are not covered')
+        elif band_min < covered_to:
+            problems.append(f'{label}: band {band_min}-{band_max} overlaps a band ending at {covered_to}')
+        elif math.floor(covered_to) + 1 < band_min:
+            problems.append(f'{label}: prices between {covered_to} and {band_min} are not covered')
+        covered_to = band_max if covered_to is None else max(covered_to, band_max)
+    if covered_to is None:
+        problems.append(f'{label}: no bands')
+    return problems
+
+
+@dataclass
+class LoadReport:
+    rows: dict[str, int] = field(default_factory=dict)
+    skipped: dict[str, int] = field(default_factory=dict)
+    version: int | None = None
+    duration: float = 0.0
+
+
+class BulkTariffLoader:
+    """
+    Streams the tariff CSVs into temporary staging tables, validates them and replaces the live tables
+    in the same transaction, so readers see either the old tariffs or the new ones, never a mix.
+    Postgres stages through asyncpg COPY; SQLite (development) through batched inserts.
+    """
+    STAGING_PREFIX = 'staging_'
+
+    def __init__(self,
+                 engine: AsyncEngine,
+                 source_dir: Path = DEFAULT_SOURCE_DIR,
+                 chunk_size: int = 5000,
+                 sources: Sequence[TableSource] = TARIFF_SOURCES):
+        self.engine = engine
+        self.source_dir = Path(source_dir)
+        self.chunk_size = chunk_size
+        self.sources = list(sources)
+        self.is_postgres = engine.dialect.name == 'postgresql'
+        self._quote = engine.dialect.identifier_preparer.quote
+
+    def _staging(self, source: TableSource) -> str:
+        return self._quote(f'{self.STAGING_PREFIX}{source.name}')
+
+    async def load(self, dry_run: bool = False) -> LoadReport:
+        started = time.perf_counter()
+        report = LoadReport()
+        lookups = TariffLookups()
+
+        async with self.engine.connect() as conn:
+            try:
+                for source in self.sources:
+                    await self._create_staging(conn, source)
+                for source in self.sources:
+                    report.rows[source.name] = await self._stage(conn, source, lookups)
+                    logger.info(f'Staged {report.rows[source.name]} rows for {source.name}')
+                report.skipped = lookups.skipped
+
+                problems = lookups.unresolved + await self._validate(conn)
+                if problems:
+                    raise TariffValidationError(problems)
+
+                if dry_run:
+                    await conn.rollback()
+                else:
+                    await self._swap(conn)
+                    await conn.run_sync(refresh_route_costs)
+                    report.version = await record_tariff_version(conn, BULK_LOAD_SOURCE, {'rows': report.rows})
+                    await conn.commit()
+            except Exception:
+                await conn.rollback()
+                raise
+            finally:
+                if not self.is_postgres:
+                    await self._drop_staging(conn)
+
+        report.duration = time.perf_counter() - started
+        logger.info(f'Tariff load {"validated" if dry_run else "committed"} in {report.duration:.2f}s',
+                    extra={'rows': report.rows, 'skipped': report.skipped})
+        if report.version is not None:
+            # committed: every instance swaps to the new version now rather than on its next poll
+            await publish_tariff_change(TariffChange(report.version, BULK_LOAD_SOURCE))
+        return report
+
+    async def _create_staging(self, conn: AsyncConnection, source: TableSource) -> None:
+        table, staging = self._quote(source.name), self._staging(source)
+        if self.is_postgres:
+            # LIKE keeps the enum column types, so COPY validates labels the same way the live table does
+            await conn.execute(text(f'CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP'))
+        else:
+            await conn.execute(text(f'DROP TABLE IF EXISTS temp.{staging}'))
+            await conn.execute(text(f'CREATE TEMP TABLE {staging} AS SELECT * FROM {table} WHERE 0'))
+
+    async def _drop_staging(self, conn: AsyncConnection) -> None:
+        for source in self.sources:
+            await conn.execute(text(f'DROP TABLE IF EXISTS temp.{self._staging(source)}'))
+        await conn.commit()
+
+    async def _stage(self, conn: AsyncConnection, source: TableSource, lookups: TariffLookups) -> int:
+        columns = source.columns
+        staged = 0
+
+        if self.is_postgres:
+            raw_connection = await conn.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+            for chunk in source.iter_chunks(self.source_dir, lookups, self.chunk_size):
+                await driver_connection.copy_records_to_table(
+                    f'{self.STAGING_PREFIX}{source.name}',
+                    records=[tuple(row[column] for column in columns) for row in chunk],
+                    columns=columns,
+                )
+                staged += len(chunk)
+            return staged
+
+        statement = text(
+            f'INSERT INTO {self._staging(source)} ({", ".join(self._quote(c) for c in columns)}) '
+            f'VALUES ({", ".join(f":{c}" for c in columns)})'
+        )
+        for chunk in source.iter_chunks(self.source_dir, lookups, self.chunk_size):
+            await conn.execute(statement, chunk)
+            staged += len(chunk)
+        return staged
+
+    async def _validate(self, conn: AsyncConnection) -> list[str]:
+        problems = []
+        staged = {source.name: source for source in self.sources}
+
+        for source in self.sources:
+            for foreign_key in source.table.foreign_keys:
+                parent = staged.get(foreign_key.column.table.name)
+                if parent is None:
+                    continue
+                column, parent_column = self._quote(foreign_key.parent.name), self._quote(foreign_key.column.name)
+                orphans = await conn.scalar(text(
+                    f'SELECT count(*) FROM {self._staging(source)} AS child '
+                    f'LEFT JOIN {self._staging(parent)} AS parent ON child.{column} = parent.{parent_column} '
+                    f'WHERE parent.{parent_column} IS NULL'
+                ))
+                if orphans:
+                    problems.append(f'{source.name}.{foreign_key.parent.name}: {orphans} rows reference a missing '
+                                    f'{parent.name}.{foreign_key.column.name}')
+
+        if 'fee' in staged:
+            # a fee type without fee rows is not offered, only the bands that exist have to cover every price
+            result = await conn.execute(text(
+                f'SELECT fee_type_id, car_price_min, car_price_max FROM {self._staging(staged["fee"])} '
+                f'ORDER BY fee_type_id, car_price_min'
+            ))
+            bands: dict[int, list[tuple[float, float]]] = {}
+            for fee_type_id, band_min, band_max in result:
+                bands.setdefault(fee_type_id, []).append((band_min, band_max))
+            for fee_type_id, fee_type_bands in bands.items():
+                problems.extend(band_problems(f'fee_type {fee_type_id}', fee_type_bands))
+
+        if 'additional_fee' in staged:
+            for prefix in ('int_proxy', 'live_bid'):
+                result = await conn.execute(text(
+                    f'SELECT {prefix}_min, {prefix}_max FROM {self._staging(staged["additional_fee"])} '
+                    f'WHERE {prefix}_min IS NOT NULL AND {prefix}_max IS NOT NULL ORDER BY {prefix}_min'
+                ))
+                problems.extend(band_problems(f'additional_fee {prefix}', result.tuples()))
+
+        return problems
+
+    async def _swap(self, conn: AsyncConnection) -> None:
+        if self.is_postgres:
+            await conn.execute(text(f'TRUNCATE TABLE {", ".join(self._quote(s.name) for s in self.sources)}'))
+        else:
+            for source in reversed(self.sources):
+                await conn.execute(text(f'DELETE FROM {self._quote(source.name)}'))
+
+        for source in self.sources:
+            columns = ', '.join(self._quote(column) for column in source.columns)
+            await conn.execute(text(
+                f'INSERT INTO {self._quote(source.name)} ({columns}) SELECT {columns} FROM {self._staging(source)}'
+            ))
+            if self.is_postgres:
+                await conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{source.name}', 'id'), "
+                    f"coalesce(max(id), 1), max(id) IS NOT NULL) FROM {self._quote(source.name)}"
+                ))
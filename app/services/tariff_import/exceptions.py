@@ -0,0 +1,10 @@
+class TariffSourceError(Exception):
+    def __init__(self, message="Invalid tariff source"):
+        self.message = message
+        super().__init__(self.message)
+
+class TariffValidationError(Exception):
+    def __init__(self, problems: list[str], message="Tariff data failed validation"):
+        self.problems = problems
+        self.message = f"{message}: {'; '.join(problems)}"
+        super().__init__(self.message)
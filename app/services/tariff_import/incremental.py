@@ -0,0 +1,214 @@
+import time
+from dataclasses import dataclass, field
+from itertools import batched
+from pathlib import Path
+from typing import Any, Sequence
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.logger import logger
+from app.database.models import DeliveryPrice, Destination, Location, ShippingPrice, Terminal, VehicleType
+from app.database.models.route_cost import refresh_route_costs
+from app.services.tariff.changes import TariffChange, publish_tariff_change
+from app.services.tariff_import.exceptions import TariffValidationError
+from app.services.tariff_import.sources import DEFAULT_SOURCE_DIR, TableSource, TariffLookups, \
+    read_delivery_price_sheet, read_shipping_price_sheet
+from app.services.tariff_import.versioning import INCREMENTAL_IMPORT_SOURCE, record_tariff_version
+
+# changed natural keys stored per table in the tariff_version summary, enough for targeted cache invalidation
+CHANGED_KEYS_LIMIT = 1000
+
+RouteKey = tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class NaturalKeyTable:
+    source: TableSource
+    key_columns: tuple[str, ...]
+    value_columns: tuple[str, ...] = ('price',)
+
+    @property
+    def name(self) -> str:
+        return self.source.name
+
+
+INCREMENTAL_TABLES: list[NaturalKeyTable] = [
+    NaturalKeyTable(
+        TableSource(DeliveryPrice.__table__, 'prices_delivery.csv', read_delivery_price_sheet),
+        key_columns=('location_id', 'terminal_id', 'vehicle_type_id'),
+    ),
+    NaturalKeyTable(
+        TableSource(ShippingPrice.__table__, 'prices_shipping.csv', read_shipping_price_sheet),
+        key_columns=('terminal_id', 'destination_id', 'vehicle_type_id'),
+    ),
+]
+
+
+@dataclass
+class TableChangeset:
+    key_columns: tuple[str, ...]
+    inserted: list[dict[str, Any]] = field(default_factory=list)
+    updated: list[dict[str, Any]] = field(default_factory=list)
+    deleted_ids: list[int] = field(default_factory=list)
+    deleted_keys: list[RouteKey] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.inserted or self.updated or self.deleted_ids)
+
+    def summary(self) -> dict[str, Any]:
+        changed = [tuple(row[c] for c in self.key_columns) for row in self.inserted + self.updated]
+        changed.extend(self.deleted_keys)
+        return {
+            'inserted': len(self.inserted),
+            'updated': len(self.updated),
+            'deleted': len(self.deleted_ids),
+            'key': list(self.key_columns),
+            'changed': [list(key) for key in sorted(changed)[:CHANGED_KEYS_LIMIT]],
+            'truncated': len(changed) > CHANGED_KEYS_LIMIT,
+        }
+
+
+@dataclass
+class ImportReport:
+    changes: dict[str, dict[str, Any]] = field(default_factory=dict)
+    version: int | None = None
+    duration: float = 0.0
+
+
+class IncrementalTariffImporter:
+    """
+    Diffs carrier price sheets against the current price rows by natural key and writes only the difference:
+    one bulk upsert for new and changed prices, one delete for routes missing from the sheet.
+    Every applied changeset is recorded as a new tariff_version with the changed keys in its summary.
+    """
+
+    def __init__(self,
+                 engine: AsyncEngine,
+                 source_dir: Path = DEFAULT_SOURCE_DIR,
+                 tables: Sequence[NaturalKeyTable] = INCREMENTAL_TABLES,
+                 delete_missing: bool = True,
+                 chunk_size: int = 5000):
+        self.engine = engine
+        self.source_dir = Path(source_dir)
+        self.tables = list(tables)
+        self.delete_missing = delete_missing
+        self.chunk_size = chunk_size
+        self.is_postgres = engine.dialect.name == 'postgresql'
+
+    async def run(self, dry_run: bool = False) -> ImportReport:
+        started = time.perf_counter()
+        report = ImportReport()
+
+        async with self.engine.connect() as conn:
+            try:
+                lookups = await self._load_lookups(conn)
+                changesets = {}
+                problems = []
+                for table in self.tables:
+                    incoming = self._read_incoming(table, lookups, problems)
+                    current = await self._read_current(conn, table)
+                    changesets[table.name] = self._diff(table, current, incoming)
+                    report.changes[table.name] = changesets[table.name].summary()
+
+                problems = lookups.unresolved + problems
+                if problems:
+                    raise TariffValidationError(problems)
+
+                if dry_run or not any(changesets.values()):
+                    await conn.rollback()
+                else:
+                    for table in self.tables:
+                        await self._apply(conn, table, changesets[table.name])
+                    await conn.run_sync(refresh_route_costs)
+                    report.version = await record_tariff_version(conn, INCREMENTAL_IMPORT_SOURCE, report.changes)
+                    await conn.commit()
+            except Exception:
+                await conn.rollback()
+                raise
+
+        report.duration = time.perf_counter() - started
+        counts = {name: {k: v for k, v in change.items() if k in ('inserted', 'updated', 'deleted')}
+                  for name, change in report.changes.items()}
+        logger.info(f'Incremental tariff import finished in {report.duration:.2f}s, version {report.version}',
+                    extra={'changes': counts, 'dry_run': dry_run})
+        if report.version is not None:
+            # committed: every instance swaps to the new version now rather than on its next poll
+            await publish_tariff_change(TariffChange(report.version, INCREMENTAL_IMPORT_SOURCE))
+        return report
+
+    @staticmethod
+    async def _load_lookups(conn: AsyncConnection) -> TariffLookups:
+        lookups = TariffLookups()
+        for model in (Location, Terminal, Destination):
+            for row in (await conn.execute(select(model.id, model.name))).mappings():
+                lookups.observe(model.__tablename__, row)
+        result = await conn.execute(
+            select(VehicleType.id, VehicleType.auction, VehicleType.vehicle_type, VehicleType.specific_type)
+            .order_by(VehicleType.id)
+        )
+        for row in result.mappings():
+            lookups.observe(VehicleType.__tablename__, {
+                'id': row['id'],
+                'auction': row['auction'].name if row['auction'] else None,
+                'vehicle_type': row['vehicle_type'].name if row['vehicle_type'] else None,
+                'specific_type': row['specific_type'],
+            })
+        return lookups
+
+    def _read_incoming(self, table: NaturalKeyTable, lookups: TariffLookups,
+                       problems: list[str]) -> dict[RouteKey, dict[str, Any]]:
+        incoming = {}
+        for chunk in table.source.iter_chunks(self.source_dir, lookups, self.chunk_size):
+            for row in chunk:
+                key = tuple(row[c] for c in table.key_columns)
+                values = {c: row[c] for c in table.value_columns}
+                if key in incoming and incoming[key] != values:
+                    problems.append(f'{table.name}: conflicting prices for {dict(zip(table.key_columns, key))}')
+                incoming[key] = values
+        return incoming
+
+    @staticmethod
+    async def _read_current(conn: AsyncConnection, table: NaturalKeyTable) -> dict[RouteKey, dict[str, Any]]:
+        columns = table.source.table.c
+        result = await conn.execute(
+            select(columns.id, *(columns[c] for c in table.key_columns), *(columns[c] for c in table.value_columns))
+        )
+        return {tuple(row[c] for c in table.key_columns): dict(row) for row in result.mappings()}
+
+    def _diff(self, table: NaturalKeyTable, current: dict[RouteKey, dict[str, Any]],
+              incoming: dict[RouteKey, dict[str, Any]]) -> TableChangeset:
+        changeset = TableChangeset(key_columns=table.key_columns)
+        for key, values in incoming.items():
+            row = {**dict(zip(table.key_columns, key)), **values}
+            existing = current.get(key)
+            if existing is None:
+                changeset.inserted.append(row)
+            elif any(existing[c] != values[c] for c in table.value_columns):
+                changeset.updated.append(row)
+        if self.delete_missing:
+            for key, existing in current.items():
+                if key not in incoming:
+                    changeset.deleted_ids.append(existing['id'])
+                    changeset.deleted_keys.append(key)
+        return changeset
+
+    async def _apply(self, conn: AsyncConnection, table: NaturalKeyTable, changeset: TableChangeset) -> None:
+        sql_table = table.source.table
+        upserts = changeset.inserted + changeset.updated
+        if upserts:
+            if self.is_postgres:
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+            statement = insert(sql_table)
+            statement = statement.on_conflict_do_update(
+                index_elements=list(table.key_columns),
+                set_={c: statement.excluded[c] for c in table.value_columns},
+            )
+            for chunk in batched(upserts, self.chunk_size):
+                await conn.execute(statement, list(chunk))
+
+        # stays well below the SQLite bound parameter limit
+        for chunk in batched(changeset.deleted_ids, 500):
+            await conn.execute(delete(sql_table).where(sql_table.c.id.in_(chunk)))
@@ -0,0 +1,248 @@
+import csv
+from dataclasses import dataclass, field
+from itertools import batched
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from sqlalchemy import Boolean, Enum, Float, Integer, Table
+
+from app.core.utils import BASE_DIR
+from app.database.models import AdditionalFee, AdditionalSpecialFee, DeliveryPrice, Destination, Fee, FeeType, \
+    Location, ShippingPrice, Terminal, VehicleType
+from app.services.tariff_import.exceptions import TariffSourceError
+
+DEFAULT_SOURCE_DIR = BASE_DIR / 'scripts' / 'src'
+
+# auction names used in carrier price sheets -> AuctionEnum names
+AUCTION_ALIASES = {
+    'COPART': 'COPART',
+    'IAA': 'IAAI',
+    'IAAI': 'IAAI',
+}
+# price sheet column -> VehicleTypeEnum name
+DELIVERY_PRICE_COLUMNS = {
+    'Car fee': 'CAR',
+    'Motorcycle fee': 'MOTO',
+}
+SHIPPING_PRICE_COLUMNS = {
+    'car_price': 'CAR',
+    'moto_price': 'MOTO',
+}
+
+SourceRow = tuple[int, dict[str, Any]]
+
+
+@dataclass
+class TariffLookups:
+    """Name -> id maps collected while parent tables stream past, used to resolve price sheets."""
+    locations: dict[str, int] = field(default_factory=dict)
+    terminals: dict[str, int] = field(default_factory=dict)
+    destinations: dict[str, int] = field(default_factory=dict)
+    vehicle_types: dict[tuple[str, str], int] = field(default_factory=dict)
+    unresolved: list[str] = field(default_factory=list)
+    skipped: dict[str, int] = field(default_factory=dict)
+
+    def observe(self, table_name: str, row: dict[str, Any]) -> None:
+        if table_name == Location.__tablename__:
+            self.locations[row['name']] = row['id']
+        elif table_name == Terminal.__tablename__:
+            self.terminals[row['name']] = row['id']
+        elif table_name == Destination.__tablename__:
+            self.destinations[row['name']] = row['id']
+        elif table_name == VehicleType.__tablename__ and row['specific_type'] is None:
+            self.vehicle_types.setdefault((row['auction'], row['vehicle_type']), row['id'])
+
+    def skip(self, reason: str) -> None:
+        self.skipped[reason] = self.skipped.get(reason, 0) + 1
+
+
+class RowCoercer:
+    """Converts raw CSV strings into values matching the target table's column types."""
+
+    def __init__(self, table: Table):
+        self.table = table
+        self.columns = [column.name for column in table.columns]
+        self._converters = {column.name: self._converter(column) for column in table.columns}
+        self._nullable = {column.name: column.nullable for column in table.columns}
+
+    @staticmethod
+    def _converter(column) -> Callable[[Any], Any]:
+        column_type = column.type
+        if isinstance(column_type, Enum):
+            allowed = set(column_type.enums)
+
+            def to_enum(value: Any) -> str:
+                value = getattr(value, 'name', value)
+                if value not in allowed:
+                    raise ValueError(f'{value!r} is not one of {sorted(allowed)}')
+                return value
+            return to_enum
+        if isinstance(column_type, Boolean):
+            def to_bool(value: Any) -> bool:
+                if isinstance(value, bool):
+                    return value
+                normalized = str(value).strip().lower()
+                if normalized in ('1', 'true', 't', 'yes'):
+                    return True
+                if normalized in ('0', 'false', 'f', 'no'):
+                    return False
+                raise ValueError(f'{value!r} is not a boolean')
+            return to_bool
+        if isinstance(column_type, Integer):
+            def to_int(value: Any) -> int:
+                try:
+                    return int(value)
+                except ValueError:
+                    try:
+                        number = float(value)
+                    except ValueError:
+                        number = None
+                    if number is None or not number.is_integer():
+                        raise ValueError(f'{value!r} is not an integer')
+                    return int(number)
+            return to_int
+        if isinstance(column_type, Float):
+            return float
+        return str
+
+    def __call__(self, raw: dict[str, Any], source: str, line: int) -> dict[str, Any]:
+        row = {}
+        for name in self.columns:
+            if name not in raw:
+                raise TariffSourceError(f'{source}: column {name!r} is missing')
+            value = raw[name]
+            if isinstance(value, str):
+                value = value.strip()
+            if value is None or value == '':
+                if not self._nullable[name]:
+                    raise TariffSourceError(f'{source}:{line}: column {name!r} must not be empty')
+                row[name] = None
+                continue
+            try:
+                row[name] = self._converters[name](value)
+            except ValueError as e:
+                raise TariffSourceError(f'{source}:{line}: column {name!r}: {e}') from e
+        return row
+
+
+def read_table_csv(path: Path, _: TariffLookups) -> Iterator[SourceRow]:
+    """Plain table dump: one CSV column per table column, ids included."""
+    with path.open(newline='', encoding='utf-8') as file:
+        reader = csv.DictReader(file)
+        for raw in reader:
+            yield reader.line_num, raw
+
+
+def read_delivery_price_sheet(path: Path, lookups: TariffLookups) -> Iterator[SourceRow]:
+    """Carrier sheet `Auction,Branch,Yard,Car fee,Motorcycle fee` -> one delivery_price row per vehicle type."""
+    next_id = 1
+    with path.open(newline='', encoding='utf-8') as file:
+        reader = csv.DictReader(file)
+        for raw in reader:
+            auction = AUCTION_ALIASES.get(raw['Auction'].strip().upper())
+            if auction is None:
+                lookups.skip(f"auction {raw['Auction'].strip()!r}")
+                continue
+
+            branch, yard = raw['Branch'].strip(), raw['Yard'].strip()
+            location_id = lookups.locations.get(branch)
+            terminal_id = lookups.terminals.get(yard)
+            if location_id is None:
+                lookups.unresolved.append(f'{path.name}:{reader.line_num}: unknown location {branch!r}')
+            if terminal_id is None:
+                lookups.unresolved.append(f'{path.name}:{reader.line_num}: unknown terminal {yard!r}')
+            if location_id is None or terminal_id is None:
+                continue
+
+            for column, vehicle_type in DELIVERY_PRICE_COLUMNS.items():
+                vehicle_type_id = lookups.vehicle_types.get((auction, vehicle_type))
+                if vehicle_type_id is None:
+                    lookups.unresolved.append(
+                        f'{path.name}:{reader.line_num}: no vehicle type for {auction} {vehicle_type}'
+                    )
+                    continue
+                yield reader.line_num, {
+                    'id': next_id,
+                    'location_id': location_id,
+                    'terminal_id': terminal_id,
+                    'vehicle_type_id': vehicle_type_id,
+                    'price': raw[column],
+                }
+                next_id += 1
+
+
+def read_shipping_price_sheet(path: Path, lookups: TariffLookups) -> Iterator[SourceRow]:
+    """Carrier sheet `terminal,destination,car_price,moto_price` -> one shipping_price row per vehicle type."""
+    next_id = 1
+    with path.open(newline='', encoding='utf-8') as file:
+        reader = csv.DictReader(file)
+        for raw in reader:
+            terminal, destination = raw['terminal'].strip(), raw['destination'].strip()
+            terminal_id = lookups.terminals.get(terminal)
+            destination_id = lookups.destinations.get(destination)
+            if terminal_id is None:
+                lookups.unresolved.append(f'{path.name}:{reader.line_num}: unknown terminal {terminal!r}')
+            if destination_id is None:
+                lookups.unresolved.append(f'{path.name}:{reader.line_num}: unknown destination {destination!r}')
+            if terminal_id is None or destination_id is None:
+                continue
+
+            # ocean freight does not depend on the auction, so every auction's vehicle type gets the same price
+            for column, vehicle_type in SHIPPING_PRICE_COLUMNS.items():
+                for (_, known_vehicle_type), vehicle_type_id in sorted(lookups.vehicle_types.items()):
+                    if known_vehicle_type != vehicle_type:
+                        continue
+                    yield reader.line_num, {
+                        'id': next_id,
+                        'terminal_id': terminal_id,
+                        'destination_id': destination_id,
+                        'vehicle_type_id': vehicle_type_id,
+                        'price': raw[column],
+                    }
+                    next_id += 1
+
+
+@dataclass(frozen=True)
+class TableSource:
+    table: Table
+    filename: str
+    reader: Callable[[Path, TariffLookups], Iterator[SourceRow]] = read_table_csv
+
+    @property
+    def name(self) -> str:
+        return self.table.name
+
+    @property
+    def columns(self) -> list[str]:
+        return [column.name for column in self.table.columns]
+
+    def iter_chunks(self, source_dir: Path, lookups: TariffLookups, chunk_size: int) -> Iterator[list[dict[str, Any]]]:
+        path = source_dir / self.filename
+        if not path.is_file():
+            raise TariffSourceError(f'Source file {path} for table {self.name} does not exist')
+
+        coercer = RowCoercer(self.table)
+
+        def rows() -> Iterator[dict[str, Any]]:
+            for line, raw in self.reader(path, lookups):
+                row = coercer(raw, self.filename, line)
+                lookups.observe(self.name, row)
+                yield row
+
+        for chunk in batched(rows(), chunk_size):
+            yield list(chunk)
+
+
+# parents first: price sheets are resolved against the names collected from earlier tables
+TARIFF_SOURCES: list[TableSource] = [
+    TableSource(Destination.__table__, 'destination.csv'),
+    TableSource(Location.__table__, 'location.csv'),
+    TableSource(Terminal.__table__, 'terminal.csv'),
+    TableSource(VehicleType.__table__, 'vehicle_type.csv'),
+    TableSource(FeeType.__table__, 'fee_type.csv'),
+    TableSource(Fee.__table__, 'fee.csv'),
+    TableSource(AdditionalFee.__table__, 'additional_fee.csv'),
+    TableSource(AdditionalSpecialFee.__table__, 'additional_special_fee.csv'),
+    TableSource(DeliveryPrice.__table__, 'prices_delivery.csv', read_delivery_price_sheet),
+    TableSource(ShippingPrice.__table__, 'shipping_price.csv'),
+]
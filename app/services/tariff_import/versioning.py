@@ -0,0 +1,21 @@
+from datetime import datetime, UTC
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.logger import logger
+from app.database.models import TariffVersion
+
+BULK_LOAD_SOURCE = 'bulk_load'
+INCREMENTAL_IMPORT_SOURCE = 'incremental_import'
+
+
+async def record_tariff_version(conn: AsyncConnection, source: str, summary: dict[str, Any] | None = None) -> int:
+    """Adds a tariff_version row inside the writer's transaction and returns the new version number."""
+    result = await conn.execute(
+        insert(TariffVersion).values(source=source, summary=summary, created_at=datetime.now(UTC))
+    )
+    version = result.inserted_primary_key[0]
+    logger.info(f'Tariff version {version} recorded by {source}', extra={'tariff_version': version})
+    return version
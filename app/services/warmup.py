@@ -0,0 +1,149 @@
+import asyncio
+import csv
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Awaitable, Callable, Iterator
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.core.logger import logger
+from app.core.metrics import WARMUP_SECONDS
+from app.core.readiness import Readiness, readiness
+from app.core.utils import BASE_DIR
+from app.database.crud.exchange_rate import ExchangeRateService
+from app.database.db.pool import pool_limits
+from app.database.db.session import AsyncSessionLocal
+from app.rpc_client.auction_api import get_auction_api
+from app.schemas.calculator import CalculatorDataIn
+from app.services.calculator.bulk import OPTIONAL_COLUMNS, REQUIRED_COLUMNS
+from app.services.calculator.bundle import TariffBundle, calculator_bundle
+from app.services.calculator.prewarm import warm_quotes
+from app.services.calculator.snapshot import TariffSnapshotFile, tariff_snapshot_file
+from app.services.calculator.stale import stale_quotes
+from app.services.tariff.store import TariffMatrixStore, tariff_matrix_store
+
+
+@contextmanager
+def warmup_step(state: Readiness, name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        state.steps[name] = round(elapsed, 4)
+        WARMUP_SECONDS.labels(name).set(elapsed)
+
+
+async def retry_step(state: Readiness, name: str, step: Callable[[], Awaitable[None]],
+                     errors: tuple[type[Exception], ...] = (Exception,)) -> bool:
+    """
+    Runs a step warm-up cannot do without until it succeeds, at most WARMUP_MAX_ATTEMPTS times. False when
+    every attempt failed: `state` is marked failed and keeps the last error for /ready.
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            with warmup_step(state, name):
+                await step()
+            return True
+        except errors as e:
+            state.error = f'{name}: {e}'
+            if settings.WARMUP_MAX_ATTEMPTS and attempt >= settings.WARMUP_MAX_ATTEMPTS:
+                state.failed = True
+                logger.error(f'Warm-up gave up on {name} after {attempt} attempts', exc_info=e)
+                return False
+            logger.warning(f'Warm-up step {name} failed, retrying in {settings.WARMUP_RETRY_SECONDS}s', exc_info=e)
+            await asyncio.sleep(settings.WARMUP_RETRY_SECONDS)
+
+
+async def open_pool_connections(session_factory: async_sessionmaker[AsyncSession], count: int) -> None:
+    """Checks out `count` connections at once and returns them, so the pool holds that many open ones."""
+    sessions = [session_factory() for _ in range(count)]
+    try:
+        await asyncio.gather(*(session.connection() for session in sessions))
+    finally:
+        for session in sessions:
+            await session.close()
+
+
+def read_warmup_inputs(path: Path, limit: int) -> list[CalculatorDataIn]:
+    """Calculator inputs from a CSV with the columns of a bulk quote file; invalid rows are skipped."""
+    inputs = []
+    with path.open(newline='', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            try:
+                inputs.append(CalculatorDataIn(**{column: row.get(column) or None
+                                                  for column in REQUIRED_COLUMNS + OPTIONAL_COLUMNS}))
+            except ValidationError:
+                continue
+            if len(inputs) >= limit:
+                break
+    return inputs
+
+
+async def map_bundle(bundle: TariffBundle, state: Readiness) -> None:
+    """Bundle mode has no database to wait for, mapping the bundle is the whole warm-up."""
+    async def map_snapshot() -> None:
+        bundle.snapshot()
+
+    if not await retry_step(state, 'bundle', map_snapshot, errors=(OSError,)):
+        return
+    state.ready = True
+    version = bundle.snapshot().matrices.version
+    logger.info(f'Tariff bundle for version {version} mapped', extra={'tariff_version': version, 'steps': state.steps})
+
+
+async def warm_up(state: Readiness = readiness,
+                  session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+                  store: TariffMatrixStore = tariff_matrix_store,
+                  snapshot_file: TariffSnapshotFile | None = tariff_snapshot_file) -> None:
+    """
+    Opens the database pool and loads the exchange rate and tariff matrices, retrying until the database
+    answers or WARMUP_MAX_ATTEMPTS run out, then connects the Auction API and prewarms the quote cache.
+    Only the database is required, the other steps log their failure and the worker becomes ready anyway.
+    Until the database answers, stale quotes can come from the tariff snapshot file another worker wrote.
+    """
+    if calculator_bundle is not None:
+        return await map_bundle(calculator_bundle, state)
+    started = time.perf_counter()
+    if snapshot_file is not None and (snapshot := snapshot_file.read()) is not None:
+        # another worker's snapshot answers stale quotes while the database is unreachable
+        stale_quotes.remember_snapshot(snapshot, age=time.time() - snapshot_file.written_at)
+
+    async def connect_database() -> None:
+        pool_size, _ = pool_limits()
+        await open_pool_connections(session_factory, pool_size)
+        async with session_factory() as session:
+            await ExchangeRateService(session).get_last_rate()
+
+    if not await retry_step(state, 'database', connect_database):
+        return
+
+    try:
+        with warmup_step(state, 'auction_api'):
+            await asyncio.wait_for(get_auction_api(), timeout=settings.WARMUP_RPC_TIMEOUT)
+    except Exception as e:
+        state.error = f'auction_api: {e!r}'
+        logger.warning('Warm-up could not connect the Auction API', exc_info=e)
+
+    try:
+        with warmup_step(state, 'quotes'):
+            inputs = (read_warmup_inputs(BASE_DIR / settings.WARMUP_QUOTES_FILE, settings.WARMUP_QUOTES_LIMIT)
+                      if settings.WARMUP_QUOTES_FILE else [])
+            # also builds the tariff matrices the price list serves from
+            warmed = await warm_quotes(inputs, session_factory=session_factory, store=store,
+                                       snapshot_file=snapshot_file)
+        logger.info(f'Prewarmed {warmed} of {len(inputs)} quotes', extra={'warmed': warmed})
+    except Exception as e:
+        state.error = f'quotes: {e!r}'
+        logger.warning('Warm-up could not prewarm quotes', exc_info=e)
+
+    elapsed = time.perf_counter() - started
+    WARMUP_SECONDS.labels('total').set(elapsed)
+    state.steps['total'] = round(elapsed, 4)
+    state.ready = True
+    logger.info(f'Warm-up finished in {elapsed:.3f}s', extra={'steps': state.steps})
@@ -0,0 +1,47 @@
+import asyncio
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.config import settings
+from app.core.utils import BASE_DIR
+from app.database.models import Base
+from scripts.synthetic_tariffs import SyntheticTariffConfig, load_synthetic_tariffs, write_synthetic_tariffs
+
+# small is about today's tariff tables
+SCALES = {
+    'small': SyntheticTariffConfig(),
+    'medium': SyntheticTariffConfig().scaled(10),
+    'large': SyntheticTariffConfig().scaled(100),
+}
+
+
+async def build_sqlite(path: Path, config: SyntheticTariffConfig) -> AsyncEngine:
+    """A fresh SQLite database at `path`; route_cost is a plain table there, filled by the loader."""
+    path.unlink(missing_ok=True)
+    engine = create_async_engine(f'sqlite+aiosqlite:///{path}')
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await load_synthetic_tariffs(engine, write_synthetic_tariffs(path.parent / f'{path.stem}_csv', config))
+    return engine
+
+
+def postgres_url() -> str:
+    return (f'postgresql+asyncpg://{settings.DB_USER}:{settings.DB_PASS}@{settings.DB_HOST}:{settings.DB_PORT}/'
+            f'{settings.DB_NAME}')
+
+
+async def build_postgres(source_dir: Path, config: SyntheticTariffConfig) -> AsyncEngine:
+    """
+    Migrates the database named by the DB_* settings and replaces its tariffs. Point it at a scratch
+    database: the loader truncates every tariff table.
+    """
+    environment = {**os.environ, 'DEBUG': 'false'}
+    await asyncio.to_thread(subprocess.run, [sys.executable, '-m', 'alembic', 'upgrade', 'head'],
+                            cwd=BASE_DIR, env=environment, check=True)
+    engine = create_async_engine(postgres_url())
+    await load_synthetic_tariffs(engine, write_synthetic_tariffs(source_dir, config))
+    return engine
@@ -0,0 +1,88 @@
+import gc
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable
+
+# one call of the measured code; gets the call number so inputs can rotate
+Operation = Callable[[int], Awaitable[Any]]
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    ops: int
+    ops_per_second: float
+    p50_ms: float
+    p99_ms: float
+    mean_ms: float
+    alloc_kib_per_op: float  # net Python allocations left behind per call
+    alloc_peak_kib: float  # traced peak over the allocation pass
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def measure(name: str, operation: Operation, ops: int = 500, warmup: int = 50,
+                  alloc_ops: int = 50) -> BenchmarkResult:
+    """
+    Times `ops` sequential calls after `warmup` untimed ones, then repeats `alloc_ops` calls under
+    tracemalloc; tracing slows every allocation down, so it never runs during the timed pass.
+    """
+    for i in range(warmup):
+        await operation(i)
+
+    gc.collect()
+    latencies = []
+    started = time.perf_counter()
+    for i in range(ops):
+        call_started = time.perf_counter()
+        await operation(i)
+        latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for i in range(alloc_ops):
+            await operation(i)
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    return BenchmarkResult(
+        name=name,
+        ops=ops,
+        ops_per_second=round(ops / elapsed, 1),
+        p50_ms=round(percentile(latencies, 0.50) * 1000, 3),
+        p99_ms=round(percentile(latencies, 0.99) * 1000, 3),
+        mean_ms=round(statistics.fmean(latencies) * 1000, 3),
+        alloc_kib_per_op=round((after - before) / alloc_ops / 1024, 2),
+        alloc_peak_kib=round((peak - before) / 1024, 1),
+    )
+
+
+def compare(current: dict[str, dict[str, Any]], baseline: dict[str, dict[str, Any]],
+            tolerance: float) -> list[str]:
+    """Lines describing each benchmark against the baseline; regressions beyond `tolerance` start with '!'."""
+    lines = []
+    for key, result in current.items():
+        reference = baseline.get(key)
+        if reference is None:
+            lines.append(f'  {key}: no baseline')
+            continue
+        p50_change = result['p50_ms'] / reference['p50_ms'] - 1
+        ops_change = result['ops_per_second'] / reference['ops_per_second'] - 1
+        marker = '!' if p50_change > tolerance or ops_change < -tolerance else ' '
+        lines.append(f'{marker} {key}: p50 {reference["p50_ms"]:.3f} -> {result["p50_ms"]:.3f}ms ({p50_change:+.1%}), '
+                     f'{reference["ops_per_second"]:.0f} -> {result["ops_per_second"]:.0f} ops/s ({ops_change:+.1%})')
+    return lines
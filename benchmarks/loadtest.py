@@ -0,0 +1,230 @@
+"""
+Open-loop load test of GET /v1/public/calculator/{auction}/{lot_id} against a fake Auction API, run from
+the project root:
+
+    PYTHONPATH=.:app python -m benchmarks.loadtest --rps 200 --duration 30
+    PYTHONPATH=.:app python -m benchmarks.loadtest --rps 200 --rpc-latency-ms 80 --rpc-unavailable-rate 0.01
+
+Everything runs in this process: the FastAPI app on the synthetic SQLite tariffs of benchmarks/fixtures.py,
+a grpc.aio LotService from benchmarks/lot_service.py on a free localhost port, and the load generator.
+Requests start on schedule whether or not earlier ones have finished, and latency is measured from the
+scheduled start, so a stalled server shows up as latency instead of as a lower request rate.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.core.app_factory import create_app
+from app.core.logger import setup_logging
+from app.core.timing import record_stage
+from app.database.db.session import get_async_db
+from app.enums.auction import AuctionEnum
+from app.rpc_client.auction_api import close_auction_api
+from benchmarks.fixtures import SCALES, build_sqlite
+from benchmarks.harness import percentile
+from benchmarks.lot_service import FakeLotService, LotServiceBehaviour, lot_catalogue, start_lot_service
+from benchmarks.run import WORK_DIR
+from scripts.synthetic_tariffs import read_location_queries
+
+POOL_WAIT_STAGE = 'pool_wait'
+
+
+@dataclass(frozen=True)
+class LoadProfile:
+    rps: float = 100.0
+    duration: float = 30.0
+    poisson: bool = True  # exponential gaps between arrivals instead of a fixed interval
+    missing_lot_rate: float = 0.0  # requests for lot ids the catalogue does not have
+    max_in_flight: int = 5000  # arrivals beyond this are dropped and counted, not queued
+    seed: int = 0
+
+
+def load_test_app(session_factory: async_sessionmaker[AsyncSession]) -> FastAPI:
+    """
+    The application on `session_factory`; the dependency checks out its connection up front so the
+    time spent waiting for the pool is reported as its own Server-Timing stage.
+    """
+    @asynccontextmanager
+    async def lifespan(_: FastAPI):
+        yield
+
+    async def get_load_test_db():
+        async with session_factory() as session:
+            started = time.perf_counter()
+            await session.connection()
+            record_stage(POOL_WAIT_STAGE, time.perf_counter() - started)
+            yield session
+
+    app = create_app(lifespan_override=lifespan)
+    app.dependency_overrides[get_async_db] = get_load_test_db
+    return app
+
+
+def parse_server_timing(header: str) -> dict[str, float]:
+    """Stage durations in seconds from a `Server-Timing` header."""
+    durations = {}
+    for entry in header.split(','):
+        name, _, parameters = entry.strip().partition(';')
+        for parameter in parameters.split(';'):
+            key, _, value = parameter.partition('=')
+            if key.strip() == 'dur':
+                durations[name] = float(value) / 1000
+    return durations
+
+
+def distribution(values: list[float]) -> dict[str, float] | None:
+    """p50/p90/p99/p99.9/max of `values` in milliseconds."""
+    if not values:
+        return None
+    values = sorted(values)
+    summary = {f'p{q * 100:g}_ms': round(percentile(values, q) * 1000, 3) for q in (0.50, 0.90, 0.99, 0.999)}
+    summary['max_ms'] = round(values[-1] * 1000, 3)
+    return summary
+
+
+class LoadGenerator:
+    """Starts requests at the profile's rate for its duration and collects their results."""
+
+    def __init__(self, client: httpx.AsyncClient, lots: list[tuple[str, str]], profile: LoadProfile):
+        self.client = client
+        self.lots = lots
+        self.profile = profile
+        self.rng = random.Random(profile.seed)
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.stages: dict[str, list[float]] = defaultdict(list)
+        self.statuses: Counter[str] = Counter()
+        self.in_flight = 0
+        self.dropped = 0
+        self.schedule_lag = 0.0
+
+    def next_lot(self) -> tuple[str, str]:
+        if self.rng.random() < self.profile.missing_lot_rate:
+            return self.rng.choice(list(AuctionEnum)).value, str(self.rng.randrange(1, 1_000_000))
+        return self.rng.choice(self.lots)
+
+    async def request(self, scheduled: float, site: str, lot_id: str) -> None:
+        self.in_flight += 1
+        try:
+            response = await self.client.get(f'/v1/public/calculator/{site}/{lot_id}',
+                                             params={'price': self.rng.randrange(500, 60_000, 100)})
+            status = str(response.status_code)
+            for name, seconds in parse_server_timing(response.headers.get('server-timing', '')).items():
+                self.stages[name].append(seconds)
+        except Exception as e:
+            status = type(e).__name__
+        finally:
+            self.in_flight -= 1
+        self.statuses[status] += 1
+        self.latencies[status].append(time.perf_counter() - scheduled)
+
+    async def run(self) -> float:
+        """Runs the profile, returns the seconds until the last request finished."""
+        tasks = set()
+        started = time.perf_counter()
+        scheduled = started
+        end = started + self.profile.duration
+        while scheduled < end:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                self.schedule_lag = max(self.schedule_lag, -delay)
+            if self.in_flight >= self.profile.max_in_flight:
+                self.dropped += 1
+            else:
+                task = asyncio.create_task(self.request(scheduled, *self.next_lot()))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            gap = 1 / self.profile.rps
+            scheduled += self.rng.expovariate(1 / gap) if self.profile.poisson else gap
+        await asyncio.gather(*tasks)
+        return time.perf_counter() - started
+
+    def report(self, elapsed: float) -> dict[str, Any]:
+        completed = sum(self.statuses.values())
+        return {
+            'scheduled': completed + self.dropped,
+            'completed': completed,
+            'dropped': self.dropped,
+            'achieved_rps': round(completed / elapsed, 1),
+            'max_schedule_lag_ms': round(self.schedule_lag * 1000, 3),
+            'statuses': dict(self.statuses),
+            'latency': distribution([value for values in self.latencies.values() for value in values]),
+            'latency_by_status': {status: distribution(values) for status, values in self.latencies.items()},
+            'pool_wait': distribution(self.stages.pop(POOL_WAIT_STAGE, [])),
+            'rpc': distribution(self.stages.pop('rpc', [])),
+            'stages': {name: distribution(values) for name, values in self.stages.items()},
+        }
+
+
+async def run(scale: str, profile: LoadProfile, behaviour: LotServiceBehaviour, lots: int) -> dict[str, Any]:
+    WORK_DIR.mkdir(parents=True, exist_ok=True)
+    engine = await build_sqlite(WORK_DIR / f'loadtest_{scale}.sqlite', SCALES[scale])
+    locations = [query for query, _, _ in read_location_queries(WORK_DIR / f'loadtest_{scale}_csv')]
+    service = FakeLotService(lot_catalogue(locations, [auction.value for auction in AuctionEnum], lots,
+                                           seed=behaviour.seed), behaviour)
+    server, address = await start_lot_service(service)
+    rpc_api_url, settings.RPC_API_URL = settings.RPC_API_URL, address
+    try:
+        session_factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+        transport = httpx.ASGITransport(app=load_test_app(session_factory))
+        async with httpx.AsyncClient(transport=transport, base_url='http://loadtest', timeout=None) as client:
+            generator = LoadGenerator(client, list(service.catalogue), profile)
+            elapsed = await generator.run()
+        return {
+            'scale': scale,
+            'profile': asdict(profile),
+            'lot_service': {**asdict(behaviour), 'calls': asdict(service.calls)},
+            'pool': engine.pool.status(),
+            **generator.report(elapsed),
+        }
+    finally:
+        settings.RPC_API_URL = rpc_api_url
+        await close_auction_api()
+        await server.stop(grace=None)
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Load-test the lot calculator against a fake Auction API')
+    parser.add_argument('--scale', choices=list(SCALES), default='small')
+    parser.add_argument('--rps', type=float, default=100.0, help='target request rate')
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds to generate load for')
+    parser.add_argument('--fixed-interval', action='store_true', help='evenly spaced instead of Poisson arrivals')
+    parser.add_argument('--missing-lot-rate', type=float, default=0.0, help='requests for unknown lots')
+    parser.add_argument('--max-in-flight', type=int, default=5000)
+    parser.add_argument('--lots', type=int, default=10_000, help='catalogue size per auction')
+    parser.add_argument('--rpc-latency-ms', type=float, default=20.0)
+    parser.add_argument('--rpc-jitter-ms', type=float, default=10.0, help='mean of the exponential extra delay')
+    parser.add_argument('--rpc-unavailable-rate', type=float, default=0.0)
+    parser.add_argument('--rpc-internal-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=Path, help='write the report as JSON')
+    args = parser.parse_args()
+
+    # the endpoint logs every failed lot lookup, at load that is most of the time spent
+    setup_logging(settings.APP_NAME, 'loadtest', level='CRITICAL')
+    report = asyncio.run(run(
+        args.scale,
+        LoadProfile(rps=args.rps, duration=args.duration, poisson=not args.fixed_interval,
+                    missing_lot_rate=args.missing_lot_rate, max_in_flight=args.max_in_flight, seed=args.seed),
+        LotServiceBehaviour(latency_ms=args.rpc_latency_ms, jitter_ms=args.rpc_jitter_ms,
+                            unavailable_rate=args.rpc_unavailable_rate, internal_rate=args.rpc_internal_rate,
+                            seed=args.seed),
+        args.lots,
+    ))
+    print(json.dumps(report, indent=2))
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + '\n')
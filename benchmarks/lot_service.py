@@ -0,0 +1,88 @@
+import asyncio
+import random
+from dataclasses import dataclass, field
+
+import grpc
+
+import app.rpc_client.auction_api  # noqa: F401, puts the generated packages on sys.path
+from app.rpc_client.gen.python.auction.v1 import lot_pb2, lot_pb2_grpc
+
+
+@dataclass(frozen=True)
+class LotServiceBehaviour:
+    """
+    How the fake Auction API answers: every call waits `latency_ms` plus an exponentially distributed
+    `jitter_ms` on average, which gives the long tail a real service has. The error rates are fractions
+    of all calls and fail before the lot is looked up.
+    """
+    latency_ms: float = 20.0
+    jitter_ms: float = 10.0
+    unavailable_rate: float = 0.0
+    internal_rate: float = 0.0
+    seed: int = 0
+
+
+@dataclass
+class LotServiceCalls:
+    total: int = 0
+    found: int = 0
+    not_found: int = 0
+    unavailable: int = 0
+    internal: int = 0
+
+
+@dataclass
+class FakeLotService(lot_pb2_grpc.LotServiceServicer):
+    """LotService answering GetLotByVinOrLot from `catalogue`, keyed by (site, lot id)."""
+    catalogue: dict[tuple[str, str], lot_pb2.Lot]
+    behaviour: LotServiceBehaviour = field(default_factory=LotServiceBehaviour)
+    calls: LotServiceCalls = field(default_factory=LotServiceCalls)
+
+    def __post_init__(self):
+        self.rng = random.Random(self.behaviour.seed)
+
+    def delay(self) -> float:
+        jitter = self.rng.expovariate(1 / self.behaviour.jitter_ms) if self.behaviour.jitter_ms else 0.0
+        return (self.behaviour.latency_ms + jitter) / 1000
+
+    async def GetLotByVinOrLot(self, request: lot_pb2.GetLotByVinOrLotRequest,
+                               context: grpc.aio.ServicerContext) -> lot_pb2.GetLotByVinOrLotResponse:
+        self.calls.total += 1
+        await asyncio.sleep(self.delay())
+
+        draw = self.rng.random()
+        if draw < self.behaviour.unavailable_rate:
+            self.calls.unavailable += 1
+            await context.abort(grpc.StatusCode.UNAVAILABLE, 'fake: unavailable')
+        if draw < self.behaviour.unavailable_rate + self.behaviour.internal_rate:
+            self.calls.internal += 1
+            await context.abort(grpc.StatusCode.INTERNAL, 'fake: internal error')
+
+        lot = self.catalogue.get((request.site, request.vin_or_lot_id))
+        if lot is None:
+            self.calls.not_found += 1
+            await context.abort(grpc.StatusCode.NOT_FOUND, f'fake: no lot {request.vin_or_lot_id}')
+        self.calls.found += 1
+        return lot_pb2.GetLotByVinOrLotResponse(lot=[lot])
+
+
+def lot_catalogue(locations: list[str], sites: list[str], size: int,
+                  seed: int = 0) -> dict[tuple[str, str], lot_pb2.Lot]:
+    """`size` lots per site at random `locations`, one in five of them motorcycles."""
+    rng = random.Random(seed)
+    catalogue = {}
+    for site in sites:
+        for lot_id in range(10_000_000, 10_000_000 + size):
+            catalogue[(site, str(lot_id))] = lot_pb2.Lot(
+                lot_id=lot_id, vin=f'SYN{lot_id:014d}', location=rng.choice(locations),
+                vehicle_type='Motorcycle' if rng.random() < 0.2 else 'Automobile')
+    return catalogue
+
+
+async def start_lot_service(service: FakeLotService, host: str = '127.0.0.1') -> tuple[grpc.aio.Server, str]:
+    """Serves `service` on a free port of `host`; returns the started server and its address."""
+    server = grpc.aio.server()
+    lot_pb2_grpc.add_LotServiceServicer_to_server(service, server)
+    port = server.add_insecure_port(f'{host}:0')
+    await server.start()
+    return server, f'{host}:{port}'
@@ -0,0 +1,183 @@
+"""
+Benchmarks of the quote path on synthetic tariffs, run from the project root:
+
+    PYTHONPATH=.:app python -m benchmarks.run --scale small --scale medium
+    PYTHONPATH=.:app python -m benchmarks.run --compare benchmarks/baseline.json
+    PYTHONPATH=.:app python -m benchmarks.run --save-baseline benchmarks/baseline.json
+
+Tariffs and lot locations come from scripts/synthetic_tariffs.py. `--backend postgres` migrates and loads
+the database named by the DB_* settings, use a scratch database.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import sys
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Any
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.core.app_factory import create_app
+from app.core.logger import setup_logging
+from app.core.utils import BASE_DIR
+from app.database.crud.location import LocationService
+from app.database.db.session import get_async_db
+from app.database.models import VehicleType
+from app.enums.auction import AuctionEnum
+from app.enums.vehicle_type import VehicleTypeEnum
+from app.services.calculator.calculator_service import CalculatorService
+from app.services.calculator.quote_cache import quote_cache
+from benchmarks.fixtures import SCALES, build_postgres, build_sqlite
+from benchmarks.harness import BenchmarkResult, Operation, compare, measure
+from scripts.synthetic_tariffs import read_location_queries
+
+WORK_DIR = BASE_DIR / 'var' / 'benchmarks'
+BACKENDS = ('sqlite', 'postgres')
+
+
+@dataclass(frozen=True)
+class QuoteCase:
+    price: int
+    auction: AuctionEnum
+    location: str
+    vehicle_type: VehicleTypeEnum
+
+
+def quote_cases(source_dir: Path, count: int = 256, seed: int = 1) -> list[QuoteCase]:
+    """Lots spelled the way the generator's location queries are; names that match nothing are left out."""
+    rng = random.Random(seed)
+    locations = [query for query, location_id, _ in read_location_queries(source_dir) if location_id]
+    return [QuoteCase(price=rng.randrange(500, 60_000, 100),
+                      auction=rng.choice(list(AuctionEnum)),
+                      location=rng.choice(locations),
+                      vehicle_type=rng.choice(list(VehicleTypeEnum)))
+            for _ in range(count)]
+
+
+def benchmark_app(session_factory: async_sessionmaker[AsyncSession]) -> FastAPI:
+    @asynccontextmanager
+    async def lifespan(_: FastAPI):
+        yield
+
+    async def get_benchmark_db():
+        async with session_factory() as session:
+            yield session
+
+    # the endpoint is measured computing quotes, the cases repeat and would all be cache hits
+    quote_cache.max_size = 0
+    app = create_app(lifespan_override=lifespan)
+    app.dependency_overrides[get_async_db] = get_benchmark_db
+    return app
+
+
+async def run_scale(engine: AsyncEngine, source_dir: Path, ops: int) -> list[BenchmarkResult]:
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+    cases = quote_cases(source_dir)
+    async with session_factory() as session:
+        vehicle_types = {(row.auction, row.vehicle_type): row for row in (await session.execute(
+            select(VehicleType).where(VehicleType.specific_type.is_(None)))).scalars()}
+
+    def service(session: AsyncSession, case: QuoteCase) -> CalculatorService:
+        return CalculatorService(session, price=case.price, auction=case.auction, location=case.location,
+                                 vehicle_type=case.vehicle_type)
+
+    async def get_location(i: int) -> None:
+        case = cases[i % len(cases)]
+        async with session_factory() as session:
+            await LocationService(session).get_location(case.location,
+                                                        vehicle_types[(case.auction, case.vehicle_type)])
+
+    async def additional_fees(i: int) -> None:
+        async with session_factory() as session:
+            await service(session, cases[i % len(cases)]).additional_fees_calculator()
+
+    async def calculate(i: int) -> None:
+        async with session_factory() as session:
+            await service(session, cases[i % len(cases)]).calculate()
+
+    transport = httpx.ASGITransport(app=benchmark_app(session_factory))
+    async with httpx.AsyncClient(transport=transport, base_url='http://benchmark') as client:
+        async def calculator_endpoint(i: int) -> None:
+            case = cases[i % len(cases)]
+            response = await client.get('/v1/public/calculator', params={
+                'price': case.price, 'auction': case.auction.value, 'location': case.location,
+                'vehicle_type': case.vehicle_type.value,
+            })
+            response.raise_for_status()
+
+        operations: dict[str, Operation] = {
+            'location.get_location': get_location,
+            'calculator.additional_fees_calculator': additional_fees,
+            'calculator.calculate': calculate,
+            'GET /v1/public/calculator': calculator_endpoint,
+        }
+        return [await measure(name, operation, ops=ops) for name, operation in operations.items()]
+
+
+async def run(backends: list[str], scales: list[str], ops: int) -> dict[str, dict[str, Any]]:
+    results = {}
+    WORK_DIR.mkdir(parents=True, exist_ok=True)
+    for backend in backends:
+        for scale_name in scales:
+            if backend == 'sqlite':
+                source_dir = WORK_DIR / f'{scale_name}_csv'
+                engine = await build_sqlite(WORK_DIR / f'{scale_name}.sqlite', SCALES[scale_name])
+            else:
+                source_dir = WORK_DIR / f'postgres_{scale_name}_csv'
+                engine = await build_postgres(source_dir, SCALES[scale_name])
+            try:
+                for result in await run_scale(engine, source_dir, ops):
+                    results[f'{backend}/{scale_name}/{result.name}'] = result.as_dict()
+            finally:
+                await engine.dispose()
+    return results
+
+
+def environment() -> dict[str, Any]:
+    commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR, capture_output=True, text=True)
+    return {
+        'created_at': datetime.now(UTC).isoformat(timespec='seconds'),
+        'commit': commit.stdout.strip() or None,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'processor': platform.processor() or None,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the calculator on synthetic tariffs')
+    parser.add_argument('--backend', action='append', choices=BACKENDS, help='default: sqlite')
+    parser.add_argument('--scale', action='append', choices=list(SCALES), help='default: small')
+    parser.add_argument('--ops', type=int, default=500, help='timed calls per benchmark')
+    parser.add_argument('--compare', type=Path, help='baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.10, help='slowdown reported as a regression')
+    parser.add_argument('--save-baseline', type=Path, help='write the results as the new baseline')
+    args = parser.parse_args()
+
+    # per-request debug logs would be timed along with the requests and bury the results
+    setup_logging(settings.APP_NAME, 'benchmark', level='WARNING')
+    current = asyncio.run(run(args.backend or ['sqlite'], args.scale or ['small'], args.ops))
+    for key, result in current.items():
+        print(f'{key}: {result["ops_per_second"]:.0f} ops/s, p50 {result["p50_ms"]:.3f}ms, '
+              f'p99 {result["p99_ms"]:.3f}ms, {result["alloc_kib_per_op"]:.1f} KiB/op')
+
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps({'environment': environment(), 'results': current}, indent=2) + '\n')
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        lines = compare(current, baseline['results'], args.tolerance)
+        print(f'\nagainst {args.compare} ({baseline["environment"]["commit"]}, '
+              f'{baseline["environment"]["created_at"]}):')
+        print('\n'.join(lines))
+        if any(line.startswith('!') for line in lines):
+            sys.exit(1)
@@ -0,0 +1,113 @@
+import argparse
+import asyncio
+import csv
+import json
+import multiprocessing
+import os
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.logger import logger
+from app.database.db.session import engine_async
+from app.services.calculator.bulk import OPTIONAL_COLUMNS, QUOTE_COLUMNS, REQUIRED_COLUMNS, init_worker, \
+    missing_columns, quote_chunk, read_lots
+from app.services.calculator.snapshot import TariffSnapshot, load_current_snapshot
+
+
+async def load_snapshot(engine: AsyncEngine) -> TariffSnapshot:
+    try:
+        return await load_current_snapshot()
+    finally:
+        # no driver threads may be alive when the pool forks
+        await engine.dispose()
+
+
+class QuoteWriter:
+    def __init__(self, path: Path):
+        self.path = path
+        self.ndjson = path.suffix in ('.ndjson', '.jsonl')
+        self.file = path.open('w', newline='', encoding='utf-8')
+        self._csv: csv.DictWriter | None = None
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        if self.ndjson:
+            self.file.writelines(json.dumps(row, default=str) + '\n' for row in rows)
+            return
+        if self._csv is None:
+            input_columns = [column for column in rows[0] if column not in QUOTE_COLUMNS]
+            self._csv = csv.DictWriter(self.file, fieldnames=input_columns + list(QUOTE_COLUMNS),
+                                       extrasaction='ignore', lineterminator='\n')
+            self._csv.writeheader()
+        self._csv.writerows(rows)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def bulk_quote(input_path: Path, output_path: Path, workers: int, chunk_size: int) -> dict[str, Any]:
+    snapshot = asyncio.run(load_snapshot(engine_async))
+    writer = QuoteWriter(output_path)
+    full = writer.ndjson
+
+    rows = 0
+    errors: Counter[str] = Counter()
+    started = last_report = time.perf_counter()
+
+    def collect(future: Future) -> None:
+        nonlocal rows, last_report
+        quoted = future.result()
+        writer.write(quoted)
+        rows += len(quoted)
+        errors.update(row['error_type'] for row in quoted if row['error_type'])
+        now = time.perf_counter()
+        if now - last_report >= 5:
+            last_report = now
+            logger.info(f'Quoted {rows} rows, {rows / (now - started):.0f} rows/s, {errors.total()} errors')
+
+    # in-flight chunks are bounded, so memory does not grow with the input size; results keep input order
+    pending: deque[Future] = deque()
+    # fork: workers inherit the snapshot's arrays through copy-on-write memory instead of a pickle
+    context = multiprocessing.get_context('fork')
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=init_worker, initargs=(snapshot,)) as pool:
+            for chunk in read_lots(input_path, chunk_size):
+                missing = missing_columns(chunk[0]) if chunk else []
+                if missing:
+                    raise SystemExit(f'{input_path}: missing columns {", ".join(missing)}')
+                pending.append(pool.submit(quote_chunk, chunk, full))
+                if len(pending) >= workers * 2:
+                    collect(pending.popleft())
+            while pending:
+                collect(pending.popleft())
+    finally:
+        writer.close()
+
+    duration = time.perf_counter() - started
+    report = {
+        'rows': rows,
+        'quoted': rows - errors.total(),
+        'errors': dict(errors.most_common()),
+        'duration': round(duration, 2),
+        'rows_per_second': round(rows / duration) if duration else None,
+        'tariff_version': snapshot.matrices.version,
+    }
+    logger.info(f'Bulk quote of {rows} rows finished in {duration:.2f}s', extra=report)
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Quote a CSV/Parquet file of lots with the calculator, offline')
+    parser.add_argument('input', type=Path, help=f'CSV or Parquet with columns {", ".join(REQUIRED_COLUMNS)} '
+                                                 f'and optionally {", ".join(OPTIONAL_COLUMNS)}')
+    parser.add_argument('output', type=Path, help='.csv for the cheapest route per lot, .ndjson for full quotes')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    print(json.dumps(bulk_quote(args.input, args.output, args.workers, args.chunk_size), indent=2))
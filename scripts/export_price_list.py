@@ -0,0 +1,39 @@
+import argparse
+import asyncio
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.database.db.session import engine_async
+from app.enums.price_list import PriceListDatasetEnum, PriceListFormatEnum
+from app.services.tariff.price_list import stream_price_list
+from app.services.tariff.store import TariffMatrixStore
+
+
+async def export_price_list(engine: AsyncEngine, dataset: PriceListDatasetEnum, output_format: PriceListFormatEnum,
+                            output: Path, gzip: bool = False):
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+    try:
+        with output.open('wb') as file:
+            async for chunk in stream_price_list(dataset, output_format, gzip, session_factory,
+                                                 TariffMatrixStore(session_factory)):
+                file.write(chunk)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Write the full price list, same rows as the export endpoint')
+    parser.add_argument('dataset', choices=[dataset.value for dataset in PriceListDatasetEnum])
+    parser.add_argument('--format', dest='output_format', choices=[f.value for f in PriceListFormatEnum],
+                        default=PriceListFormatEnum.CSV.value)
+    # logs go to stdout, so the export is always written to a file
+    parser.add_argument('--output', type=Path, help='file to write, <dataset>.<format> by default; '
+                                                    'a .gz suffix implies --gzip')
+    parser.add_argument('--gzip', action='store_true')
+    args = parser.parse_args()
+
+    output = args.output or Path(f'{args.dataset}.{args.output_format}{".gz" if args.gzip else ""}')
+    gzip = args.gzip or output.suffix == '.gz'
+    asyncio.run(export_price_list(engine_async, PriceListDatasetEnum(args.dataset),
+                                  PriceListFormatEnum(args.output_format), output, gzip))
@@ -0,0 +1,33 @@
+import argparse
+import asyncio
+import json
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.database.db.session import engine_async
+from app.services.calculator.snapshot import TariffSnapshot, load_current_snapshot
+from app.services.tariff.store import TariffMatrixStore
+
+
+async def export_tariff_bundle(engine: AsyncEngine, output: Path) -> TariffSnapshot:
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+    try:
+        # from the database itself, not from the snapshot file the workers share
+        snapshot = await load_current_snapshot(session_factory, TariffMatrixStore(session_factory), file=None)
+    finally:
+        await engine.dispose()
+    snapshot.to_file(output)
+    return snapshot
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Write the current tariffs to a bundle the calculator quotes from '
+                                                 'without a database, see CALCULATOR_BUNDLE')
+    parser.add_argument('--output', type=Path, default=Path('tariff_bundle.bin'),
+                        help='replaced atomically, running calculators pick it up on their next request')
+    args = parser.parse_args()
+
+    bundle = asyncio.run(export_tariff_bundle(engine_async, args.output))
+    print(json.dumps({'output': str(args.output), 'version': bundle.matrices.version, 'rate_id': bundle.rate_id,
+                      'nbytes': args.output.stat().st_size}, indent=2))
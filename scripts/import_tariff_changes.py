@@ -0,0 +1,40 @@
+import argparse
+import asyncio
+import json
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.logger import logger
+from app.database.db.session import engine_async
+from app.services.tariff.changes import close_tariff_change_bus
+from app.services.tariff_import.exceptions import TariffSourceError, TariffValidationError
+from app.services.tariff_import.incremental import IncrementalTariffImporter
+from app.services.tariff_import.sources import DEFAULT_SOURCE_DIR
+
+
+async def import_changes(engine: AsyncEngine, source_dir: Path = DEFAULT_SOURCE_DIR, delete_missing: bool = True,
+                         dry_run: bool = False):
+    importer = IncrementalTariffImporter(engine, source_dir=source_dir, delete_missing=delete_missing)
+    try:
+        return await importer.run(dry_run=dry_run)
+    finally:
+        await close_tariff_change_bus()
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Apply changed delivery/shipping prices from carrier sheets')
+    parser.add_argument('--source-dir', type=Path, default=DEFAULT_SOURCE_DIR,
+                        help='directory with prices_delivery.csv and prices_shipping.csv')
+    parser.add_argument('--keep-missing', action='store_true',
+                        help='do not delete routes that are absent from the sheets')
+    parser.add_argument('--dry-run', action='store_true', help='print the changeset without writing it')
+    args = parser.parse_args()
+
+    try:
+        report = asyncio.run(import_changes(engine_async, args.source_dir, not args.keep_missing, args.dry_run))
+    except (TariffSourceError, TariffValidationError) as e:
+        logger.error(e.message)
+        raise SystemExit(1)
+    print(json.dumps({'version': report.version, 'changes': report.changes}, indent=2))
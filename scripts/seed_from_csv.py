@@ -1,34 +1,36 @@
-import pandas as pd
-from sqlalchemy import Engine
-from app.core.logger import logger
-from app.database.db.session import  engine
+import argparse
+import asyncio
+from pathlib import Path
 
+from sqlalchemy.ext.asyncio import AsyncEngine
 
-async def seed_fees(engine: Engine):
-    tabels = {
-        'destination': 'src/destination.csv',
-        'location': 'src/location.csv',
-        'terminal': 'src/terminal.csv',
-        'vehicle_type': 'src/vehicle_type.csv',
-        'fee_type': 'src/fee_type.csv',
-        'fee': 'src/fee.csv',
-        'additional_fee': 'src/additional_fee.csv',
-        'additional_special_fee': 'src/additional_special_fee.csv',
-        'delivery_price': 'src/prices_delivery.csv',
-        'shipping_price': 'src/prices_shipping.csv',
-    }
+from app.core.logger import logger
+from app.database.db.session import engine_async
+from app.services.tariff.changes import close_tariff_change_bus
+from app.services.tariff_import.bulk_loader import BulkTariffLoader
+from app.services.tariff_import.exceptions import TariffSourceError, TariffValidationError
+from app.services.tariff_import.sources import DEFAULT_SOURCE_DIR
 
-    for table, path in tabels.items():
-        logger.info(f'Seeding table {table} from {path}')
-        df = pd.read_csv(path)
-        df.to_sql(table, engine, if_exists='replace', index=False)
 
+async def seed_fees(engine: AsyncEngine, source_dir: Path = DEFAULT_SOURCE_DIR, chunk_size: int = 5000,
+                    dry_run: bool = False):
+    loader = BulkTariffLoader(engine, source_dir=source_dir, chunk_size=chunk_size)
+    try:
+        return await loader.load(dry_run=dry_run)
+    finally:
+        await close_tariff_change_bus()
+        await engine.dispose()
 
 
 if __name__ == '__main__':
-    import asyncio
-    asyncio.run(seed_fees(engine))
-
-
-
-
+    parser = argparse.ArgumentParser(description='Replace all tariff tables from CSV files in one transaction')
+    parser.add_argument('--source-dir', type=Path, default=DEFAULT_SOURCE_DIR)
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--dry-run', action='store_true', help='stage and validate only, keep the live tables')
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(seed_fees(engine_async, args.source_dir, args.chunk_size, args.dry_run))
+    except (TariffSourceError, TariffValidationError) as e:
+        logger.error(e.message)
+        raise SystemExit(1)
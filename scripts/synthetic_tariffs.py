@@ -0,0 +1,359 @@
+import argparse
+import asyncio
+import csv
+import json
+import math
+import random
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Any, Iterable
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.logger import logger
+from app.database.db.session import engine_async
+from app.database.models import ExchangeRate
+from app.enums.auction import AuctionEnum
+from app.enums.fee_type import FeeTypeEnum
+from app.enums.vehicle_type import VehicleTypeEnum
+from app.services.tariff.changes import close_tariff_change_bus
+from app.services.tariff_import.bulk_loader import BulkTariffLoader, LoadReport
+from app.services.tariff_import.exceptions import TariffSourceError, TariffValidationError
+
+STATES = ('AL', 'AR', 'AZ', 'CA', 'CO', 'CT', 'FL', 'GA', 'IA', 'ID', 'IL', 'IN', 'KS', 'KY', 'LA', 'MA', 'MD',
+          'MI', 'MN', 'MO', 'MS', 'NC', 'NE', 'NJ', 'NM', 'NV', 'NY', 'OH', 'OK', 'OR', 'PA', 'SC', 'TN', 'TX',
+          'UT', 'VA', 'WA', 'WI')
+CITY_STEMS = ('Ash', 'Bay', 'Bridge', 'Cedar', 'Clear', 'Elm', 'Fair', 'Glen', 'Green', 'Hill', 'Lake', 'Maple',
+              'Mill', 'Oak', 'Pine', 'Port', 'Red', 'River', 'Rock', 'Salt', 'Silver', 'Spring', 'Stone', 'Sun',
+              'West', 'White', 'Wood')
+CITY_ENDINGS = ('field', 'ville', 'ton', 'wood', 'dale', 'port', 'burg', 'view', 'land', ' City', ' Springs',
+                ' Heights', ' Falls')
+DIRECTIONS = ('North', 'South', 'East', 'West')
+PORTS = ('Klaipeda', 'Rotterdam', 'Bremerhaven', 'Antwerp', 'Gdansk', 'Hamburg', 'Riga', 'Tallinn', 'Gothenburg',
+         'Le Havre', 'Valencia', 'Genoa', 'Piraeus', 'Constanta', 'Koper', 'Southampton', 'Zeebrugge', 'Aarhus',
+         'Helsinki', 'Szczecin')
+SPECIAL_FEES = ('Environmental Fee', 'Service Fee', 'Title Fee', 'Gate Fee', 'Storage Fee')
+# how carrier price sheets spell the auctions, see AUCTION_ALIASES
+SHEET_AUCTIONS = {AuctionEnum.COPART: 'Copart', AuctionEnum.IAAI: 'IAA'}
+MAX_PRICE = 200_000
+COUNT_FIELDS = ('locations', 'terminals', 'destinations', 'fee_bands', 'additional_fee_bands', 'special_fees',
+                'terminals_per_location', 'location_queries', 'overlapping_bands')
+
+
+@dataclass(frozen=True)
+class SyntheticTariffConfig:
+    """Table sizes of a generated tariff; the defaults are about the size of scripts/src."""
+    locations: int = 550
+    terminals: int = 10
+    destinations: int = 4
+    fee_bands: int = 35  # per fee type
+    additional_fee_bands: int = 9
+    special_fees: int = 3  # per auction
+    terminals_per_location: int = 3
+    location_queries: int = 1000
+    name_noise: float = 0.3  # share of location names in the messy auction spellings
+    touching_bands: float = 0.1  # share of bands ending exactly where the next one starts
+    overlapping_bands: int = 0  # fee bands overlapping their neighbour; the loader rejects those
+    seed: int = 0
+
+    def scaled(self, factor: float) -> 'SyntheticTariffConfig':
+        """
+        `factor` times the locations; terminals, destinations and fee bands grow slower, the way new yards
+        and ports are added less often than auction branches.
+        """
+        return replace(
+            self,
+            locations=round(self.locations * factor),
+            terminals=round(self.terminals * math.sqrt(factor)),
+            destinations=min(len(PORTS), round(self.destinations * factor ** 0.25)),
+            fee_bands=round(self.fee_bands * math.sqrt(factor)),
+        )
+
+    @property
+    def route_costs(self) -> int:
+        vehicle_types = len(AuctionEnum) * len(VehicleTypeEnum)
+        return self.locations * min(self.terminals_per_location, self.terminals) * self.destinations * vehicle_types
+
+
+@dataclass(frozen=True)
+class SyntheticLocation:
+    name: str
+    city: str
+    state: str
+
+
+def _write(path: Path, columns: list[str], rows: Iterable[Iterable[Any]]) -> int:
+    count = 0
+    with path.open('w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+class SyntheticTariffs:
+    """
+    Consistent tariff tables in the layout of scripts/src (table dumps plus the carrier price sheets), and
+    a `location_queries.csv` of the spellings lots arrive with, so location matching can be exercised.
+    Everything is drawn from one seeded generator: the same config writes the same files.
+    """
+
+    def __init__(self, config: SyntheticTariffConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.vehicle_types = [(auction, vehicle_type) for auction in AuctionEnum for vehicle_type in VehicleTypeEnum]
+        self.fee_types = [(auction, fee_type) for auction in AuctionEnum for fee_type in FeeTypeEnum]
+        self.locations = self._locations()
+        self.terminals = self._terminals()
+        self.destinations = list(PORTS[:config.destinations]) + \
+            [f'Port {index}' for index in range(len(PORTS) + 1, config.destinations + 1)]
+
+    def _city(self) -> str:
+        return self.rng.choice(CITY_STEMS) + self.rng.choice(CITY_ENDINGS)
+
+    def _locations(self) -> list[SyntheticLocation]:
+        """
+        Names the way the auctions spell their branches: mostly `ST - City`, with a share of `City-South`,
+        `City Off Site (Other City)` and same-prefix branches (`TX - Oakville`, `TX - Oakville North`),
+        which make the partial-match fallbacks of the location search ambiguous.
+        """
+        locations: list[SyntheticLocation] = []
+        names: set[str] = set()
+        while len(locations) < self.config.locations:
+            city, state = self._city(), self.rng.choice(STATES)
+            name = f'{state} - {city}'
+            if self.rng.random() < self.config.name_noise:
+                name = self.rng.choice((
+                    f'{city}-{self.rng.choice(DIRECTIONS)}',
+                    f'{city} Off Site ({self._city()})',
+                    f'{state} - {city} {self.rng.choice(DIRECTIONS)}',
+                    f'{city} ({state})',
+                ))
+            if name in names:
+                # every combination taken at large scales, numbered branches keep names unique
+                name = f'{name} {len(locations) + 1}'
+            names.add(name)
+            locations.append(SyntheticLocation(name=name, city=city, state=state))
+        return locations
+
+    def _terminals(self) -> list[str]:
+        terminals: list[str] = []
+        while len(terminals) < self.config.terminals:
+            name = f'{self._city()}, {self.rng.choice(STATES)}'
+            if name not in terminals:
+                terminals.append(name)
+        return terminals
+
+    def bands(self, count: int) -> list[tuple[float, float]]:
+        """
+        Bands covering [0, MAX_PRICE]: mostly ending a cent below the next band, some ending exactly on the
+        next minimum (that price matches two bands), some single-price bands, overlaps only when configured.
+        """
+        count = max(1, min(count, MAX_PRICE // 50 - 1))
+        starts = [0] + sorted(bound * 50 for bound in self.rng.sample(range(1, MAX_PRICE // 50), count - 1))
+        bands = []
+        for index, start in enumerate(starts):
+            next_start = starts[index + 1] if index + 1 < len(starts) else None
+            if next_start is None:
+                end = float(MAX_PRICE)
+            elif self.rng.random() < self.config.touching_bands:
+                end = float(next_start)
+            else:
+                end = next_start - 0.01
+            bands.append((float(start), end))
+        # a single-price band between two regular ones, e.g. 5000 - 5000
+        if len(bands) > 2:
+            index = self.rng.randrange(1, len(bands) - 1)
+            start, end = bands[index]
+            if end - start >= 1:
+                bands[index] = (start, start)
+                bands.insert(index + 1, (start + 0.01, end))
+        return bands
+
+    def _fee_rows(self) -> list[tuple]:
+        rows = []
+        overlaps = set(self.rng.sample(range(len(self.fee_types)), min(self.config.overlapping_bands,
+                                                                       len(self.fee_types))))
+        for fee_type_id in range(1, len(self.fee_types) + 1):
+            bands = self.bands(self.config.fee_bands)
+            if fee_type_id - 1 in overlaps and len(bands) > 1:
+                start, end = bands[1]
+                bands[1] = (start - 25, end)
+            for band_min, band_max in bands:
+                # flat amounts below, a share of the car price for the most expensive bands
+                if band_min > MAX_PRICE * 0.75:
+                    fee = round(self.rng.uniform(0.04, 0.08), 4)
+                else:
+                    fee = self.rng.randrange(25, 3000, 5)
+                rows.append((len(rows) + 1, band_min, band_max, fee, fee_type_id))
+        return rows
+
+    def _location_queries(self) -> Iterable[tuple]:
+        """
+        Lookup strings with the location they were derived from, empty for names that do not exist. A city
+        alone may legitimately resolve to another branch of the same city.
+        """
+        for _ in range(self.config.location_queries):
+            location_id = self.rng.randrange(1, len(self.locations) + 1)
+            location = self.locations[location_id - 1]
+            kind = self.rng.choices(('exact', 'case', 'bracket', 'partial', 'missing'), (50, 15, 15, 15, 5))[0]
+            if kind == 'exact':
+                query = location.name
+            elif kind == 'case':
+                query = location.name.upper()
+            elif kind == 'bracket':
+                query = f'{location.name} ({self.rng.choice(tuple(SHEET_AUCTIONS.values())).upper()} ' \
+                        f'{self.rng.randrange(1, 300)})'
+            elif kind == 'partial':
+                query = location.city
+            else:
+                query, location_id = f'{self._city()} Nowhere', ''
+            yield query, location_id, kind
+
+    def write(self, directory: Path) -> dict[str, int]:
+        directory.mkdir(parents=True, exist_ok=True)
+        rng = self.rng
+        rows: dict[str, int] = {}
+
+        rows['destination'] = _write(directory / 'destination.csv', ['id', 'name', 'is_default'],
+                                     ((index, name, int(index == 1)) for index, name in
+                                      enumerate(self.destinations, 1)))
+        rows['location'] = _write(directory / 'location.csv', ['id', 'name', 'city', 'state', 'postal_code', 'email'],
+                                  ((index, location.name, location.city, location.state,
+                                    f'{rng.randrange(10_000, 99_999)}', '')
+                                   for index, location in enumerate(self.locations, 1)))
+        rows['terminal'] = _write(directory / 'terminal.csv', ['id', 'name'], enumerate(self.terminals, 1))
+        rows['vehicle_type'] = _write(directory / 'vehicle_type.csv', ['id', 'auction', 'vehicle_type',
+                                                                       'specific_type'],
+                                      ((index, auction.name, vehicle_type.name, '') for index, (auction, vehicle_type)
+                                       in enumerate(self.vehicle_types, 1)))
+        rows['fee_type'] = _write(directory / 'fee_type.csv', ['id', 'auction', 'fee_type'],
+                                  ((index, auction.name, fee_type.name) for index, (auction, fee_type) in
+                                   enumerate(self.fee_types, 1)))
+        rows['fee'] = _write(directory / 'fee.csv',
+                             ['id', 'car_price_min', 'car_price_max', 'car_price_fee', 'fee_type_id'],
+                             self._fee_rows())
+
+        int_proxy = self.bands(self.config.additional_fee_bands)
+        live_bid = self.bands(self.config.additional_fee_bands)
+        additional_rows = []
+        for index in range(max(len(int_proxy), len(live_bid))):
+            int_band = int_proxy[index] if index < len(int_proxy) else (None, None)
+            live_band = live_bid[index] if index < len(live_bid) else (None, None)
+            int_fee = rng.randrange(0, 200, 5) if int_band[0] is not None else None
+            live_fee = rng.randrange(0, 200, 5) if live_band[0] is not None else None
+            additional_rows.append((index + 1, *int_band, int_fee, int_fee, *live_band, live_fee))
+        rows['additional_fee'] = _write(directory / 'additional_fee.csv',
+                                        ['id', 'int_proxy_min', 'int_proxy_max', 'int_fee', 'proxy_fee',
+                                         'live_bid_min', 'live_bid_max', 'live_bid_fee'],
+                                        additional_rows)
+        special_fees = [(auction, name) for auction in AuctionEnum
+                        for name in SPECIAL_FEES[:self.config.special_fees]]
+        rows['additional_special_fee'] = _write(directory / 'additional_special_fee.csv',
+                                                ['id', 'name', 'auction', 'amount'],
+                                                ((index, name, auction.name, rng.randrange(10, 120))
+                                                 for index, (auction, name) in enumerate(special_fees, 1)))
+
+        per_location = min(self.config.terminals_per_location, len(self.terminals))
+        delivery_rows = []
+        for location in self.locations:
+            for terminal in rng.sample(self.terminals, per_location):
+                car_fee = rng.randrange(150, 1800, 25)
+                for auction in AuctionEnum:
+                    delivery_rows.append((SHEET_AUCTIONS[auction], location.name, terminal, car_fee,
+                                          max(car_fee - 100, 100)))
+        rows['prices_delivery'] = _write(directory / 'prices_delivery.csv',
+                                         ['Auction', 'Branch', 'Yard', 'Car fee', 'Motorcycle fee'], delivery_rows)
+
+        # the sheet for import_tariff_changes and the table dump for the bulk loader carry the same prices
+        shipping_sheet = []
+        shipping_rows = []
+        for terminal_id, terminal in enumerate(self.terminals, 1):
+            for destination_id, destination in enumerate(self.destinations, 1):
+                car_price = rng.randrange(500, 2500, 50)
+                moto_price = car_price // 2
+                shipping_sheet.append((terminal, destination, car_price, moto_price))
+                for vehicle_type_id, (_, vehicle_type) in enumerate(self.vehicle_types, 1):
+                    price = car_price if vehicle_type == VehicleTypeEnum.CAR else moto_price
+                    shipping_rows.append((len(shipping_rows) + 1, terminal_id, destination_id, vehicle_type_id,
+                                          price))
+        rows['prices_shipping'] = _write(directory / 'prices_shipping.csv',
+                                         ['terminal', 'destination', 'car_price', 'moto_price'], shipping_sheet)
+        rows['shipping_price'] = _write(directory / 'shipping_price.csv',
+                                        ['id', 'terminal_id', 'destination_id', 'vehicle_type_id', 'price'],
+                                        shipping_rows)
+
+        rows['exchange_rate'] = _write(directory / 'exchange_rate.csv', ['id', 'rate', 'created_at'],
+                                       [(1, round(rng.uniform(0.85, 0.95), 4),
+                                         datetime(2025, 1, 1, tzinfo=UTC).isoformat())])
+        rows['location_queries'] = _write(directory / 'location_queries.csv', ['query', 'location_id', 'kind'],
+                                          self._location_queries())
+        (directory / 'synthetic.json').write_text(json.dumps(asdict(self.config), indent=2) + '\n')
+        return rows
+
+
+def write_synthetic_tariffs(directory: Path, config: SyntheticTariffConfig = SyntheticTariffConfig()) -> Path:
+    rows = SyntheticTariffs(config).write(directory)
+    logger.info(f'Synthetic tariffs written to {directory}', extra={'rows': rows})
+    return directory
+
+
+def read_location_queries(directory: Path) -> list[tuple[str, int | None, str]]:
+    with (directory / 'location_queries.csv').open(newline='', encoding='utf-8') as file:
+        return [(row['query'], int(row['location_id']) if row['location_id'] else None, row['kind'])
+                for row in csv.DictReader(file)]
+
+
+async def load_synthetic_tariffs(engine: AsyncEngine, directory: Path) -> LoadReport:
+    """Replaces the tariffs through the bulk loader and adds the generated exchange rate."""
+    report = await BulkTariffLoader(engine, source_dir=directory).load()
+    with (directory / 'exchange_rate.csv').open(newline='', encoding='utf-8') as file:
+        rates = [{'rate': float(row['rate']), 'created_at': datetime.fromisoformat(row['created_at'])}
+                 for row in csv.DictReader(file)]
+    async with engine.begin() as conn:
+        await conn.execute(insert(ExchangeRate), rates)
+    return report
+
+
+async def generate_and_load(engine: AsyncEngine, directory: Path, config: SyntheticTariffConfig) -> LoadReport:
+    try:
+        return await load_synthetic_tariffs(engine, write_synthetic_tariffs(directory, config))
+    finally:
+        await close_tariff_change_bus()
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    defaults = SyntheticTariffConfig()
+    parser = argparse.ArgumentParser(description='Generate synthetic tariff CSVs, optionally load them')
+    parser.add_argument('output', type=Path, help='directory for the CSVs, same layout as scripts/src')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiple of the default table sizes')
+    for field_name in COUNT_FIELDS:
+        parser.add_argument(f'--{field_name.replace("_", "-")}', type=int, help='overrides --scale')
+    parser.add_argument('--name-noise', type=float, default=defaults.name_noise)
+    parser.add_argument('--touching-bands', type=float, default=defaults.touching_bands)
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    parser.add_argument('--load', action='store_true',
+                        help='replace the tariffs of the configured database with the generated ones')
+    args = parser.parse_args()
+
+    config = replace(defaults.scaled(args.scale), name_noise=args.name_noise, touching_bands=args.touching_bands,
+                     seed=args.seed,
+                     **{name: getattr(args, name) for name in COUNT_FIELDS if getattr(args, name) is not None})
+    if config.overlapping_bands and args.load:
+        parser.error('overlapping bands are rejected by the loader, generate them without --load')
+
+    if not args.load:
+        write_synthetic_tariffs(args.output, config)
+    else:
+        try:
+            report = asyncio.run(generate_and_load(engine_async, args.output, config))
+        except (TariffSourceError, TariffValidationError) as e:
+            logger.error(e.message)
+            raise SystemExit(1)
+        print(json.dumps({'version': report.version, 'rows': report.rows, 'route_costs': config.route_costs},
+                         indent=2))
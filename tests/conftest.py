@@ -0,0 +1,97 @@
+import asyncio
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, ContextManager, Iterator
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database.db.profiler import QueryStats, attach_query_profiler, profile_queries
+from app.database.models import AdditionalFee, AdditionalSpecialFee, Base, DeliveryPrice, Destination, ExchangeRate, \
+    Fee, FeeType, Location, ShippingPrice, Terminal, VehicleType
+from app.enums.auction import AuctionEnum
+from app.enums.fee_type import FeeTypeEnum
+from app.enums.vehicle_type import VehicleTypeEnum
+from scripts.synthetic_tariffs import SyntheticTariffConfig, write_synthetic_tariffs
+
+# a generated tariff small enough to load in well under a second
+SMALL_TARIFFS = SyntheticTariffConfig(locations=20, terminals=4, destinations=2, fee_bands=5, additional_fee_bands=3,
+                                      special_fees=2, terminals_per_location=2, location_queries=30)
+
+
+async def seed(session: AsyncSession) -> None:
+    """One priced route per auction: Abilene -> Houston / Savannah -> Klaipeda, with every fee band a quote reads."""
+    location = Location(name='Abilene', city='Abilene', state='TX')
+    terminals = [Terminal(name='Houston'), Terminal(name='Savannah')]
+    destination = Destination(name='Klaipeda', is_default=True)
+    session.add_all([location, *terminals, destination, ExchangeRate(rate=0.9)])
+    for auction in AuctionEnum:
+        vehicle_type = VehicleType(auction=auction, vehicle_type=VehicleTypeEnum.CAR)
+        fee_type = FeeType(auction=auction, fee_type=FeeTypeEnum.NON_CLEAN_TITLE_FEE)
+        session.add_all([
+            vehicle_type,
+            fee_type,
+            Fee(fee_type=fee_type, car_price_min=0, car_price_max=100_000, car_price_fee=500),
+            AdditionalSpecialFee(name='Gate Fee', auction=auction, amount=79),
+            *(DeliveryPrice(location=location, terminal=terminal, vehicle_type=vehicle_type, price=price)
+              for terminal, price in zip(terminals, (400, 650))),
+            *(ShippingPrice(terminal=terminal, destination=destination, vehicle_type=vehicle_type, price=price)
+              for terminal, price in zip(terminals, (1200, 1050))),
+        ])
+    session.add(AdditionalFee(int_proxy_min=0, int_proxy_max=100_000, int_fee=50,
+                              live_bid_min=0, live_bid_max=100_000, live_bid_fee=60))
+    await session.commit()
+
+
+@pytest.fixture
+def session_factory(tmp_path: Path) -> Iterator[async_sessionmaker[AsyncSession]]:
+    """Sessions on a seeded SQLite database, its statements are counted by `profile_queries`."""
+    engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path / "test.sqlite"}')
+    attach_query_profiler(engine)
+    factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def setup() -> None:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        async with factory() as session:
+            await seed(session)
+        # pooled aiosqlite connections belong to this event loop
+        await engine.dispose()
+
+    asyncio.run(setup())
+    yield factory
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def tariff_dir(tmp_path: Path) -> Path:
+    """SMALL_TARIFFS as the CSVs and carrier sheets the loaders read."""
+    return write_synthetic_tariffs(tmp_path / 'tariffs', SMALL_TARIFFS)
+
+
+@pytest.fixture
+def empty_engine(tmp_path: Path) -> Iterator[AsyncEngine]:
+    """A SQLite database with the schema and no rows. Dispose it before each `asyncio.run` returns."""
+    engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path / "empty.sqlite"}')
+
+    async def setup() -> None:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        await engine.dispose()
+
+    asyncio.run(setup())
+    yield engine
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def query_budget() -> Callable[[int], ContextManager[QueryStats]]:
+    """`with query_budget(n):` fails the test when the block runs more than n statements."""
+    @contextmanager
+    def budget(max_statements: int) -> Iterator[QueryStats]:
+        with profile_queries() as stats:
+            yield stats
+        statements = '\n'.join(f'{count} x {shape}' for shape, count in stats.shapes.most_common())
+        assert stats.statements <= max_statements, \
+            f'{stats.statements} statements, budget is {max_statements}:\n{statements}'
+    return budget
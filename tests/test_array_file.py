@@ -0,0 +1,20 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from app.services.tariff.array_file import map_array_file, write_array_file
+
+
+def test_concurrent_writers_never_leave_a_partial_file(tmp_path: Path):
+    path = tmp_path / 'tariffs.bin'
+
+    def write(i: int) -> None:
+        write_array_file(path, {'writer': i}, {'values': np.full(100_000, i, dtype=np.float64)})
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(write, range(32)))
+
+    meta, arrays = map_array_file(path)
+    assert (arrays['values'] == meta['writer']).all()
+    assert [file.name for file in tmp_path.iterdir()] == ['tariffs.bin']
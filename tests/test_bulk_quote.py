@@ -0,0 +1,56 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from app.services.calculator import bulk
+from app.services.calculator.snapshot import TariffSnapshot, load_current_snapshot
+from app.services.tariff.store import TariffMatrixStore
+
+LOTS = [
+    {'auction': 'COPART', 'location': 'Abilene', 'vehicle_type': 'CAR', 'price': '5000', 'fee_type': '',
+     'destination': ''},
+    {'auction': 'IAAI', 'location': 'abilene', 'vehicle_type': 'CAR', 'price': '20000', 'fee_type': '',
+     'destination': 'Klaipeda'},
+    {'auction': 'COPART', 'location': 'Nowhere', 'vehicle_type': 'CAR', 'price': '5000', 'fee_type': '',
+     'destination': ''},
+    {'auction': 'COPART', 'location': 'Abilene', 'vehicle_type': 'CAR', 'price': 'many', 'fee_type': '',
+     'destination': ''},
+]
+
+
+@pytest.fixture
+def snapshot(session_factory) -> TariffSnapshot:
+    return asyncio.run(load_current_snapshot(session_factory, TariffMatrixStore(session_factory), file=None))
+
+
+def test_quote_chunk(snapshot, monkeypatch):
+    monkeypatch.setattr(bulk, '_snapshot', snapshot)
+
+    quoted, moved, missing, invalid = bulk.quote_chunk(LOTS)
+
+    # Houston: 400 delivery + 1200 shipping
+    assert (quoted['terminal'], quoted['transportation_price'], quoted['ocean_ship']) == ('Houston', 400, 1200)
+    assert quoted['error_type'] is None and quoted['price'] == '5000'
+    assert moved['error_type'] is None and moved['total'] > quoted['total']
+    assert missing['error_type'] == 'LocationNotFoundError'
+    assert invalid['error_type'] == 'InvalidInput' and invalid['error'].startswith('price:')
+
+
+def test_workers_quote_like_the_parent(snapshot, monkeypatch, tmp_path: Path):
+    monkeypatch.setattr(bulk, '_snapshot', snapshot)
+    lots = tmp_path / 'lots.csv'
+    lots.write_text('auction,location,vehicle_type,price\n' + ''.join(
+        f'COPART,Abilene,CAR,{price}\n' for price in range(1000, 8000, 1000)))
+
+    chunks = list(bulk.read_lots(lots, chunk_size=3))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert bulk.count_lots(lots) == 7
+
+    # spawned workers get the snapshot through `init_worker` instead of inheriting it
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=bulk.init_worker, initargs=(snapshot,)) as pool:
+        pooled = [row for rows in pool.map(bulk.quote_chunk, chunks) for row in rows]
+    assert pooled == [row for chunk in chunks for row in bulk.quote_chunk(chunk)]
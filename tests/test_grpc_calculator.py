@@ -0,0 +1,73 @@
+import asyncio
+
+import grpc
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.rpc_server import calculator
+from app.rpc_server.calculator import CalculatorServicer, calculator_pb2, calculator_pb2_grpc, decode_request
+from app.rpc_server.server import CalculatorGrpcServer
+
+
+def quote_request(id: int, location: str = 'Abilene') -> calculator_pb2.QuoteRequest:
+    return calculator_pb2.QuoteRequest(id=id, price=5000 + id, auction=calculator_pb2.AUCTION_IAAI,
+                                       vehicle_type=calculator_pb2.VEHICLE_TYPE_CAR, location=location)
+
+
+def test_quotes_over_grpc(session_factory: async_sessionmaker[AsyncSession]):
+    async def run() -> tuple[calculator_pb2.QuoteResponse, grpc.StatusCode, list[calculator_pb2.QuoteResponse]]:
+        server = CalculatorGrpcServer('127.0.0.1:0', session_factory=session_factory, grace=0)
+        await server.start()
+        try:
+            async with grpc.aio.insecure_channel(f'127.0.0.1:{server.port}') as channel:
+                stub = calculator_pb2_grpc.CalculatorServiceStub(channel)
+                single = await stub.Quote(quote_request(0))
+                try:
+                    await stub.Quote(quote_request(0, location='Nowhere'))
+                except grpc.aio.AioRpcError as e:
+                    not_found = e.code()
+                requests = [quote_request(id) for id in range(1, 20)] + [quote_request(20, location='Nowhere')]
+                batch = [response async for response in stub.QuoteBatch(iter(requests))]
+        finally:
+            await server.stop()
+        return single, not_found, batch
+
+    single, not_found, batch = asyncio.run(run())
+    assert list(single.quote.terminals) == ['Houston', 'Savannah']
+    assert single.quote.dollars.totals[0] == 5000 + 400 + 1200 + single.quote.dollars.additional_fees + \
+        single.quote.dollars.broker_fee
+    assert single.etag and not single.stale_age
+    assert not_found == grpc.StatusCode.NOT_FOUND
+    assert sorted(response.id for response in batch) == list(range(1, 21))
+    failed = [response for response in batch if response.HasField('error')]
+    assert [response.id for response in failed] == [20]
+    assert failed[0].error.code == grpc.StatusCode.NOT_FOUND.value[0]
+
+
+def test_unset_fee_type_is_the_default():
+    assert decode_request(quote_request(0)).fee_type is None
+
+
+def test_unexpected_error_fails_only_its_batch_item(monkeypatch, session_factory: async_sessionmaker[AsyncSession]):
+    resolve = calculator.resolve_quote
+
+    async def resolve_quote(db, input_key: str, get_input):
+        if (await get_input()).location == 'Broken':
+            raise RuntimeError('bug')
+        return await resolve(db, input_key, get_input)
+
+    monkeypatch.setattr(calculator, 'resolve_quote', resolve_quote)
+
+    async def run() -> list[calculator_pb2.QuoteResponse]:
+        servicer = CalculatorServicer(session_factory, batch_concurrency=4)
+
+        async def requests():
+            for id in range(1, 9):
+                yield quote_request(id, location='Broken' if id == 3 else 'Abilene')
+
+        return [response async for response in servicer.QuoteBatch(requests(), context=None)]
+
+    batch = asyncio.run(run())
+    assert sorted(response.id for response in batch) == list(range(1, 9))
+    failed = [response for response in batch if response.HasField('error')]
+    assert [response.id for response in failed] == [3]
+    assert failed[0].error.code == grpc.StatusCode.INTERNAL.value[0]
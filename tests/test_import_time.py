@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+
+from app.core.utils import BASE_DIR
+
+# `import main` builds the application; about 0.35s on a developer laptop, the budget leaves room for CI
+IMPORT_BUDGET_SECONDS = 1.0
+# imported by the code that needs them, never at startup
+LAZY_MODULES = ('pandas', 'currency_converter', 'asyncpg', 'aiosqlite')
+
+
+def import_main() -> dict[str, int]:
+    """Cumulative import time in microseconds per module, from `python -X importtime -c 'import main'`."""
+    app_dir = BASE_DIR / 'app'
+    environment = {**os.environ, 'PYTHONPATH': os.pathsep.join([str(BASE_DIR), str(app_dir)])}
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main'], cwd=app_dir,
+                            env=environment, capture_output=True, text=True, check=True)
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, total, module = line.split('|')
+        cumulative[module.strip()] = int(total)
+    return cumulative
+
+
+def test_startup_within_import_budget():
+    # best of three, the first run may still be writing bytecode caches
+    runs = [import_main() for _ in range(3)]
+    seconds = min(run['main'] for run in runs) / 1_000_000
+    assert seconds <= IMPORT_BUDGET_SECONDS, f'import main took {seconds:.3f}s, budget {IMPORT_BUDGET_SECONDS}s'
+
+
+def test_heavy_modules_not_imported_at_startup():
+    imported = import_main()
+    assert [module for module in LAZY_MODULES if module in imported] == []
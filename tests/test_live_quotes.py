@@ -0,0 +1,74 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.api_v1.endpoints.public import calculator as calculator_endpoint
+from app.enums.auction import AuctionEnum
+from app.enums.vehicle_type import VehicleTypeEnum
+from app.schemas.calculator import CalculatorDataIn, LiveQuoteSessionIn
+from app.services.calculator.bundle import TariffBundle
+from app.services.calculator.exceptions import LocationNotFoundError
+from app.services.calculator.live import LatestPrice, LiveQuoteSession, LiveSnapshot, flatten_quote, quote_delta
+from app.services.calculator.snapshot import load_current_snapshot
+from app.services.tariff.store import TariffMatrixStore
+
+
+def test_live_session_quotes_and_deltas(session_factory, tmp_path: Path):
+    exported = asyncio.run(load_current_snapshot(session_factory, TariffMatrixStore(session_factory), file=None))
+    bundle = TariffBundle(tmp_path / 'bundle.bin')
+    exported.to_file(bundle.file.path)
+    params = LiveQuoteSessionIn(auction=AuctionEnum.IAAI, vehicle_type=VehicleTypeEnum.CAR, location='Abilene')
+    session = LiveQuoteSession(asyncio.run(LiveSnapshot(bundle=bundle).get()), params)
+
+    client: dict = {}
+    for price in (5000, 5100, 5100, 20_000):
+        quote = session.quote(price)
+        assert quote == exported.quote(CalculatorDataIn(price=price, **params.model_dump()))
+        values = flatten_quote(quote.model_dump(mode='json'))
+        delta = quote_delta(client, values)
+        if client:
+            # names and fixed amounts are not sent again
+            assert 'calculator_in_dollars.calculator.totals.0.name' not in delta
+            assert 'calculator_in_dollars.calculator.ocean_ship.0.price' not in delta
+        client |= delta
+        assert client == values
+
+    with pytest.raises(LocationNotFoundError):
+        LiveQuoteSession(exported, params.model_copy(update={'location': 'Nowhere'}))
+
+
+def test_latest_price_coalesces():
+    async def run() -> list[int | None]:
+        prices = LatestPrice()
+        for price in (100, 200, 300):
+            prices.put(price)
+        first = await prices.get()
+        prices.put(400)
+        prices.put(None)
+        return [first, await prices.get()]
+
+    assert asyncio.run(run()) == [300, None]
+
+
+def test_live_endpoint_answers_invalid_messages_and_prices(monkeypatch, session_factory, tmp_path: Path):
+    exported = asyncio.run(load_current_snapshot(session_factory, TariffMatrixStore(session_factory), file=None))
+    bundle = TariffBundle(tmp_path / 'bundle.bin')
+    exported.to_file(bundle.file.path)
+    monkeypatch.setattr(calculator_endpoint, 'live_snapshot', LiveSnapshot(bundle=bundle))
+    app = FastAPI()
+    app.include_router(calculator_endpoint.calculator_api_router)
+
+    with TestClient(app).websocket_connect('/calculator/live?auction=IAAI&vehicle_type=CAR&location=Abilene') as ws:
+        ws.send_text('not json')
+        assert 'error' in ws.receive_json()
+        ws.send_json({'price': 5000})
+        first = ws.receive_json()
+        ws.send_json({'price': 5100})
+        second = ws.receive_json()
+
+    data = CalculatorDataIn(price=5000, auction=AuctionEnum.IAAI, vehicle_type=VehicleTypeEnum.CAR, location='Abilene')
+    assert first == {'price': 5000, 'quote': exported.quote(data).model_dump(mode='json')}
+    assert second['price'] == 5100 and second['changed']
@@ -0,0 +1,22 @@
+from app.config import settings
+from app.database.db.pool import pool_limits
+
+
+def test_share_split_between_pool_and_overflow(monkeypatch):
+    monkeypatch.setattr(settings, 'DB_POOL_SIZE', None)
+    monkeypatch.setattr(settings, 'DB_MAX_OVERFLOW', None)
+    assert pool_limits(20, 1) == (10, 10)
+    assert pool_limits(20, 4) == (3, 2)
+    assert pool_limits(20, 3) == (3, 3)
+    # every worker keeps at least two connections
+    assert pool_limits(4, 8) == (1, 1)
+
+
+def test_explicit_pool_size_never_lifts_the_limit(monkeypatch):
+    monkeypatch.setattr(settings, 'DB_POOL_SIZE', 10)
+    monkeypatch.setattr(settings, 'DB_MAX_OVERFLOW', None)
+    assert pool_limits(20, 4) == (10, 0)
+    assert pool_limits(20, 1) == (10, 10)
+
+    monkeypatch.setattr(settings, 'DB_MAX_OVERFLOW', 3)
+    assert pool_limits(20, 4) == (10, 3)
@@ -0,0 +1,38 @@
+import random
+
+from app.services.calculator.popularity import SpaceSaving
+
+
+def test_space_saving_keeps_heavy_hitters():
+    rng = random.Random(0)
+    stream = [f'hot-{i}' for i in range(5) for _ in range(200)] + [f'cold-{rng.randrange(10_000)}' for _ in range(5000)]
+    rng.shuffle(stream)
+    sketch = SpaceSaving(capacity=100)
+    for key in stream:
+        sketch.add(key)
+
+    top = sketch.top(5)
+    assert sorted(hot.key for hot in top) == [f'hot-{i}' for i in range(5)]
+    for hot in top:
+        assert hot.count - hot.error <= 200 <= hot.count
+    assert len(sketch) == 100
+    assert sketch.total == len(stream)
+
+
+def test_decay_halves_counts_and_drops_singletons():
+    sketch = SpaceSaving(capacity=10)
+    for key in ['a'] * 6 + ['b']:
+        sketch.add(key)
+    sketch.decay()
+
+    assert [(hot.key, hot.count) for hot in sketch.top(10)] == [('a', 3)]
+    sketch.add('b')
+    assert [(hot.key, hot.count) for hot in sketch.top(10)] == [('a', 3), ('b', 1)]
+
+
+def test_zero_capacity_tracks_nothing():
+    sketch = SpaceSaving(capacity=0)
+    for key in ['a', 'b', 'a']:
+        sketch.add(key)
+
+    assert sketch.top(5) == [] and len(sketch) == 0
@@ -0,0 +1,62 @@
+import asyncio
+import csv
+import gzip
+import io
+import json
+
+from app.core.http_cache import accepts_encoding
+from app.enums.price_list import PriceListDatasetEnum, PriceListFormatEnum
+from app.services.tariff.price_list import PRICE_LIST_COLUMNS, encode_rows, gzip_chunks, iter_price_list_rows
+from app.services.tariff.store import TariffMatrixStore
+from scripts.export_price_list import export_price_list
+
+
+def export(session_factory, dataset: PriceListDatasetEnum, output_format: PriceListFormatEnum,
+           compress: bool = False) -> bytes:
+    async def run() -> bytes:
+        rows = iter_price_list_rows(dataset, session_factory, TariffMatrixStore(session_factory))
+        chunks = encode_rows(rows, PRICE_LIST_COLUMNS[dataset], output_format)
+        return b''.join([chunk async for chunk in (gzip_chunks(chunks) if compress else chunks)])
+    return asyncio.run(run())
+
+
+def test_routes_list_the_cheapest_terminal(session_factory):
+    body = export(session_factory, PriceListDatasetEnum.ROUTES, PriceListFormatEnum.CSV)
+
+    rows = list(csv.DictReader(io.StringIO(body.decode())))
+    assert [(row['auction'], row['terminal'], row['transport_price'], row['fixed_fees']) for row in rows] == [
+        ('COPART', 'Houston', '1600', '79'), ('IAAI', 'Houston', '1600', '79')]
+
+
+def test_fees_as_ndjson(session_factory):
+    body = export(session_factory, PriceListDatasetEnum.FEES, PriceListFormatEnum.NDJSON)
+
+    rows = [json.loads(line) for line in body.decode().splitlines()]
+    assert {row['kind'] for row in rows} == {'auction_fee', 'internet_fee', 'live_bid_fee', 'special_fee'}
+    assert all(list(row) == list(PRICE_LIST_COLUMNS[PriceListDatasetEnum.FEES]) for row in rows)
+
+
+def test_compressed_export_is_the_same_list(session_factory):
+    for dataset in PriceListDatasetEnum:
+        plain = export(session_factory, dataset, PriceListFormatEnum.CSV)
+        assert gzip.decompress(export(session_factory, dataset, PriceListFormatEnum.CSV, compress=True)) == plain
+
+
+def test_export_script_reads_through_the_given_engine(session_factory, tmp_path):
+    expected = export(session_factory, PriceListDatasetEnum.ROUTES, PriceListFormatEnum.CSV)
+    output = tmp_path / 'routes.csv'
+    asyncio.run(export_price_list(session_factory.kw['bind'], PriceListDatasetEnum.ROUTES, PriceListFormatEnum.CSV,
+                                  output))
+
+    assert output.read_bytes() == expected
+
+
+def test_accepts_encoding():
+    assert accepts_encoding('gzip, deflate, br', 'gzip')
+    assert accepts_encoding('GZIP;q=0.5', 'gzip')
+    assert accepts_encoding('*', 'gzip')
+    assert not accepts_encoding('gzip;q=0', 'gzip')
+    assert not accepts_encoding('gzip; q=0.0, br', 'gzip')
+    assert not accepts_encoding('*, gzip;q=0', 'gzip')
+    assert not accepts_encoding('deflate', 'gzip')
+    assert not accepts_encoding(None, 'gzip')
@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+
+from app.enums.auction import AuctionEnum
+from app.enums.vehicle_type import VehicleTypeEnum
+from app.services.calculator.calculator_service import CalculatorService
+from app.services.calculator.types import Calculator
+
+# vehicle type, destination, special fees, fee type, fee band, internet/live fee, location, routes, exchange rate
+CALCULATE_QUERY_BUDGET = 9
+# each location search pattern that misses costs one more statement, there are four
+LOCATION_FALLBACK_QUERIES = 3
+
+
+def calculate(session_factory, location: str, auction: AuctionEnum) -> Calculator:
+    async def run() -> Calculator:
+        async with session_factory() as session:
+            service = CalculatorService(session, price=5000, auction=auction, location=location,
+                                        vehicle_type=VehicleTypeEnum.CAR)
+            return await service.calculate()
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize('auction', list(AuctionEnum))
+def test_calculate_within_query_budget(session_factory, query_budget, auction):
+    with query_budget(CALCULATE_QUERY_BUDGET):
+        calculator = calculate(session_factory, 'Abilene', auction)
+
+    totals = calculator.calculator_in_dollars.calculator.totals
+    assert [city.name for city in totals] == ['Houston', 'Savannah']
+
+
+def test_calculate_location_fallback_within_query_budget(session_factory, query_budget):
+    with query_budget(CALCULATE_QUERY_BUDGET + LOCATION_FALLBACK_QUERIES) as stats:
+        calculate(session_factory, 'abil', AuctionEnum.COPART)
+
+    assert not stats.repeated(LOCATION_FALLBACK_QUERIES + 2)
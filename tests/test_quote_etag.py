@@ -0,0 +1,137 @@
+import asyncio
+
+import grpc
+import pytest
+from fastapi import Response
+from rfc9457 import NotFoundProblem
+from starlette.requests import Request
+
+from app.api.api_v1.endpoints.public import calculator as calculator_endpoint
+from app.config import settings
+from app.core.http_cache import etag_matches
+from app.database.models import ExchangeRate
+from app.enums.auction import AuctionEnum
+from app.enums.fee_type import FeeTypeEnum
+from app.enums.vehicle_type import VehicleTypeEnum
+from app.rpc_client.auction_api import ApiRpcClient
+from app.rpc_client.gen.python.auction.v1 import lot_pb2, lot_pb2_grpc
+from app.schemas.calculator import CalculatorDataIn
+from app.services.calculator.cache_key import calculator_input_key
+from app.services.calculator.quote_cache import quote_cache
+from app.services.calculator.quotes import QuoteResult, resolve_quote
+
+DATA = CalculatorDataIn(price=5000, auction=AuctionEnum.COPART, vehicle_type=VehicleTypeEnum.CAR,
+                        location='Abilene', destination='Klaipeda')
+
+
+@pytest.fixture(autouse=True)
+def empty_quote_cache():
+    quote_cache.clear()
+    yield
+    quote_cache.clear()
+
+
+def resolve(session_factory, data: CalculatorDataIn, if_none_match: str | None = None) -> QuoteResult:
+    async def run() -> QuoteResult:
+        async def get_input() -> CalculatorDataIn:
+            return data
+
+        async with session_factory() as session:
+            return await resolve_quote(session, calculator_input_key(data), get_input, if_none_match)
+    return asyncio.run(run())
+
+
+def test_equivalent_inputs_share_a_key():
+    same = CalculatorDataIn(price=5000, auction=AuctionEnum.COPART, vehicle_type=VehicleTypeEnum.CAR,
+                            location=' ABILENE ', destination=' klaipeda', fee_type=None)
+    assert calculator_input_key(same) == calculator_input_key(DATA)
+    assert calculator_input_key(DATA.model_copy(update={'fee_type': FeeTypeEnum.CLEAN_TITLE_FEE})) \
+        != calculator_input_key(DATA)
+
+
+def test_etag_matches():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('W/"abc"', '"abc"')
+    assert etag_matches('"x", "abc"', '"abc"')
+    assert etag_matches('*', '"abc"')
+    assert not etag_matches('"x"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+
+
+def test_matching_etag_skips_the_quote(session_factory):
+    first = resolve(session_factory, DATA)
+    assert first.quote is not None and first.etag is not None
+
+    assert resolve(session_factory, DATA, if_none_match=first.etag) == QuoteResult(None, first.etag)
+    assert resolve(session_factory, DATA, if_none_match='"other"') == first
+
+
+def test_new_rate_changes_the_etag(session_factory):
+    before = resolve(session_factory, DATA)
+
+    async def add_rate() -> None:
+        async with session_factory() as session:
+            session.add(ExchangeRate(rate=0.8))
+            await session.commit()
+    asyncio.run(add_rate())
+
+    after = resolve(session_factory, DATA, if_none_match=before.etag)
+    assert after.quote is not None
+    assert after.etag != before.etag
+
+
+def test_lot_quote_is_keyed_by_the_lot_data(monkeypatch):
+    lots = {'1': lot_pb2.GetLotByVinOrLotResponse(lot=[{'location': 'Abilene', 'vehicle_type': 'Automobile'}])}
+
+    class AuctionApi:
+        async def get_lot_by_vin_or_lot_id(self, lot_id: str, auction: str,
+                                           timeout: float | None = None) -> lot_pb2.GetLotByVinOrLotResponse:
+            return lots[lot_id]
+
+    async def get_auction_api() -> AuctionApi:
+        return AuctionApi()
+
+    monkeypatch.setattr(calculator_endpoint, 'get_auction_api', get_auction_api)
+
+    def lot_key() -> str:
+        data = asyncio.run(calculator_endpoint.lot_calculator_input(AuctionEnum.COPART, ' 1 ', 5000))
+        return calculator_input_key(data)
+
+    assert lot_key() == calculator_input_key(DATA.model_copy(update={'destination': None}))
+    # the lot moved to another yard: another quote, another ETag
+    lots['1'] = lot_pb2.GetLotByVinOrLotResponse(lot=[{'location': 'Houston', 'vehicle_type': 'Automobile'}])
+    assert lot_key() != calculator_input_key(DATA.model_copy(update={'destination': None}))
+
+
+def test_slow_lot_lookup_is_the_unavailable_problem(monkeypatch):
+    class SlowLots(lot_pb2_grpc.LotServiceServicer):
+        async def GetLotByVinOrLot(self, request, context) -> lot_pb2.GetLotByVinOrLotResponse:
+            await asyncio.sleep(1)
+            return lot_pb2.GetLotByVinOrLotResponse()
+
+    monkeypatch.setattr(settings, 'AUCTION_API_LOT_TIMEOUT', 0.05)
+
+    async def run() -> NotFoundProblem:
+        server = grpc.aio.server()
+        lot_pb2_grpc.add_LotServiceServicer_to_server(SlowLots(), server)
+        port = server.add_insecure_port('127.0.0.1:0')
+        await server.start()
+        monkeypatch.setattr(settings, 'RPC_API_URL', f'127.0.0.1:{port}')
+        client = ApiRpcClient()
+        await client.connect()
+
+        async def get_auction_api() -> ApiRpcClient:
+            return client
+
+        monkeypatch.setattr(calculator_endpoint, 'get_auction_api', get_auction_api)
+        try:
+            await calculator_endpoint.get_calculator_by_lot(Request({'type': 'http', 'headers': []}), Response(),
+                                                            AuctionEnum.COPART, 'slow', 5000, db=None)
+        except NotFoundProblem as e:
+            return e
+        finally:
+            await client.disconnect()
+            await server.stop(0)
+
+    problem = asyncio.run(run())
+    assert problem.detail == 'Auction API service is unavailable'
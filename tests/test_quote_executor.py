@@ -0,0 +1,35 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.services.calculator.executor import INLINE, THREAD, QuoteExecutor
+
+
+def test_small_work_runs_inline_large_work_in_a_thread():
+    executor = QuoteExecutor(inline_max_size=10, thread_workers=2, max_pending=1)
+
+    async def run() -> list[str]:
+        try:
+            return await asyncio.gather(*(executor.run(lambda: threading.current_thread().name, size=size)
+                                          for size in (10, 11, 1000)))
+        finally:
+            executor.shutdown()
+
+    inline, *offloaded = asyncio.run(run())
+    assert (executor.mode(10), executor.mode(11)) == (INLINE, THREAD)
+    assert inline == 'MainThread'
+    assert all(name.startswith('quote') for name in offloaded)
+
+
+def test_offloaded_errors_reach_the_caller():
+    executor = QuoteExecutor(inline_max_size=0)
+
+    async def run() -> None:
+        try:
+            await executor.run(int, 'not a number', size=1)
+        finally:
+            executor.shutdown()
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
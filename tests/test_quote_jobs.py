@@ -0,0 +1,104 @@
+import asyncio
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+
+from app.database.models import QuoteJob, QuoteJobResult
+from app.enums.quote_job import QuoteJobStatusEnum
+from app.services.quote_jobs import runner as quote_job_runner
+from app.services.quote_jobs.queue import InMemoryQuoteJobQueue
+from app.services.quote_jobs.runner import QuoteJobRunner
+from app.services.tariff.store import TariffMatrixStore
+from app.services.tariff_import.versioning import record_tariff_version
+
+
+@pytest.fixture(autouse=True)
+def job_dir(tmp_path: Path, monkeypatch) -> Path:
+    monkeypatch.setattr(quote_job_runner, 'QUOTE_JOB_DIR', tmp_path)
+    return tmp_path
+
+
+def make_runner(session_factory, processes: int) -> QuoteJobRunner:
+    return QuoteJobRunner(InMemoryQuoteJobQueue(), session_factory, processes=processes, chunk_size=2,
+                          store=TariffMatrixStore(session_factory), snapshot_file=None)
+
+
+@pytest.mark.parametrize('processes', [0, 1], ids=['thread', 'process'])
+def test_job_quotes_every_row(session_factory, job_dir: Path, processes: int):
+    runner = make_runner(session_factory, processes)
+
+    async def run() -> tuple[QuoteJob, list[QuoteJobResult]]:
+        async with session_factory() as session:
+            job = QuoteJob(filename='lots.csv')
+            session.add(job)
+            await session.commit()
+        (job_dir / f'{job.id}.csv').write_text('auction,location,vehicle_type,price\n'
+                                              'COPART,Abilene,CAR,5000\nIAAI,Abilene,CAR,6000\n'
+                                              'COPART,Nowhere,CAR,5000\n')
+        try:
+            await runner.process(job.id)
+        finally:
+            await runner.stop()
+        async with session_factory() as session:
+            return (await session.get(QuoteJob, job.id),
+                    list(await session.scalars(select(QuoteJobResult).order_by(QuoteJobResult.row_number))))
+
+    job, results = asyncio.run(run())
+    assert (job.status, job.total_rows, job.processed_rows, job.failed_rows) == (QuoteJobStatusEnum.COMPLETED, 3, 3, 1)
+    assert [result.quote['terminal'] if result.quote else result.error_type for result in results] == \
+        ['Houston', 'Houston', 'LocationNotFoundError']
+    assert not (job_dir / f'{job.id}.csv').exists()
+
+
+def test_retired_pool_outlives_its_jobs(session_factory):
+    runner = make_runner(session_factory, processes=1)
+    lots = [{'auction': 'COPART', 'location': 'Abilene', 'vehicle_type': 'CAR', 'price': '5000'}]
+
+    async def run() -> None:
+        first = await runner._acquire_pool()
+        assert await runner._acquire_pool() is first
+        first.release()
+
+        async with session_factory() as session:
+            await record_tariff_version(await session.connection(), 'test')
+            await session.commit()
+        second = await runner._acquire_pool()
+        assert second is not first and first.retired
+
+        # a job started on the old version still quotes from it
+        assert (await first.quote(lots))[0]['terminal'] == 'Houston'
+        first.release()
+        with pytest.raises(RuntimeError):
+            await first.quote(lots)
+
+        second.release()
+        await runner.stop()
+        assert second.retired
+
+    asyncio.run(run())
+
+
+def test_abandoned_jobs_are_requeued(session_factory):
+    runner = make_runner(session_factory, processes=0)
+    now = datetime.now(UTC)
+
+    async def run() -> tuple[list[int], list[int], dict[int, QuoteJobStatusEnum]]:
+        async with session_factory() as session:
+            jobs = [
+                QuoteJob(filename='dead.csv', status=QuoteJobStatusEnum.RUNNING, heartbeat_at=now - timedelta(hours=1)),
+                QuoteJob(filename='alive.csv', status=QuoteJobStatusEnum.RUNNING, heartbeat_at=now),
+                QuoteJob(filename='queued.csv', status=QuoteJobStatusEnum.QUEUED),
+            ]
+            session.add_all(jobs)
+            await session.commit()
+        requeued = await runner.requeue_abandoned()
+        queued = [await runner.queue.get() for _ in requeued]
+        async with session_factory() as session:
+            statuses = {job.id: job.status for job in await session.scalars(select(QuoteJob))}
+        return requeued, queued, statuses
+
+    requeued, queued, statuses = asyncio.run(run())
+    assert requeued == queued == [1]
+    assert statuses == {1: QuoteJobStatusEnum.QUEUED, 2: QuoteJobStatusEnum.RUNNING, 3: QuoteJobStatusEnum.QUEUED}
@@ -0,0 +1,48 @@
+import asyncio
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.database.models import DeliveryPrice, RouteCost, Terminal
+from app.services.tariff_import.bulk_loader import BulkTariffLoader
+from tests.conftest import SMALL_TARIFFS
+
+
+def cheapest_terminals(session_factory) -> set[str]:
+    async def run() -> set[str]:
+        async with session_factory() as session:
+            return set(await session.scalars(
+                select(Terminal.name).join(RouteCost, RouteCost.terminal_id == Terminal.id)
+                .where(RouteCost.is_cheapest)
+            ))
+    return asyncio.run(run())
+
+
+def test_route_costs_follow_price_changes(session_factory):
+    assert cheapest_terminals(session_factory) == {'Houston'}  # 400 + 1200 against 650 + 1050
+
+    async def raise_houston_delivery() -> None:
+        async with session_factory() as session:
+            houston = await session.scalar(select(Terminal).where(Terminal.name == 'Houston'))
+            for delivery_price in await session.scalars(select(DeliveryPrice)
+                                                        .where(DeliveryPrice.terminal_id == houston.id)):
+                delivery_price.price = 900
+            await session.commit()
+    asyncio.run(raise_houston_delivery())
+
+    assert cheapest_terminals(session_factory) == {'Savannah'}
+
+
+def test_bulk_load_fills_route_costs(empty_engine: AsyncEngine, tariff_dir):
+    async def run() -> tuple[int, int]:
+        await BulkTariffLoader(empty_engine, source_dir=tariff_dir).load()
+        async with empty_engine.connect() as conn:
+            routes = await conn.scalar(select(func.count()).select_from(RouteCost))
+            cheapest = await conn.scalar(select(func.count()).select_from(RouteCost).where(RouteCost.is_cheapest))
+        await empty_engine.dispose()
+        return routes, cheapest
+
+    routes, cheapest = asyncio.run(run())
+    assert routes == SMALL_TARIFFS.route_costs
+    # one cheapest terminal per location, destination and vehicle type
+    assert cheapest * min(SMALL_TARIFFS.terminals_per_location, SMALL_TARIFFS.terminals) == routes
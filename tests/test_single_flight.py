@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from app.core.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    calls = 0
+
+    async def compute() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 42
+
+    async def run() -> list[int]:
+        flight = SingleFlight[int]('test')
+        results = await asyncio.gather(*(flight.do('key', compute) for _ in range(10)))
+        assert len(flight) == 0
+        # finished flights are not reused
+        results.append(await flight.do('key', compute))
+        return results
+
+    assert asyncio.run(run()) == [42] * 11
+    assert calls == 2
+
+
+def test_exception_reaches_every_caller():
+    async def fail() -> int:
+        await asyncio.sleep(0.01)
+        raise LookupError('no lot')
+
+    async def run() -> list[BaseException]:
+        flight = SingleFlight[int]('test')
+        return await asyncio.gather(*(flight.do('key', fail) for _ in range(3)), return_exceptions=True)
+
+    assert [type(result) for result in asyncio.run(run())] == [LookupError] * 3
+
+
+def test_cancelled_caller_does_not_cancel_followers():
+    async def compute() -> int:
+        await asyncio.sleep(0.02)
+        return 7
+
+    async def run() -> int:
+        flight = SingleFlight[int]('test')
+        leader = asyncio.create_task(flight.do('key', compute))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do('key', compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(run()) == 7
@@ -0,0 +1,89 @@
+import asyncio
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+
+from app.enums.auction import AuctionEnum
+from app.enums.vehicle_type import VehicleTypeEnum
+from app.schemas.calculator import CalculatorDataIn
+from app.services.calculator import quotes
+from app.services.calculator.bundle import TariffBundle
+from app.services.calculator.cache_key import calculator_input_key
+from app.services.calculator.calculator_service import CalculatorService
+from app.services.calculator.quote_cache import QuoteCache
+from app.services.calculator.snapshot import TariffSnapshot, TariffSnapshotFile, load_current_snapshot
+from app.services.calculator.types import Calculator
+from app.services.tariff.store import TariffMatrixStore
+from scripts.export_tariff_bundle import export_tariff_bundle
+
+
+def test_snapshot_file_round_trip(session_factory, tmp_path: Path):
+    file = TariffSnapshotFile(tmp_path / 'tariff_snapshot.bin')
+    store = TariffMatrixStore(session_factory)
+
+    async def run() -> tuple[TariffSnapshot, TariffSnapshot, bool]:
+        loaded = await load_current_snapshot(session_factory, store, file)
+        # the file holds the current version now, the second load maps it and the store adopts its matrices
+        mapped = await load_current_snapshot(session_factory, store, file)
+        return loaded, mapped, await store.get() is mapped.matrices
+
+    loaded, mapped, adopted = asyncio.run(run())
+    assert mapped is file.read() and mapped is not loaded and adopted
+    assert not mapped.matrices.delivery.flags.writeable
+    np.testing.assert_array_equal(mapped.matrices.shipping, loaded.matrices.shipping)
+    for field in ('terminal_names', 'vehicle_types', 'locations', 'destinations', 'default_destination_id',
+                  'special_fees', 'rate', 'rate_id', 'broker_fee'):
+        assert getattr(mapped, field) == getattr(loaded, field), field
+    assert mapped.fee_bands.keys() == loaded.fee_bands.keys()
+
+    for auction in AuctionEnum:
+        data = CalculatorDataIn(price=5000, auction=auction, vehicle_type=VehicleTypeEnum.CAR, location='Abilene')
+        assert mapped.quote(data) == loaded.quote(data)
+
+
+def test_calculator_quotes_from_a_bundle_without_a_database(session_factory, tmp_path: Path):
+    async def calculate(db, snapshot: TariffSnapshot | None = None) -> Calculator:
+        return await CalculatorService(db, price=5000, auction=AuctionEnum.IAAI, location='Abilene',
+                                       vehicle_type=VehicleTypeEnum.CAR, snapshot=snapshot).calculate()
+
+    async def run() -> tuple[TariffSnapshot, Calculator]:
+        async with session_factory() as session:
+            return await load_current_snapshot(session_factory, TariffMatrixStore(session_factory), file=None), \
+                await calculate(session)
+
+    exported, from_database = asyncio.run(run())
+    bundle = TariffBundle(tmp_path / 'bundle.bin')
+    exported.to_file(bundle.file.path)
+    assert asyncio.run(calculate(None, bundle.snapshot())) == from_database
+
+    # a new export replaces the file, the next request maps it
+    replace(exported, rate=exported.rate * 2, rate_id=exported.rate_id + 1).to_file(bundle.file.path)
+    reloaded = bundle.snapshot()
+    assert reloaded.rate_id == exported.rate_id + 1
+    assert bundle.etag(reloaded, 'key') != bundle.etag(exported, 'key')
+
+
+def test_location_lookup_follows_the_ilike_patterns(session_factory):
+    snapshot = asyncio.run(load_current_snapshot(session_factory, TariffMatrixStore(session_factory), file=None))
+    vehicle_type_id = snapshot.vehicle_types[(AuctionEnum.COPART, VehicleTypeEnum.CAR)]
+    (abilene_id, _), = snapshot.locations
+
+    for name in ('Abilene', 'ABILENE', 'Abilene (TX)', 'Abil', 'Abi_ene', '%lene'):
+        assert snapshot._find_location(name, vehicle_type_id) == abilene_id, name
+    assert snapshot._find_location('Houston', vehicle_type_id) is None
+
+
+def test_bundle_mode_quotes_without_a_session(monkeypatch, session_factory, tmp_path: Path):
+    path = tmp_path / 'bundle.bin'
+    exported = asyncio.run(export_tariff_bundle(session_factory.kw['bind'], path))
+    monkeypatch.setattr(quotes, 'calculator_bundle', TariffBundle(path))
+    monkeypatch.setattr(quotes, 'quote_cache', QuoteCache())
+    data = CalculatorDataIn(price=5000, auction=AuctionEnum.COPART, vehicle_type=VehicleTypeEnum.CAR,
+                            location='Abilene')
+
+    async def get_input() -> CalculatorDataIn:
+        return data
+
+    result = asyncio.run(quotes.resolve_quote(None, calculator_input_key(data), get_input))
+    assert result.quote == exported.quote(data) and result.stale_age is None
@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+from fastapi import Response
+from sqlalchemy.exc import OperationalError
+from starlette.requests import Request
+
+from app.api.api_v1.endpoints.public import calculator as calculator_endpoint
+from app.api.api_v1.endpoints.public.calculator import TariffsUnavailableProblem
+from app.config import settings
+from app.enums.auction import AuctionEnum
+from app.enums.vehicle_type import VehicleTypeEnum
+from app.schemas.calculator import CalculatorDataIn
+from app.services.calculator import quotes
+from app.services.calculator.cache_key import calculator_input_key
+from app.services.calculator.quote_cache import QuoteCache
+from app.services.calculator.quotes import QuoteResult, resolve_quote
+from app.services.calculator.snapshot import TariffSnapshot, load_current_snapshot
+from app.services.calculator.stale import StaleQuotes
+from app.services.tariff.store import TariffMatrixStore
+
+DATA = CalculatorDataIn(price=5000, auction=AuctionEnum.COPART, vehicle_type=VehicleTypeEnum.CAR, location='Abilene')
+INPUT_KEY = calculator_input_key(DATA)
+
+
+async def get_input() -> CalculatorDataIn:
+    return DATA
+
+
+@pytest.fixture
+def cache(monkeypatch) -> QuoteCache:
+    cache = QuoteCache()
+    monkeypatch.setattr(quotes, 'quote_cache', cache)
+    return cache
+
+
+@pytest.fixture
+def snapshot(session_factory) -> TariffSnapshot:
+    return asyncio.run(load_current_snapshot(session_factory, TariffMatrixStore(session_factory), file=None))
+
+
+def use_stale(monkeypatch, stale: StaleQuotes) -> StaleQuotes:
+    monkeypatch.setattr(quotes, 'stale_quotes', stale)
+    return stale
+
+
+def database_down(monkeypatch) -> None:
+    async def get_quote_etag(db, input_key: str) -> str:
+        raise OperationalError('SELECT 1', {}, ConnectionRefusedError())
+
+    monkeypatch.setattr(quotes, 'get_quote_etag', get_quote_etag)
+
+
+def test_database_error_falls_back_to_the_snapshot(monkeypatch, cache, snapshot):
+    use_stale(monkeypatch, StaleQuotes(cache)).remember_snapshot(snapshot, age=60)
+    database_down(monkeypatch)
+
+    result = asyncio.run(resolve_quote(None, INPUT_KEY, get_input))
+
+    assert result.quote == snapshot.quote(DATA)
+    assert result.etag is None and 60 <= result.stale_age < 70
+
+
+def test_missed_deadline_serves_the_last_cached_quote(monkeypatch, cache, session_factory):
+    use_stale(monkeypatch, StaleQuotes(cache))
+
+    async def fresh() -> QuoteResult:
+        async with session_factory() as session:
+            return await resolve_quote(session, INPUT_KEY, get_input)
+
+    quote = asyncio.run(fresh()).quote
+
+    async def slow_etag(db, input_key: str) -> str:
+        await asyncio.sleep(1)
+        return 'never'
+
+    monkeypatch.setattr(quotes, 'get_quote_etag', slow_etag)
+    monkeypatch.setattr(settings, 'QUOTE_DB_DEADLINE', 0.05)
+    result = asyncio.run(resolve_quote(None, INPUT_KEY, get_input))
+
+    assert result.quote == quote and result.etag is None and result.stale_age is not None
+
+
+def test_nothing_older_than_max_age_is_served(monkeypatch, cache, snapshot):
+    stale = use_stale(monkeypatch, StaleQuotes(cache, max_age=3600))
+    stale.remember_snapshot(snapshot, age=7200)
+    database_down(monkeypatch)
+    with pytest.raises(OperationalError):
+        asyncio.run(resolve_quote(None, INPUT_KEY, get_input))
+
+    # a cached quote past max_age is not served either
+    cache.put('etag', snapshot.quote(DATA), INPUT_KEY)
+    use_stale(monkeypatch, StaleQuotes(cache, max_age=1e-9))
+    with pytest.raises(OperationalError):
+        asyncio.run(resolve_quote(None, INPUT_KEY, get_input))
+
+
+def test_nothing_to_serve_is_a_503_with_retry_after(monkeypatch, cache):
+    use_stale(monkeypatch, StaleQuotes(cache))
+    monkeypatch.setattr(settings, 'QUOTE_RETRY_AFTER', 7)
+
+    def get_calculator() -> TariffsUnavailableProblem:
+        with pytest.raises(TariffsUnavailableProblem) as raised:
+            asyncio.run(calculator_endpoint.get_calculator(Request({'type': 'http', 'headers': []}), Response(),
+                                                           DATA, db=None))
+        return raised.value
+
+    database_down(monkeypatch)
+    problem = get_calculator()
+    assert problem.status == 503 and problem.headers['Retry-After'] == '7'
+
+    # a cold quote missing the deadline
+    async def slow_etag(db, input_key: str) -> str:
+        await asyncio.sleep(1)
+        return 'never'
+
+    monkeypatch.setattr(quotes, 'get_quote_etag', slow_etag)
+    monkeypatch.setattr(settings, 'QUOTE_DB_DEADLINE', 0.05)
+    assert get_calculator().status == 503
+
+
+def test_stale_response_is_marked_and_not_cacheable(monkeypatch, cache, snapshot):
+    use_stale(monkeypatch, StaleQuotes(cache)).remember_snapshot(snapshot, age=90)
+    database_down(monkeypatch)
+    response = Response()
+
+    quote = asyncio.run(calculator_endpoint.serve_quote(
+        Request({'type': 'http', 'headers': [(b'if-none-match', b'"old"')]}), response, None, INPUT_KEY, get_input))
+
+    assert quote == snapshot.quote(DATA)
+    assert response.headers['Warning'] == '110 - "Response is Stale"'
+    assert 90 <= int(response.headers['Age']) < 100
+    assert response.headers['Cache-Control'] == 'no-store'
+    assert 'ETag' not in response.headers
@@ -0,0 +1,90 @@
+import asyncio
+
+import fakeredis
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.database.crud.tariff_version import TariffVersionService
+from app.database.models import ExchangeRate
+from app.services.calculator.quote_cache import QuoteCache
+from app.services.calculator.tariff_changes import TariffChangeListener
+from app.services.tariff import changes as tariff_changes
+from app.services.tariff.changes import InMemoryTariffChangeBus, RedisTariffChangeBus, TariffChange
+
+
+class RecordingStep:
+    """Stands in for the matrix store and the prewarmer, only counts the calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def get(self) -> None:
+        self.calls += 1
+
+    async def check(self) -> None:
+        self.calls += 1
+
+
+def test_orm_commit_publishes_the_new_version(monkeypatch, session_factory: async_sessionmaker[AsyncSession]):
+    bus = InMemoryTariffChangeBus()
+    monkeypatch.setattr(tariff_changes, '_tariff_change_bus', bus)
+
+    async def run() -> tuple[TariffChange, int]:
+        changes = bus.subscribe()
+        received = asyncio.ensure_future(anext(changes))
+        await asyncio.sleep(0)
+        async with session_factory() as session:
+            session.add(ExchangeRate(rate=0.95))
+            await session.commit()
+            version = await TariffVersionService(session).get_current_version()
+        change = await asyncio.wait_for(received, timeout=1)
+        await changes.aclose()
+        return change, version
+
+    change, version = asyncio.run(run())
+    assert change == TariffChange(version, 'exchange_rate')
+
+
+def test_redis_bus_reaches_every_subscriber():
+    async def run() -> list[TariffChange]:
+        server = fakeredis.FakeServer()
+        # two instances: separate clients on one server
+        publisher, subscriber = RedisTariffChangeBus(), RedisTariffChangeBus()
+        publisher.redis = fakeredis.FakeAsyncRedis(server=server)
+        subscriber.redis = fakeredis.FakeAsyncRedis(server=server)
+        streams = [subscriber.subscribe(), subscriber.subscribe()]
+        received = [asyncio.ensure_future(anext(stream)) for stream in streams]
+        while await publisher.redis.pubsub_numsub(publisher.channel) != [(publisher.channel.encode(), 2)]:
+            await asyncio.sleep(0.01)
+        await publisher.publish(TariffChange(7, 'bulk_load'))
+        changes = await asyncio.wait_for(asyncio.gather(*received), timeout=1)
+        for stream in streams:
+            await stream.aclose()
+        await publisher.close()
+        await subscriber.close()
+        return changes
+
+    assert asyncio.run(run()) == [TariffChange(7, 'bulk_load')] * 2
+
+
+def test_listener_applies_each_version_once():
+    cache = QuoteCache(max_size=10)
+    cache.put('"v1-a"', object(), 'a')
+    cache.put('"v2-a"', object(), 'a')
+    cache.put('"v1-b"', object(), 'b')
+    store, prewarmer = RecordingStep(), RecordingStep()
+
+    async def run() -> int:
+        bus = InMemoryTariffChangeBus()
+        listener = TariffChangeListener(bus, cache=cache, store=store, prewarmer=prewarmer, retry_seconds=0)
+        listener.start()
+        await asyncio.sleep(0)
+        for version in (2, 1, 2, 3):
+            await bus.publish(TariffChange(version, 'bulk_load'))
+        await asyncio.sleep(0.01)
+        await listener.stop()
+        return listener.version
+
+    assert asyncio.run(run()) == 3
+    assert store.calls == prewarmer.calls == 2
+    # the newest quote per input stays for stale answers
+    assert len(cache) == 2 and cache.last_good('a') is not None and cache.last_good('b') is not None
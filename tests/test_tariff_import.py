@@ -0,0 +1,144 @@
+import asyncio
+import csv
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.database.models import DeliveryPrice, Fee, Location, TariffVersion
+from app.services.tariff_import.bulk_loader import BulkTariffLoader, LoadReport, band_problems
+from app.services.tariff_import.exceptions import TariffValidationError
+from app.services.tariff_import.incremental import ImportReport, IncrementalTariffImporter
+from scripts.synthetic_tariffs import write_synthetic_tariffs
+from tests.conftest import SMALL_TARIFFS
+
+
+def load(engine: AsyncEngine, source_dir: Path, dry_run: bool = False) -> LoadReport:
+    async def run() -> LoadReport:
+        try:
+            return await BulkTariffLoader(engine, source_dir=source_dir).load(dry_run)
+        finally:
+            await engine.dispose()
+    return asyncio.run(run())
+
+
+def count(engine: AsyncEngine, model) -> int:
+    async def run() -> int:
+        async with engine.connect() as conn:
+            total = await conn.scalar(select(func.count()).select_from(model))
+        await engine.dispose()
+        return total
+    return asyncio.run(run())
+
+
+def read_csv(path: Path) -> list[dict[str, str]]:
+    with path.open(newline='', encoding='utf-8') as file:
+        return list(csv.DictReader(file))
+
+
+def write_csv(path: Path, rows: list[dict[str, str]]) -> None:
+    with path.open('w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def test_band_problems():
+    assert band_problems('fee', [(0, 99.99), (100, 500)]) == []
+    assert band_problems('fee', [(0, 100), (50, 500)]) == ['fee: band 50-500 overlaps a band ending at 100']
+    assert band_problems('fee', [(0, 100), (300, 500)]) == ['fee: prices between 100 and 300 are not covered']
+    assert band_problems('fee', []) == ['fee: no bands']
+
+
+def test_load_replaces_tariffs(empty_engine, tariff_dir):
+    report = load(empty_engine, tariff_dir)
+
+    assert report.version is not None
+    assert report.rows['location'] == count(empty_engine, Location) == SMALL_TARIFFS.locations
+    assert report.rows['delivery_price'] == count(empty_engine, DeliveryPrice)
+    assert count(empty_engine, TariffVersion) == 1
+
+    # a second load replaces the rows instead of adding to them
+    load(empty_engine, tariff_dir)
+    assert count(empty_engine, Location) == SMALL_TARIFFS.locations
+    assert count(empty_engine, TariffVersion) == 2
+
+
+def test_dry_run_writes_nothing(empty_engine, tariff_dir):
+    report = load(empty_engine, tariff_dir, dry_run=True)
+
+    assert report.version is None
+    assert report.rows['location'] == SMALL_TARIFFS.locations
+    assert count(empty_engine, Location) == 0
+
+
+def test_fee_type_without_fees_loads(empty_engine, tariff_dir):
+    write_csv(tariff_dir / 'fee.csv', [row for row in read_csv(tariff_dir / 'fee.csv') if row['fee_type_id'] != '1'])
+
+    report = load(empty_engine, tariff_dir)
+    assert report.rows['fee'] == count(empty_engine, Fee) > 0
+
+
+def test_overlapping_bands_are_rejected(empty_engine, tmp_path):
+    source_dir = write_synthetic_tariffs(tmp_path / 'overlapping', replace(SMALL_TARIFFS, overlapping_bands=1))
+
+    with pytest.raises(TariffValidationError, match='overlaps'):
+        load(empty_engine, source_dir)
+    assert count(empty_engine, Location) == 0
+
+
+def import_changes(engine: AsyncEngine, source_dir: Path, dry_run: bool = False) -> ImportReport:
+    async def run() -> ImportReport:
+        try:
+            return await IncrementalTariffImporter(engine, source_dir=source_dir).run(dry_run)
+        finally:
+            await engine.dispose()
+    return asyncio.run(run())
+
+
+def delivery_prices(engine: AsyncEngine) -> dict[tuple[int, int, int], float]:
+    async def run() -> dict[tuple[int, int, int], float]:
+        async with engine.connect() as conn:
+            result = await conn.execute(select(DeliveryPrice.location_id, DeliveryPrice.terminal_id,
+                                               DeliveryPrice.vehicle_type_id, DeliveryPrice.price))
+        await engine.dispose()
+        return {(location_id, terminal_id, vehicle_type_id): price
+                for location_id, terminal_id, vehicle_type_id, price in result}
+    return asyncio.run(run())
+
+
+def test_unchanged_sheets_import_nothing(empty_engine, tariff_dir):
+    load(empty_engine, tariff_dir)
+
+    report = import_changes(empty_engine, tariff_dir)
+
+    assert report.version is None
+    assert {name: (change['inserted'], change['updated'], change['deleted'])
+            for name, change in report.changes.items()} == {'delivery_price': (0, 0, 0),
+                                                            'shipping_price': (0, 0, 0)}
+
+
+def test_import_writes_only_the_difference(empty_engine, tariff_dir):
+    load(empty_engine, tariff_dir)
+    before = delivery_prices(empty_engine)
+    sheet = tariff_dir / 'prices_delivery.csv'
+    rows = read_csv(sheet)
+    rows[0]['Car fee'] = str(float(rows[0]['Car fee']) + 100)
+    write_csv(sheet, rows[:-1])
+
+    assert import_changes(empty_engine, tariff_dir, dry_run=True).version is None
+    assert delivery_prices(empty_engine) == before
+
+    report = import_changes(empty_engine, tariff_dir)
+    after = delivery_prices(empty_engine)
+
+    change = report.changes['delivery_price']
+    # a sheet row is one price per vehicle type: the car price changed, both prices of the removed row are gone
+    assert (change['inserted'], change['updated'], change['deleted']) == (0, 1, 2)
+    assert report.changes['shipping_price']['updated'] == 0
+    assert report.version is not None
+    changed_keys = {tuple(key) for key in change['changed']}
+    assert {key for key in before if key not in after} | {key for key in after if after[key] != before[key]} \
+        == changed_keys
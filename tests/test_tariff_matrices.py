@@ -0,0 +1,60 @@
+import asyncio
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.database.models import RouteCost
+from app.services.tariff.matrices import NO_ROUTE, TariffMatrices, build_tariff_matrices
+from app.services.tariff_import.bulk_loader import BulkTariffLoader
+
+
+def load_matrices(engine: AsyncEngine, tariff_dir) -> tuple[TariffMatrices, list[RouteCost]]:
+    async def run() -> tuple[TariffMatrices, list[RouteCost]]:
+        report = await BulkTariffLoader(engine, source_dir=tariff_dir).load()
+        async with AsyncSession(engine) as session:
+            matrices = await build_tariff_matrices(session, report.version)
+            routes = list(await session.scalars(select(RouteCost)))
+        await engine.dispose()
+        return matrices, routes
+    return asyncio.run(run())
+
+
+def test_matrices_agree_with_route_costs(empty_engine, tariff_dir):
+    matrices, routes = load_matrices(empty_engine, tariff_dir)
+
+    for route in routes:
+        v = matrices.vehicle_type_position(route.vehicle_type_id)
+        costs = matrices.route_costs(route.vehicle_type_id)
+        l, t, d = (matrices.location_position(route.location_id), matrices.terminal_position(route.terminal_id),
+                   matrices.destination_position(route.destination_id))
+        assert matrices.delivery[v, l, t] == route.delivery_price
+        assert costs[l, t, d] == route.total_price
+
+        if route.is_cheapest:
+            cheapest = matrices.cheapest_routes(route.vehicle_type_id)
+            assert cheapest.cost[l, d] == route.total_price
+            assert matrices.terminal_ids[cheapest.terminal[l, d]] == route.terminal_id
+
+    # every route the matrices know is a route_cost row, the rest is NaN
+    priced = sum(int(np.count_nonzero(~np.isnan(matrices.route_costs(vehicle_type_id))))
+                 for vehicle_type_id in matrices.vehicle_type_ids)
+    assert priced == len(routes)
+
+
+def test_unconnected_pairs_have_no_route(empty_engine, tariff_dir):
+    matrices, _ = load_matrices(empty_engine, tariff_dir)
+    vehicle_type_id = int(matrices.vehicle_type_ids[0])
+    v = matrices.vehicle_type_position(vehicle_type_id)
+    matrices.delivery[v, 0, :] = np.nan
+
+    cheapest = matrices.cheapest_routes(vehicle_type_id)
+    assert np.isnan(cheapest.cost[0]).all()
+    assert (cheapest.terminal[0] == NO_ROUTE).all()
+    # location slices give the same answer for their rows
+    np.testing.assert_array_equal(matrices.cheapest_routes(vehicle_type_id, slice(1, 4)).terminal,
+                                  cheapest.terminal[1:4])
+
+    with pytest.raises(KeyError):
+        matrices.location_position(int(matrices.location_ids.max()) + 1)
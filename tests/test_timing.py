@@ -0,0 +1,46 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.metrics import metrics_router
+from app.core.timing import ServerTimingMiddleware, server_timing, stage, timed
+
+
+@timed('test_lookup')
+async def lookup() -> int:
+    await asyncio.sleep(0.01)
+    return 1
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware)
+    app.include_router(metrics_router)
+
+    @app.get('/quote')
+    async def quote() -> dict:
+        with stage('test_routes'):
+            await lookup()
+            await lookup()
+        return {}
+
+    return app
+
+
+def test_server_timing_sums_repeated_stages():
+    assert server_timing([('a', 0.001), ('b', 0.002), ('a', 0.003)], 0.01) == 'a;dur=4.00, b;dur=2.00, app;dur=10.00'
+
+
+def test_stages_reach_the_header_and_metrics():
+    with TestClient(make_app()) as client:
+        response = client.get('/quote')
+        metrics = client.get('/metrics')
+
+    durations = {name: float(duration.removeprefix('dur='))
+                 for name, duration in (entry.split(';') for entry in response.headers['Server-Timing'].split(', '))}
+    assert list(durations) == ['test_lookup', 'test_routes', 'app']
+    assert 20 <= durations['test_lookup'] <= durations['test_routes'] <= durations['app']
+    assert 'request_stage_duration_seconds_count{stage="test_lookup"} 2.0' in metrics.text
+    # a request without stages reports its total only
+    assert metrics.headers['Server-Timing'].startswith('app;dur=')
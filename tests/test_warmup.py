@@ -0,0 +1,108 @@
+import asyncio
+import csv
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.core import readiness as readiness_module
+from app.core.readiness import Readiness, readiness_router
+from app.services import warmup
+from app.services.calculator.quote_cache import quote_cache
+from app.services.tariff.store import TariffMatrixStore
+
+
+@pytest.fixture(autouse=True)
+def fast_warmup(monkeypatch):
+    async def get_auction_api() -> None:
+        return None
+
+    monkeypatch.setattr(warmup, 'get_auction_api', get_auction_api)
+    monkeypatch.setattr(settings, 'WARMUP_RETRY_SECONDS', 0)
+    monkeypatch.setattr(settings, 'WARMUP_QUOTES_FILE', '')
+    quote_cache.clear()
+    yield
+    quote_cache.clear()
+
+
+def run_warm_up(state: Readiness, session_factory) -> None:
+    async def run() -> None:
+        await warmup.warm_up(state, session_factory, TariffMatrixStore(session_factory), snapshot_file=None)
+        await session_factory.kw['bind'].dispose()
+    asyncio.run(run())
+
+
+def get_ready(monkeypatch, state: Readiness):
+    monkeypatch.setattr(readiness_module, 'readiness', state)
+    app = FastAPI()
+    app.include_router(readiness_router)
+    return TestClient(app).get('/ready')
+
+
+def test_ready_is_503_until_warmed_up(monkeypatch, session_factory):
+    state = Readiness()
+    response = get_ready(monkeypatch, state)
+    assert response.status_code == 503 and response.json()['status'] == 'warming_up'
+
+    run_warm_up(state, session_factory)
+
+    response = get_ready(monkeypatch, state)
+    assert response.status_code == 200 and response.json()['status'] == 'ready'
+    assert {'database', 'auction_api', 'quotes', 'total'} <= set(response.json()['steps'])
+
+
+def test_database_is_retried(monkeypatch, session_factory):
+    attempts = 0
+    connect = warmup.open_pool_connections
+
+    async def flaky_connect(factory, count: int) -> None:
+        nonlocal attempts
+        attempts += 1
+        if attempts < 3:
+            raise OSError('connection refused')
+        await connect(factory, count)
+
+    monkeypatch.setattr(warmup, 'open_pool_connections', flaky_connect)
+    state = Readiness()
+    run_warm_up(state, session_factory)
+
+    assert attempts == 3
+    assert state.ready and not state.failed
+
+
+def test_warm_up_gives_up_on_an_unreachable_database(monkeypatch, session_factory):
+    attempts = 0
+
+    async def refused(factory, count: int) -> None:
+        nonlocal attempts
+        attempts += 1
+        raise OSError('connection refused')
+
+    monkeypatch.setattr(warmup, 'open_pool_connections', refused)
+    monkeypatch.setattr(settings, 'WARMUP_MAX_ATTEMPTS', 2)
+    state = Readiness()
+    run_warm_up(state, session_factory)
+
+    assert attempts == 2
+    assert not state.ready and state.failed
+    assert state.error.startswith('database: ')
+    response = get_ready(monkeypatch, state)
+    assert response.status_code == 503 and response.json()['status'] == 'failed'
+
+
+def test_quotes_file_is_prewarmed(monkeypatch, session_factory, tmp_path: Path):
+    path = tmp_path / 'warmup.csv'
+    with path.open('w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['auction', 'location', 'vehicle_type', 'price', 'destination'])
+        writer.writerow(['COPART', 'Abilene', 'CAR', '5000', 'Klaipeda'])
+        writer.writerow(['IAAI', 'Abilene', 'CAR', '7000', ''])
+        writer.writerow(['COPART', 'Abilene', 'CAR', 'not a price', ''])
+    monkeypatch.setattr(settings, 'WARMUP_QUOTES_FILE', str(path))
+    state = Readiness()
+    run_warm_up(state, session_factory)
+
+    assert state.ready
+    assert len(quote_cache) == 2